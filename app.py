@@ -6,38 +6,59 @@ Python 3.11+, Streamlit latest
 """
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import List, Optional
 
 import streamlit as st
 
+from components.fragments import Markup, fragment
 from components.hero import render_hero
 from components.feature_cards import render_feature_cards
 from components.gallery import render_gallery
+from components.instagram import render_instagram_previews
+from services.assets import inject_critical_css, inject_deferred_css
+from services.instagram import load_posts
+from services.metrics import instrumented_page
 from services.seo import inject_seo
+from services.settings import get_settings
 
 # ---------- Brand Defaults (override via .streamlit/secrets.toml) ----------
-BRAND_NAME: str = st.secrets.get("BRAND_NAME", "Thrive with Frida")
-TAGLINE: str = st.secrets.get("TAGLINE", "Simplicity in Motion")
-INSTAGRAM_HANDLE: str = st.secrets.get("INSTAGRAM_HANDLE", "@thrivewfrida")
-HEX_PRIMARY: str = st.secrets.get("HEX_PRIMARY", "#0F1115")
-HEX_ACCENT: str = st.secrets.get("HEX_ACCENT", "#C7A97B")
-CITY_REGION: str = st.secrets.get("CITY_REGION", "")
-INSTAGRAM_POST_URLS: List[str] = list(st.secrets.get("INSTAGRAM_POST_URLS", []))
+SETTINGS = get_settings()
+BRAND_NAME: str = SETTINGS.brand_name
+TAGLINE: str = SETTINGS.tagline
+INSTAGRAM_HANDLE: str = SETTINGS.instagram_handle
+HEX_PRIMARY: str = SETTINGS.hex_primary
+HEX_ACCENT: str = SETTINGS.hex_accent
+CITY_REGION: str = SETTINGS.city_region
+INSTAGRAM_POST_URLS: List[str] = list(SETTINGS.instagram_post_urls)
 
 # Paths
-DATA_DIR = Path("data")
 ASSETS_DIR = Path("assets")
-SERVICES_JSON = DATA_DIR / "services.json"
 
-
-def _load_services() -> list[dict]:
-    try:
-        with SERVICES_JSON.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return []
+# ---------- Page copy (shared with the static export in services/prerender.py) ----------
+HOME_DESCRIPTION = (
+    "High-performance personal training with a clean, modern approach. Strength and refinement, tailored to your life."
+)
+HERO = {
+    "headline": "Strength, Refined.",
+    "subheadline": "Precision coaching for busy, ambitious humans. Minimal noise, maximal results.",
+    "primary_cta_text": "Book a Consultation",
+    "primary_cta_href": "03_Schedule",
+    "secondary_cta_text": "Send an Inquiry",
+    "secondary_cta_href": "04_Inquiry",
+}
+METHODOLOGY = [
+    (
+        "Simplicity in Motion",
+        "We remove the non-essential and focus on what moves the needle. "
+        "A structured system that adapts to your schedule, with measurable progress and sustainable intensity.",
+    ),
+    (
+        "Strength + Refinement",
+        "We build athletic strength, clean lines, and confident posture. "
+        "Training is purposeful, recovery is respected, nutrition is pragmatic.",
+    ),
+]
 
 
 def _instagram_url_from_handle(handle: str) -> Optional[str]:
@@ -49,12 +70,19 @@ def _instagram_url_from_handle(handle: str) -> Optional[str]:
     return f"https://www.instagram.com/{h}/"
 
 
-def _inject_styles():
-    css_path = ASSETS_DIR / "styles.css"
-    if css_path.exists():
-        st.markdown(f"<style>{css_path.read_text(encoding='utf-8')}</style>", unsafe_allow_html=True)
+def social_badge_html(insta_url: Optional[str], handle: str) -> str:
+    if not insta_url:
+        return ""
+    return fragment("social_badge", insta_href=insta_url, handle=handle)
+
+
+def footer_html(brand: str, city_region: str, insta_url: Optional[str]) -> str:
+    label = f"{brand} • {city_region}" if city_region else brand
+    link = fragment("footer_link", insta_href=insta_url) if insta_url else Markup("")
+    return fragment("footer", label=label, link=link)
 
 
+@instrumented_page("home")
 def main() -> None:
     st.set_page_config(
         page_title=f"{BRAND_NAME} | {TAGLINE}",
@@ -65,12 +93,12 @@ def main() -> None:
 
     inject_seo(
         title=f"{BRAND_NAME} — {TAGLINE}",
-        description="High-performance personal training with a clean, modern approach. Strength and refinement, tailored to your life.",
+        description=HOME_DESCRIPTION,
         image_url=None,
         theme_color=HEX_PRIMARY,
     )
 
-    _inject_styles()
+    inject_critical_css()
 
     # --- NAV BAR (very minimal, relies on Streamlit pages) ---
     with st.container():
@@ -78,55 +106,21 @@ def main() -> None:
         with col1:
             st.image(str(ASSETS_DIR / "logo.png"), caption=None, use_container_width=True)
         with col2:
-            st.markdown(
-                f"""
-                <div class="brand-title">
-                    <span class="brand-name">{BRAND_NAME}</span>
-                    <span class="brand-tag">{TAGLINE}</span>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
+            st.markdown(fragment("brand_title", brand=BRAND_NAME, tagline=TAGLINE), unsafe_allow_html=True)
 
     st.divider()
 
     # --- HERO ---
-    render_hero(
-        headline="Strength, Refined.",
-        subheadline="Precision coaching for busy, ambitious humans. Minimal noise, maximal results.",
-        primary_cta_text="Book a Consultation",
-        primary_cta_href="03_Schedule",
-        secondary_cta_text="Send an Inquiry",
-        secondary_cta_href="04_Inquiry",
-        accent_hex=HEX_ACCENT,
-    )
+    render_hero(**HERO, accent_hex=HEX_ACCENT)
 
     # --- SOCIAL BADGE / INSTAGRAM ---
     insta_url = _instagram_url_from_handle(INSTAGRAM_HANDLE)
     with st.container():
-        st.markdown(
-            f"""
-            <div class="social-badge">
-                <a href="{insta_url}" target="_blank" rel="noopener noreferrer" aria-label="Instagram: {INSTAGRAM_HANDLE}">
-                    <span class="ig-handle">Instagram {INSTAGRAM_HANDLE}</span>
-                </a>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+        st.markdown(social_badge_html(insta_url, INSTAGRAM_HANDLE), unsafe_allow_html=True)
         if INSTAGRAM_POST_URLS:
             st.caption("Latest from Instagram")
-            from streamlit.components.v1 import html  # local import to keep top clean
-
-            # Simple embed of the first post (optional)
-            post = INSTAGRAM_POST_URLS[0]
-            html(
-                f"""
-                <blockquote class="instagram-media" data-instgrm-permalink="{post}" data-instgrm-version="14"></blockquote>
-                <script async src="//www.instagram.com/embed.js"></script>
-                """,
-                height=600,
-            )
+            # Preview card of the first post; the embed loads on click
+            render_instagram_previews(load_posts(INSTAGRAM_POST_URLS[:1]), key="ig_latest")
         else:
             st.caption("Tip: add INSTAGRAM_POST_URLS in secrets to embed a post here.")
 
@@ -134,19 +128,10 @@ def main() -> None:
 
     # --- METHODOLOGY ---
     with st.container():
-        left, right = st.columns([1, 1], gap="large")
-        with left:
-            st.markdown("### Simplicity in Motion")
-            st.write(
-                "We remove the non-essential and focus on what moves the needle. "
-                "A structured system that adapts to your schedule, with measurable progress and sustainable intensity."
-            )
-        with right:
-            st.markdown("### Strength + Refinement")
-            st.write(
-                "We build athletic strength, clean lines, and confident posture. "
-                "Training is purposeful, recovery is respected, nutrition is pragmatic."
-            )
+        for col, (heading, text) in zip(st.columns([1, 1], gap="large"), METHODOLOGY):
+            with col:
+                st.markdown(f"### {heading}")
+                st.write(text)
 
     st.divider()
 
@@ -158,25 +143,16 @@ def main() -> None:
     # --- GALLERY ---
     render_gallery(
         images_dir=ASSETS_DIR / "images",
-        instagram_post_urls=INSTAGRAM_POST_URLS,
-        max_images=8,
+        instagram_post_urls=INSTAGRAM_POST_URLS[1:],  # the first is shown above
+        page_size=8,
     )
 
     st.divider()
 
     # --- FOOTER ---
-    footer = f"{BRAND_NAME}"
-    if CITY_REGION:
-        footer += f" • {CITY_REGION}"
-    st.markdown(
-        f"""
-        <footer class="footer">
-            <span>{footer}</span>
-            <a href="{insta_url}" target="_blank" rel="noopener">Instagram</a>
-        </footer>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(footer_html(BRAND_NAME, CITY_REGION, insta_url), unsafe_allow_html=True)
+
+    inject_deferred_css()
 
 
 if __name__ == "__main__":
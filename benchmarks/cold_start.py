@@ -0,0 +1,179 @@
+"""
+Cold-start import cost of ``app.py`` and every page.
+
+Run from the repository root::
+
+    python -m benchmarks.cold_start
+    python -m benchmarks.cold_start --repeat 5 --top 15 --budget app=150 --budget 04_Inquiry=200
+    python -m benchmarks.cold_start --save-baseline data/cold_start.json
+    python -m benchmarks.cold_start --baseline data/cold_start.json --tolerance 0.25
+
+Each target is loaded in a fresh interpreter with ``-X importtime`` (its
+``main()``/``page()`` is not called), so the numbers are what a scaled-to-zero
+replica pays before the first render. ``streamlit`` itself is imported first
+and reported separately; the per-target time is everything after it.
+
+The run fails (exit 1) when a target exceeds its ``--budget TARGET=MS``,
+regresses past ``--tolerance`` against ``--baseline``, or pulls in one of
+``HEAVY_MODULES``, which should only ever be imported lazily.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("gspread", "google.auth", "google.oauth2", "PIL", "openpyxl")
+MARKER = "--cold-start-target--"
+
+_PROBE = """
+import importlib.util, json, sys, time
+t0 = time.perf_counter()
+import streamlit
+t1 = time.perf_counter()
+before = set(sys.modules)
+sys.stderr.write({marker!r} + "\\n")
+sys.stderr.flush()
+spec = importlib.util.spec_from_file_location("__cold_start__", {path!r})
+mod = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(mod)
+t2 = time.perf_counter()
+print(json.dumps({{"streamlit_ms": (t1 - t0) * 1e3, "target_ms": (t2 - t1) * 1e3, "modules": sorted(set(sys.modules) - before)}}))
+"""
+
+
+@dataclass
+class Sample:
+    streamlit_ms: float
+    target_ms: float
+    modules: List[str]  # loaded by the target, beyond streamlit's own
+    self_us: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class Result:
+    target: str
+    samples: List[Sample]
+
+    @property
+    def target_ms(self) -> float:
+        return statistics.median(s.target_ms for s in self.samples)
+
+    @property
+    def streamlit_ms(self) -> float:
+        return statistics.median(s.streamlit_ms for s in self.samples)
+
+    def heavy(self) -> List[str]:
+        """Heavy modules the target itself pulled in (not already loaded by streamlit)."""
+        loaded = set(self.samples[0].modules)
+        return [m for m in HEAVY_MODULES if m in loaded]
+
+    def top(self, n: int) -> List[Tuple[str, float]]:
+        totals: Dict[str, List[int]] = {}
+        for s in self.samples:
+            for mod, us in s.self_us.items():
+                totals.setdefault(mod, []).append(us)
+        ranked = sorted(((m, statistics.median(v) / 1e3) for m, v in totals.items()), key=lambda x: -x[1])
+        return ranked[:n]
+
+
+def targets() -> Dict[str, Path]:
+    found = {"app": ROOT / "app.py"}
+    for page in sorted((ROOT / "pages").glob("*.py")):
+        found[page.stem] = page
+    return found
+
+
+def _parse_importtime(stderr: str) -> Dict[str, int]:
+    """Self time (µs) per module imported after the marker line."""
+    out: Dict[str, int] = {}
+    after = False
+    for line in stderr.splitlines():
+        if line.strip() == MARKER:
+            after = True
+            continue
+        if not after or not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, _cumulative, name = line[len("import time:") :].split("|", 2)
+            out[name.strip()] = int(self_us)
+        except ValueError:
+            continue
+    return out
+
+
+def measure(path: Path) -> Sample:
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH", "")]))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(marker=MARKER, path=str(path))],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        tail = "\n".join(proc.stderr.splitlines()[-5:])
+        raise RuntimeError(f"{path.name} failed to import:\n{tail}")
+    doc = json.loads(proc.stdout.strip().splitlines()[-1])
+    return Sample(doc["streamlit_ms"], doc["target_ms"], doc["modules"], _parse_importtime(proc.stderr))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=3, help="fresh interpreters per target; the median is reported")
+    ap.add_argument("--top", type=int, default=8, help="slowest modules listed per target")
+    ap.add_argument("--target", action="append", help="repeatable; default: app and every page")
+    ap.add_argument("--budget", action="append", default=[], metavar="TARGET=MS", help="max import time per target")
+    ap.add_argument("--baseline", type=Path, help="JSON from --save-baseline to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs. baseline (0.25 = +25%%)")
+    ap.add_argument("--save-baseline", type=Path, help="write the medians here")
+    args = ap.parse_args(argv)
+
+    budgets = {}
+    for spec in args.budget:
+        name, _, ms = spec.partition("=")
+        budgets[name] = float(ms)
+    baseline: Dict[str, float] = json.loads(args.baseline.read_text()) if args.baseline else {}
+
+    available = targets()
+    failed = False
+    medians: Dict[str, float] = {}
+    for name in args.target or list(available):
+        if name not in available:
+            print(f"unknown target {name!r}; choose from {', '.join(available)}")
+            return 2
+        result = Result(name, [measure(available[name]) for _ in range(max(1, args.repeat))])
+        medians[name] = round(result.target_ms, 2)
+        print(f"{name:<14} {result.target_ms:>8.1f}ms  (streamlit {result.streamlit_ms:.1f}ms)")
+        for mod, ms in result.top(args.top):
+            print(f"    {ms:>8.2f}ms  {mod}")
+
+        heavy = result.heavy()
+        if heavy:
+            print(f"  FAIL: imports {', '.join(heavy)} at load time; import them where they are used")
+            failed = True
+        if name in budgets and result.target_ms > budgets[name]:
+            print(f"  FAIL: {result.target_ms:.1f}ms exceeds budget {budgets[name]:.1f}ms")
+            failed = True
+        if name in baseline and result.target_ms > baseline[name] * (1 + args.tolerance):
+            print(f"  FAIL: {result.target_ms:.1f}ms is more than {args.tolerance:.0%} over baseline {baseline[name]:.1f}ms")
+            failed = True
+
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(json.dumps(medians, indent=2) + "\n")
+        print(f"baseline written to {args.save_baseline}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+"""
+Concurrent-session load test of ``app.py`` and ``pages/`` through
+``streamlit.testing.v1.AppTest``.
+
+Run from the repository root::
+
+    python -m benchmarks.session_load --sessions 300 --workers 8
+    python -m benchmarks.session_load --sessions 200 --storage-latency 0.05 --budget inquiry=250
+    python -m benchmarks.session_load --memory-sessions 0   # skip the tracemalloc pass
+
+Every simulated visitor walks a journey (home → gallery page → Services
+search → Inquiry form or Schedule), each page as its own AppTest.
+AppTest installs a process-global runtime for each run, so one process can
+only run one AppTest at a time; ``--workers`` processes therefore each run
+their share of the sessions back to back, and the measured phase starts
+in all of them together once each has warmed up. Latencies are per rerun
+inside a worker, with no harness queueing in them. Inquiries go to an
+in-memory stub storage with ``--storage-latency`` per save, which holds up
+only the worker that made it; rate limiting is lifted so the limiter does
+not cap the measurement (``--keep-limits`` restores it).
+
+Reports per-page rerun latency percentiles, reruns/s and journeys/s, and,
+from a separate ``tracemalloc`` pass of ``--memory-sessions`` sequential
+sessions, peak and retained memory per session. Each ``--budget PAGE=MS``
+fails the run (exit 1) when that page's p95 rerun exceeds it.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from components.forms import STARTED_KEY, InquiryData
+from services.storage import Storage, StorageResult
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = {
+    "home": ROOT / "app.py",
+    "about": ROOT / "pages" / "01_About.py",
+    "services": ROOT / "pages" / "02_Services.py",
+    "schedule": ROOT / "pages" / "03_Schedule.py",
+    "inquiry": ROOT / "pages" / "04_Inquiry.py",
+}
+SEARCHES = ("strength", "remote", "small", "60", "nutrition", "")
+
+
+class StubStorage(Storage):
+    """Counts saves and sleeps ``latency`` seconds per call, like a fast remote backend."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.saved: List[InquiryData] = []
+
+    def save_inquiry(self, data: InquiryData) -> StorageResult:
+        if self.latency:
+            time.sleep(self.latency)
+        self.saved.append(data)
+        return StorageResult(ok=True, message="stub")
+
+
+@dataclass
+class Stats:
+    """Per-worker results, sent back to the parent as ``asdict`` and merged there."""
+
+    latencies_ms: Dict[str, List[float]] = field(default_factory=dict)
+    errors: Dict[str, int] = field(default_factory=dict)
+    first_error: Dict[str, str] = field(default_factory=dict)
+    journeys: int = 0
+    submits: int = 0
+    saved: int = 0
+
+    def record(self, page: str, ms: float, error: str = "") -> None:
+        self.latencies_ms.setdefault(page, []).append(ms)
+        if error:
+            self.errors[page] = self.errors.get(page, 0) + 1
+            self.first_error.setdefault(page, error)
+
+    def merge(self, other: "Stats") -> None:
+        for page, data in other.latencies_ms.items():
+            self.latencies_ms.setdefault(page, []).extend(data)
+        for page, n in other.errors.items():
+            self.errors[page] = self.errors.get(page, 0) + n
+        for page, error in other.first_error.items():
+            self.first_error.setdefault(page, error)
+        self.journeys += other.journeys
+        self.submits += other.submits
+        self.saved += other.saved
+
+    @property
+    def reruns(self) -> int:
+        return sum(len(v) for v in self.latencies_ms.values())
+
+
+def _pct(data: Sequence[float], q: float) -> float:
+    data = sorted(data)
+    return data[min(len(data) - 1, int(q * len(data)))] if data else 0.0
+
+
+class Session:
+    """One visitor: an AppTest per page, created on first visit and kept for the journey."""
+
+    def __init__(self, stats: Stats, timeout: float, rng: random.Random) -> None:
+        self.stats = stats
+        self.timeout = timeout
+        self.rng = rng
+        self.apps: Dict[str, object] = {}
+
+    def _rerun(self, page: str, action: Callable[[], object]) -> object:
+        t0 = time.perf_counter()
+        error = ""
+        try:
+            at = action()
+            if at.exception:  # type: ignore[attr-defined]
+                error = at.exception[0].value  # type: ignore[attr-defined]
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            at = None
+        self.stats.record(page, (time.perf_counter() - t0) * 1000.0, error)
+        return at
+
+    def open(self, page: str):
+        from streamlit.testing.v1 import AppTest
+
+        at = self.apps.get(page)
+        if at is None:
+            at = self.apps[page] = AppTest.from_file(str(PAGES[page]), default_timeout=self.timeout)
+        return self._rerun(page, at.run)
+
+    def click(self, page: str, label: str) -> None:
+        at = self.apps[page]
+        for button in at.button:  # type: ignore[attr-defined]
+            if button.label == label and not button.disabled:
+                self._rerun(page, lambda: button.click().run())
+                return
+
+    def journey(self) -> None:
+        rng = self.rng
+        self.open("home")
+        if rng.random() < 0.4:
+            self.click("home", "Next →")
+        if rng.random() < 0.3:
+            self.open("about")
+
+        at = self.open("services")
+        if at is not None and rng.random() < 0.6:
+            search = [w for w in at.text_input if w.label == "Search"]  # type: ignore[attr-defined]
+            if search:
+                query = rng.choice(SEARCHES)
+                self._rerun("services", lambda: search[0].input(query).run())
+
+        if rng.random() < 0.5:
+            self.inquire()
+            self.stats.submits += 1
+        else:
+            self.open("schedule")
+        self.stats.journeys += 1
+
+    def inquire(self) -> None:
+        at = self.open("inquiry")
+        if at is None:
+            return
+        n = self.rng.randrange(1_000_000)
+        values = {
+            "Name*": f"Load Test {n}",
+            "Email*": f"load{n}@example.com",
+            "Phone": "",
+            "Goals": f"Build strength before the season, attempt {n}.",
+            "Additional Notes": "",
+        }
+        for widget in list(at.text_input) + list(at.text_area):  # type: ignore[attr-defined]
+            if widget.label in values:
+                widget.input(values[widget.label])
+        # A real visitor spends a while on the form; the spam filter checks that
+        at.session_state[STARTED_KEY] = time.time() - 60  # type: ignore[attr-defined]
+        self.click("inquiry", "Preview")
+        self.click("inquiry", "Submit Inquiry")
+
+
+def _install_stubs(storage: StubStorage, keep_limits: bool) -> None:
+    """Pages import these at the top of every run, so patching the modules is enough."""
+    import services.ratelimit
+    import services.storage
+
+    services.storage.get_storage = lambda: storage
+    if not keep_limits:
+        unlimited = services.ratelimit.RateLimiter(1e9, 1e9, 1e9, 1e9)
+        services.ratelimit.get_limiter = lambda: unlimited
+
+
+def _worker(
+    worker: int,
+    workers: int,
+    sessions: int,
+    args: argparse.Namespace,
+    start: Any,  # a Manager().Barrier proxy shared by all workers
+) -> Tuple[Dict[str, Any], float, float]:
+    """
+    Run sessions ``worker``, ``worker + workers``, ... one after another in this
+    process. Returns plain data: AppTest rebinds ``__main__`` during a run, so
+    classes defined here do not pickle by reference.
+    """
+    logging.getLogger("streamlit").setLevel(logging.ERROR)  # bare-mode and deprecation chatter
+    storage = StubStorage(args.storage_latency)
+    _install_stubs(storage, args.keep_limits)
+    for i in range(args.warmup):  # imports, caches, manifests
+        Session(Stats(), args.timeout, random.Random(args.seed + 10_000_000 + i)).journey()
+    del storage.saved[:]
+
+    stats = Stats()
+    start.wait()
+    t0 = time.time()
+    for i in range(worker, sessions, workers):
+        Session(stats, args.timeout, random.Random(args.seed + i)).journey()
+    stats.saved = len(storage.saved)
+    return asdict(stats), t0, time.time()
+
+
+def run_load(sessions: int, workers: int, args: argparse.Namespace) -> Tuple[Stats, float]:
+    """Merged stats of all workers and the wall time from the common start to the last finish."""
+    stats = Stats()
+    with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers=workers) as pool:
+        start = manager.Barrier(workers)
+        futures = [pool.submit(_worker, w, workers, sessions, args, start) for w in range(workers)]
+        results = [f.result() for f in futures]
+    for worker_stats, _, _ in results:
+        stats.merge(Stats(**worker_stats))
+    return stats, max(t1 for _, _, t1 in results) - min(t0 for _, t0, _ in results)
+
+
+def measure_memory(sessions: int, timeout: float, seed: int) -> Tuple[float, float]:
+    """(peak KiB during one session, KiB still held per live session), sequential under tracemalloc."""
+    stats = Stats()
+    live: List[Session] = []
+    gc.collect()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    peaks = []
+    for i in range(sessions):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        s = Session(stats, timeout, random.Random(seed + i))
+        s.journey()
+        live.append(s)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(peaks) / 1024, (current - base) / max(1, len(live)) / 1024
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sessions", type=int, default=200, help="simulated visitors")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes running sessions at once")
+    ap.add_argument("--storage-latency", type=float, default=0.0, help="stub save latency (s)")
+    ap.add_argument("--timeout", type=float, default=30.0, help="per-rerun AppTest timeout (s)")
+    ap.add_argument("--warmup", type=int, default=3, help="sessions each worker runs first, not reported")
+    ap.add_argument("--memory-sessions", type=int, default=20, help="sessions for the tracemalloc pass; 0 skips it")
+    ap.add_argument("--keep-limits", action="store_true", help="leave the inquiry rate limiter on")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--budget", action="append", default=[], metavar="PAGE=MS", help="max p95 rerun per page")
+    args = ap.parse_args(argv)
+    logging.getLogger("streamlit").setLevel(logging.ERROR)  # bare-mode and deprecation chatter
+
+    budgets = {}
+    for spec in args.budget:
+        page, _, ms = spec.partition("=")
+        budgets[page] = float(ms)
+
+    workers = max(1, min(args.workers, args.sessions))
+    stats, elapsed = run_load(args.sessions, workers, args)
+    print(
+        f"{args.sessions} sessions on {workers} workers in {elapsed:.1f}s: "
+        f"{stats.journeys / elapsed:.1f} journeys/s, {stats.reruns / elapsed:.1f} reruns/s, "
+        f"{stats.submits} submits ({stats.saved} saved)"
+    )
+    failed = False
+    for page, data in sorted(stats.latencies_ms.items()):
+        print(
+            f"{page:<10} n={len(data):<6} p50={_pct(data, 0.50):>8.1f}ms  p95={_pct(data, 0.95):>8.1f}ms"
+            f"  p99={_pct(data, 0.99):>8.1f}ms  errors={stats.errors.get(page, 0)}"
+        )
+        if page in stats.first_error:
+            print(f"  first error: {stats.first_error[page].splitlines()[0][:200]}")
+        limit = budgets.get(page)
+        if limit is not None and _pct(data, 0.95) > limit:
+            print(f"  !! {page} p95 {_pct(data, 0.95):.1f}ms exceeds budget {limit:.1f}ms")
+            failed = True
+    if sum(stats.errors.values()):
+        failed = True
+
+    if args.memory_sessions:
+        _install_stubs(StubStorage(args.storage_latency), args.keep_limits)
+        peak_kib, retained_kib = measure_memory(args.memory_sessions, args.timeout, args.seed)
+        print(f"memory     peak/session={peak_kib:,.0f} KiB  retained/session={retained_kib:,.0f} KiB")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
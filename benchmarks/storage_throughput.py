@@ -0,0 +1,175 @@
+"""
+Inquiry write-path throughput against the local Google Sheets stand-in.
+
+Run from the repository root::
+
+    python -m benchmarks.storage_throughput --n 500 --concurrency 8 --latency 0.2
+    python -m benchmarks.storage_throughput --budget sheets-spool=5 --budget sqlite=10
+
+Reports submits/second and p50/p99 submit latency per backend/batching mode.
+Each ``--budget MODE=MS`` fails the run (exit 1) when that mode's p99 exceeds it.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from components.forms import InquiryData
+from services.fake_sheets import FakeClient, FaultPlan
+from services.local_storage import SQLiteStorage
+from services.spool import InquirySpool, SheetWriter, SpooledSheetStorage
+from services.storage import (
+    GoogleSheetStorage,
+    MirroredStorage,
+    Storage,
+    StorageResult,
+    build_row,
+    set_client_factory,
+)
+
+MODES = ("sheets-direct", "sheets-spool", "sqlite", "sqlite+mirror")
+
+
+@dataclass
+class Report:
+    mode: str
+    n: int
+    failures: int
+    elapsed: float
+    latencies_ms: List[float]
+    drain_s: float = 0.0
+    sheet_calls: int = 0
+
+    def pct(self, q: float) -> float:
+        data = sorted(self.latencies_ms)
+        return data[min(len(data) - 1, int(q * len(data)))] if data else 0.0
+
+    def line(self) -> str:
+        rate = self.n / self.elapsed if self.elapsed else 0.0
+        extra = f"  drain={self.drain_s:.2f}s" if self.drain_s else ""
+        return (
+            f"{self.mode:<14} {rate:>9.1f}/s  p50={self.pct(0.50):>8.2f}ms  p99={self.pct(0.99):>8.2f}ms"
+            f"  mean={statistics.fmean(self.latencies_ms):>8.2f}ms  fail={self.failures}"
+            f"  sheet_calls={self.sheet_calls}{extra}"
+        )
+
+
+def _inquiry(i: int) -> InquiryData:
+    return InquiryData(
+        name=f"Bench {i}",
+        email=f"bench{i}@example.com",
+        phone="",
+        goals="Get stronger " * 10,
+        notes="",
+        honey="",
+        submitted_ts=time.time(),
+        token=f"bench-{i}",
+    )
+
+
+class _DirectSheet(Storage):
+    """
+    One ``append_rows`` per submit. ``GoogleSheetStorage.save_inquiry`` would
+    hide failures behind its console fallback, so call the sheet directly.
+    """
+
+    def __init__(self, sheet: GoogleSheetStorage) -> None:
+        self.sheet = sheet
+
+    def save_inquiry(self, data: InquiryData) -> StorageResult:
+        try:
+            self.sheet.append_rows([build_row(data)])
+        except Exception as e:
+            return StorageResult(ok=False, message=str(e))
+        return StorageResult(ok=True, message="Saved to Google Sheet.")
+
+
+def _drive(storage: Storage, n: int, concurrency: int) -> tuple[List[float], int, float]:
+    def one(i: int) -> tuple[float, bool]:
+        t0 = time.perf_counter()
+        ok = storage.save_inquiry(_inquiry(i)).ok
+        return (time.perf_counter() - t0) * 1000.0, ok
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(n)))
+    elapsed = time.perf_counter() - t0
+    return [ms for ms, _ in results], sum(1 for _, ok in results if not ok), elapsed
+
+
+def _wait_drained(spool: InquirySpool, timeout: float) -> float:
+    t0 = time.perf_counter()
+    while len(spool) and time.perf_counter() - t0 < timeout:
+        time.sleep(0.01)
+    return time.perf_counter() - t0
+
+
+def run_mode(mode: str, args: argparse.Namespace, workdir: Path) -> Report:
+    faults = FaultPlan(latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate, seed=1)
+    client = FakeClient(faults)
+    set_client_factory(lambda _info: client)
+    sheet = GoogleSheetStorage(sheet_name=f"bench-{mode}", service_json="{}")
+
+    writer = None
+    factories: Dict[str, Callable[[], Storage]] = {
+        "sheets-direct": lambda: _DirectSheet(sheet),
+        "sqlite": lambda: SQLiteStorage(workdir / f"{mode}.sqlite3"),
+    }
+    if mode in ("sheets-spool", "sqlite+mirror"):
+        spool = InquirySpool(workdir / f"{mode}-spool.sqlite3")
+        writer = SheetWriter(spool, sheet, batch_size=args.batch_size, base_delay=0.05, max_delay=1.0)
+        writer.start()
+        factories["sheets-spool"] = lambda: SpooledSheetStorage(writer)
+        factories["sqlite+mirror"] = lambda: MirroredStorage(
+            SQLiteStorage(workdir / f"{mode}.sqlite3"), SpooledSheetStorage(writer)
+        )
+
+    latencies, failures, elapsed = _drive(factories[mode](), args.n, args.concurrency)
+    report = Report(mode, args.n, failures, elapsed, latencies)
+    if writer is not None:
+        report.drain_s = _wait_drained(writer.spool, timeout=args.drain_timeout)
+        writer.stop()
+    report.sheet_calls = faults.calls.get("append_rows", 0) + faults.calls.get("append_row", 0)
+    set_client_factory(None)
+    return report
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--n", type=int, default=300, help="submits per mode")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--latency", type=float, default=0.15, help="fake Sheets API latency per call (s)")
+    ap.add_argument("--jitter", type=float, default=0.05)
+    ap.add_argument("--failure-rate", type=float, default=0.0)
+    ap.add_argument("--batch-size", type=int, default=50, help="append_rows batch size for spooled modes")
+    ap.add_argument("--drain-timeout", type=float, default=120.0)
+    ap.add_argument("--mode", action="append", choices=MODES, help="repeatable; default: all")
+    ap.add_argument("--budget", action="append", default=[], metavar="MODE=MS", help="max p99 per mode")
+    args = ap.parse_args(argv)
+
+    budgets = {}
+    for spec in args.budget:
+        mode, _, ms = spec.partition("=")
+        budgets[mode] = float(ms)
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in args.mode or MODES:
+            report = run_mode(mode, args, Path(tmp))
+            print(report.line())
+            limit = budgets.get(mode)
+            if limit is not None and report.pct(0.99) > limit:
+                print(f"  !! {mode} p99 {report.pct(0.99):.2f}ms exceeds budget {limit:.2f}ms")
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
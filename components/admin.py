@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import hmac
+
+import streamlit as st
+
+from services.settings import get_settings
+
+ADMIN_KEY = "_admin_ok"
+
+
+def require_admin() -> bool:
+    """
+    Password gate for admin pages.
+
+    Uses ``ADMIN_PASSWORD`` from secrets; admin pages stay closed when it is unset.
+    """
+    expected = get_settings().admin_password
+    if not expected:
+        st.error("Admin pages are disabled. Set `ADMIN_PASSWORD` in `.streamlit/secrets.toml`.")
+        return False
+    if st.session_state.get(ADMIN_KEY):
+        return True
+    with st.form(key="admin_login"):
+        pw = st.text_input("Admin password", type="password")
+        if st.form_submit_button("Unlock"):
+            if hmac.compare_digest(pw.encode("utf-8"), expected.encode("utf-8")):
+                st.session_state[ADMIN_KEY] = True
+                st.rerun()
+            st.error("Incorrect password.")
+    return False
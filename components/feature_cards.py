@@ -2,24 +2,31 @@ from __future__ import annotations
 
 import streamlit as st
 
+from components.fragments import Markup, fragment
+from services.metrics import instrument
 
+FEATURE_CARDS = [
+    ("1:1 Coaching", "Precision programming and hands-on coaching tailored to you."),
+    ("Small-Group", "Train with 2–4 peers. Accountability with a premium feel."),
+    ("Virtual", "Remote sessions and expert program oversight—wherever you are."),
+    ("Nutrition Add-On", "Pragmatic guidance to complement your training."),
+]
+
+
+def card_html(title: str, blurb: str) -> str:
+    return fragment("card", title=title, blurb=blurb)
+
+
+@instrument("feature_cards")
 def render_feature_cards(accent_hex: str = "#C7A97B") -> None:
     st.markdown("### What we offer")
     cols = st.columns(4, gap="large")
-    cards = [
-        ("1:1 Coaching", "Precision programming and hands-on coaching tailored to you."),
-        ("Small-Group", "Train with 2–4 peers. Accountability with a premium feel."),
-        ("Virtual", "Remote sessions and expert program oversight—wherever you are."),
-        ("Nutrition Add-On", "Pragmatic guidance to complement your training."),
-    ]
-    for col, (title, blurb) in zip(cols, cards):
+    for col, (title, blurb) in zip(cols, FEATURE_CARDS):
         with col:
-            st.markdown(
-                f"""
-                <div class="card">
-                    <div class="card-title">{title}</div>
-                    <div class="card-blurb">{blurb}</div>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
+            st.markdown(card_html(title, blurb), unsafe_allow_html=True)
+
+
+def feature_cards_html(heading: str = "What we offer") -> str:
+    """The whole card section as one block (used by the static export)."""
+    cards = Markup("".join(card_html(t, b) for t, b in FEATURE_CARDS))
+    return fragment("card_grid", heading=heading, cards=cards)
@@ -2,12 +2,17 @@ from __future__ import annotations
 
 import re
 import time
+import uuid
 from dataclasses import dataclass
 from typing import Tuple
 
 import streamlit as st
 
 EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+TOKEN_KEY = "inquiry_token"
+STARTED_KEY = "inquiry_started_ts"
+NOTES_PREFILL_KEY = "inquiry_notes_prefill"  # set by other pages, e.g. a requested time slot
+MAX_CHARS = {"name": 120, "email": 120, "phone": 40, "goals": 5000, "notes": 5000}
 
 
 @dataclass
@@ -19,15 +24,32 @@ class InquiryData:
     notes: str
     honey: str  # honeypot
     submitted_ts: float
+    token: str = ""  # idempotency token of the form render
+    source: str = "streamlit"
+    started_ts: float = 0.0  # when this form instance was first shown
+    spam_score: float = 0.0
+
+
+def new_form_token() -> str:
+    """Start a fresh form instance; call after a successful submit."""
+    token = uuid.uuid4().hex
+    st.session_state[TOKEN_KEY] = token
+    st.session_state[STARTED_KEY] = time.time()
+    return token
 
 
 def render_inquiry_form() -> InquiryData:
+    token = st.session_state.get(TOKEN_KEY) or new_form_token()
+    if NOTES_PREFILL_KEY in st.session_state:
+        st.session_state["inquiry_notes"] = st.session_state.pop(NOTES_PREFILL_KEY)
     with st.form(key="inquiry_form", clear_on_submit=False):
-        name = st.text_input("Name*", max_chars=120, placeholder="Your full name")
-        email = st.text_input("Email*", max_chars=120, placeholder="you@email.com")
-        phone = st.text_input("Phone", max_chars=40, placeholder="+1…")
+        name = st.text_input("Name*", max_chars=MAX_CHARS["name"], placeholder="Your full name")
+        email = st.text_input("Email*", max_chars=MAX_CHARS["email"], placeholder="you@email.com")
+        phone = st.text_input("Phone", max_chars=MAX_CHARS["phone"], placeholder="+1…")
         goals = st.text_area("Goals", height=140, placeholder="Share your goals, timeline, any constraints.")
-        notes = st.text_area("Additional Notes", height=120, placeholder="Anything else we should know?")
+        notes = st.text_area(
+            "Additional Notes", height=120, placeholder="Anything else we should know?", key="inquiry_notes"
+        )
         honey = st.text_input("Leave this field empty", value="", key="hp", help="(anti-spam)", label_visibility="collapsed")
         submitted = st.form_submit_button("Preview")
         # The main Submit button is outside, but we use this to capture state
@@ -41,6 +63,8 @@ def render_inquiry_form() -> InquiryData:
         notes=notes.strip(),
         honey=honey.strip(),
         submitted_ts=ts,
+        token=token,
+        started_ts=st.session_state.get(STARTED_KEY, 0.0),
     )
 
 
@@ -52,6 +76,9 @@ def validate_inquiry(data: InquiryData) -> Tuple[bool, str]:
     if not data.email or not EMAIL_RE.match(data.email):
         return False, "A valid email is required."
     # Optional sanity trims
-    if len(data.goals) > 5000 or len(data.notes) > 5000:
+    if len(data.goals) > MAX_CHARS["goals"] or len(data.notes) > MAX_CHARS["notes"]:
         return False, "Text fields are too long."
+    # The form widgets enforce these already; imported rows do not
+    if len(data.name) > MAX_CHARS["name"] or len(data.email) > MAX_CHARS["email"] or len(data.phone) > MAX_CHARS["phone"]:
+        return False, "Name, email or phone is too long."
     return True, "ok"
@@ -0,0 +1,129 @@
+"""
+HTML fragments shared by the Streamlit pages and the static export.
+
+Templates are compiled once at import (dedented, inter-tag whitespace
+removed) and every substituted value is HTML-escaped; ``*_href`` fields
+additionally only accept http(s), mailto, anchor and relative URLs.
+Rendered output is memoized on the arguments, so a fragment built from
+the same brand settings is produced once per process rather than on every
+rerun of every session. Pass ``Markup`` to splice in HTML that is already
+safe (e.g. another fragment).
+"""
+from __future__ import annotations
+
+import html
+import re
+import textwrap
+from functools import lru_cache
+from string import Template
+from typing import Dict, FrozenSet, Optional, Tuple
+
+_BETWEEN_TAGS_RE = re.compile(r">\s+<")
+_SAFE_SCHEMES = ("http://", "https://", "mailto:")
+
+
+class Markup(str):
+    """A string that is already HTML and must not be escaped again."""
+
+
+class Fragment:
+    def __init__(self, source: str) -> None:
+        compact = _BETWEEN_TAGS_RE.sub("><", textwrap.dedent(source).strip())
+        self.template = Template(compact)
+        self.fields: FrozenSet[str] = frozenset(
+            m.group("named") or m.group("braced")
+            for m in self.template.pattern.finditer(compact)
+            if m.group("named") or m.group("braced")
+        )
+
+    def render(self, **values: Optional[str]) -> Markup:
+        missing = self.fields - set(values)
+        if missing:
+            raise KeyError(f"missing fragment fields: {', '.join(sorted(missing))}")
+        return Markup(self.template.substitute({k: _escape(k, v) for k, v in values.items()}))
+
+
+def _safe_url(url: str) -> str:
+    u = url.strip()
+    if u.lower().startswith(_SAFE_SCHEMES) or not re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*:", u):
+        return u
+    return "#"
+
+
+def _escape(name: str, value: Optional[str]) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, Markup):
+        return value
+    text = str(value)
+    if name.endswith("_href"):
+        text = _safe_url(text)
+    return html.escape(text, quote=True)
+
+
+TEMPLATES: Dict[str, Fragment] = {
+    "hero": Fragment(
+        """
+        <section class="hero">
+            <h1 class="hero-title">${headline}</h1>
+            <p class="hero-sub">${subheadline}</p>
+            <div class="cta-row">
+                <a class="btn btn-primary" href="${primary_cta_href}">${primary_cta_text}</a>
+                <a class="btn btn-secondary" href="${secondary_cta_href}">${secondary_cta_text}</a>
+            </div>
+        </section>
+        """
+    ),
+    "card": Fragment(
+        """
+        <div class="card">
+            <div class="card-title">${title}</div>
+            <div class="card-blurb">${blurb}</div>
+        </div>
+        """
+    ),
+    "card_grid": Fragment(
+        """
+        <section class="features">
+            <h3>${heading}</h3>
+            <div class="card-grid">${cards}</div>
+        </section>
+        """
+    ),
+    "brand_title": Fragment(
+        """
+        <div class="brand-title">
+            <span class="brand-name">${brand}</span>
+            <span class="brand-tag">${tagline}</span>
+        </div>
+        """
+    ),
+    "social_badge": Fragment(
+        """
+        <div class="social-badge">
+            <a href="${insta_href}" target="_blank" rel="noopener noreferrer" aria-label="Instagram: ${handle}">
+                <span class="ig-handle">Instagram ${handle}</span>
+            </a>
+        </div>
+        """
+    ),
+    "footer": Fragment(
+        """
+        <footer class="footer">
+            <span>${label}</span>${link}
+        </footer>
+        """
+    ),
+    "footer_link": Fragment('<a href="${insta_href}" target="_blank" rel="noopener">Instagram</a>'),
+}
+
+
+@lru_cache(maxsize=512)
+def _render(name: str, items: Tuple[Tuple[str, Optional[str], bool], ...]) -> Markup:
+    return TEMPLATES[name].render(**{k: Markup(v) if safe else v for k, v, safe in items})
+
+
+def fragment(name: str, **values: Optional[str]) -> Markup:
+    """Render template ``name``; identical arguments return the cached string."""
+    # Markup("<b>") == "<b>", so the key records which values are pre-escaped
+    return _render(name, tuple(sorted((k, v, isinstance(v, Markup)) for k, v in values.items())))
@@ -1,40 +1,75 @@
 from __future__ import annotations
 
+import math
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable
 
 import streamlit as st
-from streamlit.components.v1 import html
 
+from components.instagram import render_instagram_previews
+from services.gallery_manifest import load_manifest
+from services.images import variant_for
+from services.instagram import load_posts
+from services.metrics import instrument, instrumented_fragment
 
-def _local_images(images_dir: Path) -> List[Path]:
-    if not images_dir.exists():
-        return []
-    exts = {".jpg", ".jpeg", ".png", ".webp"}
-    return sorted([p for p in images_dir.iterdir() if p.suffix.lower() in exts])
+# Rendered width of one of the four gallery columns in the wide layout
+COLUMN_PX = 320
+PAGE_KEY = "gallery_page"
 
 
-def render_gallery(images_dir: Path, instagram_post_urls: Iterable[str], max_images: int = 8) -> None:
-    st.markdown("### Gallery")
-    local = _local_images(images_dir)
-    if local:
+def _placeholder(color: str, aspect: float) -> str:
+    return (
+        f'<div class="gallery-ph" style="background:{color};'
+        f'padding-top:{aspect * 100:.1f}%;border-radius:8px;"></div>'
+    )
+
+
+def _go_to(page: int) -> None:
+    st.session_state[PAGE_KEY] = page  # callbacks run before the rerun they trigger
+
+
+@st.fragment
+@instrumented_fragment("home", "gallery.grid")
+def _gallery_grid(images_dir: Path, page_size: int) -> None:
+    """Grid and pager; Previous/Next rerun only this block."""
+    entries = load_manifest(images_dir)
+    if entries:
+        pages = math.ceil(len(entries) / page_size)
+        page = min(st.session_state.get(PAGE_KEY, 0), pages - 1)
+        visible = entries[page * page_size : (page + 1) * page_size]
+
         cols = st.columns(4, gap="small")
-        for i, img_path in enumerate(local[:max_images]):
+        # Color blocks first so the grid lays out at once, then fill in images
+        slots = []
+        for i, entry in enumerate(visible):
             with cols[i % 4]:
-                st.image(str(img_path), use_container_width=True, caption=img_path.name)
+                slot = st.empty()
+                slot.markdown(_placeholder(entry.color, entry.aspect), unsafe_allow_html=True)
+                slots.append(slot)
+        for slot, entry in zip(slots, visible):
+            img = variant_for(images_dir / entry.name, COLUMN_PX)
+            slot.image(str(img), use_container_width=True, caption=entry.name)
+
+        if pages > 1:
+            prev_col, info_col, next_col = st.columns([1, 4, 1])
+            with prev_col:
+                st.button("← Previous", key="gallery_prev", disabled=page == 0, on_click=_go_to, args=(page - 1,))
+            with info_col:
+                st.caption(f"Page {page + 1} of {pages} · {len(entries)} images")
+            with next_col:
+                st.button("Next →", key="gallery_next", disabled=page >= pages - 1, on_click=_go_to, args=(page + 1,))
     else:
         st.caption("Add images to `assets/images/` to populate the gallery.")
 
-    # Optional: show embeds if provided
+
+@instrument("gallery")
+def render_gallery(images_dir: Path, instagram_post_urls: Iterable[str], page_size: int = 8) -> None:
+    st.markdown("### Gallery")
+    _gallery_grid(images_dir, page_size)
+
+    # Optional: preview cards from the local snapshot; embeds load on click
     urls = list(instagram_post_urls or [])
     if urls:
         st.divider()
         st.caption("Instagram highlights")
-        for u in urls[:2]:  # keep it light
-            html(
-                f"""
-                <blockquote class="instagram-media" data-instgrm-permalink="{u}" data-instgrm-version="14"></blockquote>
-                <script async src="//www.instagram.com/embed.js"></script>
-                """,
-                height=600,
-            )
+        render_instagram_previews(load_posts(urls[:2]), key="ig_highlights")  # keep it light
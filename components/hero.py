@@ -2,7 +2,30 @@ from __future__ import annotations
 
 import streamlit as st
 
+from components.fragments import fragment
+from services.metrics import instrument
 
+
+def hero_html(
+    headline: str,
+    subheadline: str,
+    primary_cta_text: str,
+    primary_cta_href: str,
+    secondary_cta_text: str,
+    secondary_cta_href: str,
+) -> str:
+    return fragment(
+        "hero",
+        headline=headline,
+        subheadline=subheadline,
+        primary_cta_text=primary_cta_text,
+        primary_cta_href=primary_cta_href,
+        secondary_cta_text=secondary_cta_text,
+        secondary_cta_href=secondary_cta_href,
+    )
+
+
+@instrument("hero")
 def render_hero(
     headline: str,
     subheadline: str,
@@ -14,15 +37,13 @@ def render_hero(
 ) -> None:
     """Large hero section with CTAs."""
     st.markdown(
-        f"""
-        <section class="hero">
-            <h1 class="hero-title">{headline}</h1>
-            <p class="hero-sub">{subheadline}</p>
-            <div class="cta-row">
-                <a class="btn btn-primary" href="{primary_cta_href}">{primary_cta_text}</a>
-                <a class="btn btn-secondary" href="{secondary_cta_href}">{secondary_cta_text}</a>
-            </div>
-        </section>
-        """,
+        hero_html(
+            headline,
+            subheadline,
+            primary_cta_text,
+            primary_cta_href,
+            secondary_cta_text,
+            secondary_cta_href,
+        ),
         unsafe_allow_html=True,
     )
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import html as html_lib
+from typing import Sequence
+
+import streamlit as st
+from streamlit.components.v1 import html
+
+from services.images import variant_for
+from services.instagram import InstagramPost
+from services.metrics import instrument
+
+ACTIVE_KEY = "ig_active_post"
+CARD_PX = 320
+
+
+def _embed(permalink: str) -> str:
+    url = html_lib.escape(permalink, quote=True)
+    return f"""
+        <blockquote class="instagram-media" data-instgrm-permalink="{url}" data-instgrm-version="14"></blockquote>
+        <script async src="//www.instagram.com/embed.js"></script>
+        """
+
+
+@instrument("instagram")
+def render_instagram_previews(posts: Sequence[InstagramPost], key: str, columns: int = 3) -> None:
+    """
+    Static preview cards from the local snapshot. The real embed (and
+    Instagram's script) loads only for the post a visitor clicks, one at a time.
+    """
+    if not posts:
+        return
+    cols = st.columns(min(len(posts), columns))
+    for i, post in enumerate(posts):
+        with cols[i % len(cols)]:
+            thumb = post.thumbnail_path
+            if thumb:
+                st.image(str(variant_for(thumb, CARD_PX)), use_container_width=True)
+            else:
+                st.markdown('<div class="ig-card-empty">Instagram post</div>', unsafe_allow_html=True)
+            if post.caption:
+                caption = post.caption if len(post.caption) <= 140 else post.caption[:139] + "…"
+                st.caption(caption)
+            left, right = st.columns(2)
+            with left:
+                if st.button("Load post", key=f"{key}_{i}"):
+                    st.session_state[ACTIVE_KEY] = post.permalink
+            with right:
+                st.link_button("Open ↗", post.permalink)
+
+    active = st.session_state.get(ACTIVE_KEY)
+    if active and any(p.permalink == active for p in posts):
+        html(_embed(active), height=600)
@@ -1,64 +1,104 @@
 from __future__ import annotations
 
-import json
-from pathlib import Path
-from typing import Any
-
 import streamlit as st
+
+from services.catalog import Catalog, CatalogError, load_catalog
+from services.assets import inject_styles
+from services.metrics import instrumented_fragment, instrumented_page
 from services.seo import inject_seo
+from services.settings import get_settings
 
-BRAND_NAME: str = st.secrets.get("BRAND_NAME", "Thrive with Frida")
-HEX_PRIMARY: str = st.secrets.get("HEX_PRIMARY", "#0F1115")
+SETTINGS = get_settings()
+BRAND_NAME: str = SETTINGS.brand_name
+HEX_PRIMARY: str = SETTINGS.hex_primary
+PAGE_SIZE = 10
+SERVICES_DESCRIPTION = "Private coaching, concierge training, small-group formats, and remote programming."
 
-DATA_DIR = Path("data")
-SERVICES_JSON = DATA_DIR / "services.json"
 
+@st.fragment
+@instrumented_fragment("services", "browser")
+def service_browser(services: Catalog) -> None:
+    """Search, filters, cards and pager; interacting here reruns only this block."""
+    index = services.index
+    search_col, delivery_col, length_col = st.columns([2, 1, 1])
+    with search_col:
+        query = st.text_input("Search", placeholder="e.g. strength, remote, 60 min", label_visibility="collapsed")
+    with delivery_col:
+        delivery = st.multiselect("Delivery", list(index.delivery_types), placeholder="Delivery")
+    with length_col:
+        length = st.multiselect("Session", list(index.session_lengths), placeholder="Session length")
 
-def _load_services() -> list[dict[str, Any]]:
-    try:
-        with SERVICES_JSON.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return []
+    hits = index.search(query, delivery, length)
+    # Start from the first page whenever the search changes
+    filters = (query, tuple(delivery), tuple(length))
+    if st.session_state.get("services_filters") != filters:
+        st.session_state["services_filters"] = filters
+        st.session_state["services_page"] = 1
+    if not hits:
+        st.info("No services match your search.")
+    else:
+        pages = max(1, -(-len(hits) // PAGE_SIZE))
+        page_no = min(st.session_state.get("services_page", 1), pages)
+        st.session_state["services_page"] = page_no
+        visible = hits[(page_no - 1) * PAGE_SIZE : page_no * PAGE_SIZE]
+
+        cols = st.columns(2, gap="large")
+        for slot, idx in enumerate(visible):
+            svc = services.entries[idx]
+            with cols[slot % 2]:
+                with st.container():
+                    st.markdown(f"### {svc.title}")
+                    st.write(svc.blurb)
+                    meta = []
+                    if svc.session_length:
+                        meta.append(f"**Session**: {svc.session_length}")
+                    if svc.delivery_type:
+                        meta.append(f"**Delivery**: {svc.delivery_type}")
+                    if meta:
+                        st.caption(" • ".join(meta))
 
+                    left, right = st.columns(2)
+                    with left:
+                        if st.button("Schedule", key=f"sched_{idx}"):
+                            st.switch_page("pages/03_Schedule.py")
+                    with right:
+                        if st.button("Send Inquiry", key=f"inq_{idx}"):
+                            st.switch_page("pages/04_Inquiry.py")
 
+        if pages > 1:
+            st.number_input(
+                f"Page (of {pages}, {len(hits)} services)",
+                min_value=1,
+                max_value=pages,
+                key="services_page",
+            )
+
+
+@instrumented_page("services")
 def page() -> None:
     st.set_page_config(page_title=f"Services — {BRAND_NAME}", page_icon="🗂", layout="wide")
     inject_seo(
         title=f"Services — {BRAND_NAME}",
-        description="Private coaching, concierge training, small-group formats, and remote programming.",
+        description=SERVICES_DESCRIPTION,
         image_url=None,
         theme_color=HEX_PRIMARY,
     )
+    inject_styles()
 
     st.markdown("## Services")
     st.caption("Select a service to begin. Pricing is available upon request.")
-    services = _load_services()
+    try:
+        services = load_catalog()
+    except CatalogError as e:
+        st.error("The services catalog could not be loaded.")
+        for problem in e.problems:
+            st.caption(f"• {problem}")
+        return
     if not services:
         st.warning("No services found. Add entries to `data/services.json`.")
         return
 
-    cols = st.columns(2, gap="large")
-    for idx, svc in enumerate(services):
-        with cols[idx % 2]:
-            with st.container():
-                st.markdown(f"### {svc.get('title', 'Service')}")
-                st.write(svc.get("blurb", ""))
-                meta = []
-                if length := svc.get("session_length"):
-                    meta.append(f"**Session**: {length}")
-                if dtype := svc.get("delivery_type"):
-                    meta.append(f"**Delivery**: {dtype}")
-                if meta:
-                    st.caption(" • ".join(meta))
-
-                left, right = st.columns(2)
-                with left:
-                    if st.button("Schedule", key=f"sched_{idx}"):
-                        st.switch_page("pages/03_Schedule.py")
-                with right:
-                    if st.button("Send Inquiry", key=f"inq_{idx}"):
-                        st.switch_page("pages/04_Inquiry.py")
+    service_browser(services)
 
     st.divider()
     st.write("Looking for something bespoke? Use the **Inquiry** page to describe needs and availability.")
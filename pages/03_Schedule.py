@@ -1,17 +1,93 @@
 from __future__ import annotations
 
-from typing import Optional
+import time
+from datetime import tzinfo
+from urllib.parse import quote
 
 import streamlit as st
 from streamlit.components.v1 import html
 
+from components.forms import NOTES_PREFILL_KEY
+from services.availability import AvailabilityCache, Slot, get_availability, zone
+from services.assets import inject_styles
+from services.metrics import instrumented_fragment, instrumented_page
 from services.seo import inject_seo
+from services.settings import get_settings
 
-BRAND_NAME: str = st.secrets.get("BRAND_NAME", "Thrive with Frida")
-HEX_PRIMARY: str = st.secrets.get("HEX_PRIMARY", "#0F1115")
-SCHEDULING_EMBED_URL: Optional[str] = st.secrets.get("SCHEDULING_EMBED_URL", "")
+SETTINGS = get_settings()
+BRAND_NAME: str = SETTINGS.brand_name
+HEX_PRIMARY: str = SETTINGS.hex_primary
+SCHEDULING_EMBED_URL: str = SETTINGS.scheduling_embed_url
+SLOT_COLUMNS = 4
 
 
+def _embed(url: str) -> None:
+    with st.container(border=True):
+        st.caption("Loading scheduling…")
+        iframe = f"""
+        <iframe
+            src="{url}"
+            width="100%"
+            height="900"
+            frameborder="0"
+            allowfullscreen
+            title="Cal.com Scheduling"
+            style="border-radius:12px;"
+        ></iframe>
+        """
+        html(iframe, height=920, scrolling=True)
+
+
+def _booking_url(slot: Slot, tz: tzinfo) -> str:
+    if slot.booking_url:
+        return slot.booking_url
+    template = SETTINGS.scheduling_booking_url
+    if not template:
+        return ""
+    local = slot.start.astimezone(tz)
+    return template.format(
+        start=quote(slot.start.isoformat(), safe=""),
+        date=local.date().isoformat(),
+        time=local.strftime("%H:%M"),
+    )
+
+
+@st.fragment
+@instrumented_fragment("schedule", "slots")
+def slot_picker(cache: AvailabilityCache) -> None:
+    """Day and time buttons served from the in-memory availability; picking a day reruns only this."""
+    tz = zone(SETTINGS.scheduling_timezone)
+    availability = cache.get()
+    days = availability.by_day(tz)
+    if not days:
+        if availability.error:
+            st.warning("Live availability can't be loaded right now. Use the booking calendar below.")
+        elif availability.fetched_at:
+            st.info("No open times in the coming weeks. Send an inquiry and we'll find one.")
+        else:
+            st.info("Loading availability…")
+        return
+
+    day = st.selectbox("Day", list(days), format_func=lambda d: d.strftime("%A, %d %B"), key="schedule_day")
+    cols = st.columns(SLOT_COLUMNS)
+    for i, slot in enumerate(days.get(day, [])):
+        local = slot.start.astimezone(tz)
+        label = f"{local:%H:%M} · {slot.minutes} min"
+        url = _booking_url(slot, tz)
+        with cols[i % SLOT_COLUMNS]:
+            if url:
+                st.link_button(label, url, use_container_width=True)
+            elif st.button(label, key=f"slot_{slot.start.isoformat()}", use_container_width=True):
+                requested = f"{local:%A %d %B, %H:%M} ({SETTINGS.scheduling_timezone})"
+                st.session_state[NOTES_PREFILL_KEY] = f"Requested time: {requested}"
+                st.switch_page("pages/04_Inquiry.py")
+    updated = time.strftime("%H:%M", time.localtime(availability.fetched_at))
+    st.caption(f"Times in {SETTINGS.scheduling_timezone}. Availability updated {updated}.")
+    if availability.error:
+        st.caption("⚠️ Availability couldn't be refreshed just now, so some of these times may have been taken.")
+
+
+@instrumented_page("schedule")
 def page() -> None:
     st.set_page_config(page_title=f"Schedule — {BRAND_NAME}", page_icon="📅", layout="wide")
     inject_seo(
@@ -20,31 +96,29 @@ def page() -> None:
         image_url=None,
         theme_color=HEX_PRIMARY,
     )
+    inject_styles()
 
     st.markdown("## Schedule")
 
+    cache = get_availability()
+    if cache is not None:
+        slot_picker(cache)
+        if SCHEDULING_EMBED_URL:
+            # The iframe is slow to load, so only mount it when asked for
+            if st.toggle("Show the full booking calendar", key="schedule_show_embed"):
+                _embed(SCHEDULING_EMBED_URL)
+        return
+
     if not SCHEDULING_EMBED_URL:
         st.error("Scheduling link is not configured.")
         st.write(
             "Add `SCHEDULING_EMBED_URL` to `.streamlit/secrets.toml` "
-            "(e.g., `https://cal.com/your-handle?embed=true`)."
+            "(e.g., `https://cal.com/your-handle?embed=true`), "
+            "or set `AVAILABILITY_PROVIDER` for the built-in slot picker."
         )
         return
 
-    with st.container(border=True):
-        st.caption("Loading scheduling…")
-        iframe = f"""
-        <iframe
-            src="{SCHEDULING_EMBED_URL}"
-            width="100%"
-            height="900"
-            frameborder="0"
-            allowfullscreen
-            title="Cal.com Scheduling"
-            style="border-radius:12px;"
-        ></iframe>
-        """
-        html(iframe, height=920, scrolling=True)
+    _embed(SCHEDULING_EMBED_URL)
 
 
 if __name__ == "__main__":
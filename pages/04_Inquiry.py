@@ -1,44 +1,30 @@
 from __future__ import annotations
 
-import time
-
 import streamlit as st
 
-from components.forms import InquiryData, render_inquiry_form, validate_inquiry
+from components.forms import InquiryData, new_form_token, render_inquiry_form, validate_inquiry
+from services.ratelimit import client_key, get_limiter
+from services.assets import inject_styles
+from services.metrics import instrumented_fragment, instrumented_page, timed
+from services.notify import notify_inquiry
 from services.seo import inject_seo
-from services.storage import GoogleSheetStorage, StorageResult
-
-BRAND_NAME: str = st.secrets.get("BRAND_NAME", "Thrive with Frida")
-HEX_PRIMARY: str = st.secrets.get("HEX_PRIMARY", "#0F1115")
-
-
-def _throttle_ok() -> bool:
-    """Very light, session-based throttle."""
-    now = time.time()
-    key = "last_submit_ts"
-    last = st.session_state.get(key, 0.0)
-    if now - last < 6.0:  # 6 seconds between submits
-        return False
-    st.session_state[key] = now
-    return True
+from services.settings import get_settings
+from services.spam import get_scorer
+from services.storage import StorageResult, get_storage
 
+SETTINGS = get_settings()
+BRAND_NAME: str = SETTINGS.brand_name
+HEX_PRIMARY: str = SETTINGS.hex_primary
 
-def page() -> None:
-    st.set_page_config(page_title=f"Inquiry — {BRAND_NAME}", page_icon="✉️", layout="wide")
-    inject_seo(
-        title=f"Inquiry — {BRAND_NAME}",
-        description="Send an inquiry. We'll reply within one business day.",
-        image_url=None,
-        theme_color=HEX_PRIMARY,
-    )
-
-    st.markdown("## Send an Inquiry")
-    st.caption("Tell us how you'd like to work together. Required fields marked with *.")
 
+@st.fragment
+@instrumented_fragment("inquiry", "form")
+def inquiry_section() -> None:
+    """Form and submit flow; typing and submitting rerun only this block."""
     form_data = render_inquiry_form()
 
     if st.button("Submit Inquiry", type="primary", use_container_width=True):
-        if not _throttle_ok():
+        if not get_limiter().allow(client_key()):
             st.warning("Please wait a few seconds before submitting again.")
             return
 
@@ -47,13 +33,39 @@ def page() -> None:
             st.error(msg)
             return
 
-        storage = GoogleSheetStorage()
-        result: StorageResult = storage.save_inquiry(form_data)
+        verdict = get_scorer().score(form_data)
+        if verdict.blocked:
+            st.error("Submission flagged as spam.")
+            return
+        form_data.spam_score = verdict.score
+
+        with timed("storage.save"):
+            result: StorageResult = get_storage().save_inquiry(form_data)
         if result.ok:
+            if not result.duplicate:  # a resubmitted form was notified the first time
+                notify_inquiry(form_data)  # queued; email and webhook go out on worker threads
+            new_form_token()
             st.success("Inquiry received. Thank you! We'll be in touch shortly.")
         else:
             st.error(f"Could not record your inquiry: {result.message}")
 
+
+@instrumented_page("inquiry")
+def page() -> None:
+    st.set_page_config(page_title=f"Inquiry — {BRAND_NAME}", page_icon="✉️", layout="wide")
+    inject_seo(
+        title=f"Inquiry — {BRAND_NAME}",
+        description="Send an inquiry. We'll reply within one business day.",
+        image_url=None,
+        theme_color=HEX_PRIMARY,
+    )
+    inject_styles()
+
+    st.markdown("## Send an Inquiry")
+    st.caption("Tell us how you'd like to work together. Required fields marked with *.")
+
+    inquiry_section()
+
     st.info(
         "We never share your information. For faster coordination, you can also book directly on the **Schedule** page."
     )
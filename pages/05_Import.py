@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import streamlit as st
+
+from components.admin import require_admin
+from services.assets import inject_styles
+from services.importer import LeadFileError, import_rows, read_rows
+from services.metrics import instrumented_page
+from services.settings import get_settings
+from services.storage import get_storage
+
+SETTINGS = get_settings()
+BRAND_NAME: str = SETTINGS.brand_name
+
+
+@instrumented_page("import")
+def page() -> None:
+    st.set_page_config(page_title=f"Import Leads — {BRAND_NAME}", page_icon="📥", layout="wide")
+    inject_styles()
+    st.markdown("## Import Leads")
+    if not require_admin():
+        return
+
+    st.caption("Upload a CSV or XLSX with at least `name` and `email` columns; `phone`, `goals` and `notes` are optional.")
+    upload = st.file_uploader("Lead list", type=["csv", "xlsx"])
+    dry_run = st.checkbox("Validate only (don't save)", value=False)
+    if upload is None or not st.button("Import", type="primary"):
+        return
+
+    progress = st.empty()
+    try:
+        report = import_rows(
+            read_rows(upload, filename=upload.name),
+            None if dry_run else get_storage(dedupe=False),
+            on_progress=lambda r: progress.caption(f"Processed {r.total} rows…"),
+        )
+    except LeadFileError as e:
+        st.error(str(e))
+        return
+
+    progress.empty()
+    (st.warning if report.rejected or report.failed_chunks else st.success)(report.summary())
+    if report.rejects:
+        st.markdown("#### Rejected rows")
+        st.dataframe(
+            [{"row": num, "reason": msg} for num, msg in report.rejects],
+            use_container_width=True,
+            hide_index=True,
+        )
+        if report.rejected > len(report.rejects):
+            st.caption(f"Showing the first {len(report.rejects)} of {report.rejected}. Use the CLI `--rejects` option for the full list.")
+
+
+if __name__ == "__main__":
+    page()
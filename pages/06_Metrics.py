@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import time
+
+import streamlit as st
+
+from components.admin import require_admin
+from services.assets import inject_styles
+from services.metrics import REGISTRY, render_text
+from services.ratelimit import current_limiter
+from services.settings import get_settings
+from services.spool import InquirySpool
+
+SETTINGS = get_settings()
+BRAND_NAME: str = SETTINGS.brand_name
+
+
+def page() -> None:
+    # Not instrumented itself, so viewing the numbers doesn't move them
+    st.set_page_config(page_title=f"Metrics — {BRAND_NAME}", page_icon="📈", layout="wide")
+    inject_styles()
+    st.markdown("## Render Metrics")
+    if not require_admin():
+        return
+
+    uptime = time.time() - REGISTRY.started
+    st.caption(f"This process, since {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(REGISTRY.started))} ({uptime / 60:.0f} min).")
+
+    reruns = REGISTRY.reruns()
+    if reruns:
+        cols = st.columns(len(reruns))
+        for col, (name, count) in zip(cols, reruns.items()):
+            col.metric(f"{name} reruns", f"{count:,}")
+
+    stats = REGISTRY.stats()
+    if not stats:
+        st.info("No samples yet. Open a few pages and come back.")
+    else:
+        st.dataframe(
+            [
+                {
+                    "page": s.page,
+                    "section": s.section,
+                    "count": s.count,
+                    "mean ms": round(s.mean_ms, 2),
+                    "p50 ms": round(s.p50_ms, 2),
+                    "p95 ms": round(s.p95_ms, 2),
+                    "max ms": round(s.max_ms, 2),
+                }
+                for s in stats
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+        st.caption("Percentiles are estimated from histogram buckets.")
+
+    limiter = current_limiter()
+    if limiter is not None:
+        counts = limiter.snapshot()
+        cols = st.columns(3)
+        cols[0].metric("Inquiries allowed", f"{counts['allowed']:,}")
+        cols[1].metric("Limited per visitor", f"{counts['rejected_client']:,}")
+        cols[2].metric("Limited site-wide", f"{counts['rejected_global']:,}")
+
+    spool_path = SETTINGS.inquiry_spool_path
+    if spool_path.exists():
+        spool = InquirySpool(spool_path)
+        left, right = st.columns(2)
+        left.metric("Inquiries waiting for the sheet", f"{len(spool):,}")
+        dead = spool.dead_count()
+        right.metric("Rejected by the sheet", f"{dead:,}")
+        if dead:
+            st.warning(
+                "Some inquiries were rejected by the Google Sheet. See them with "
+                "`python -m services.spool stats` and retry with `python -m services.spool requeue`."
+            )
+
+    text = render_text()
+    left, right = st.columns([1, 5])
+    with left:
+        if st.button("Reset"):
+            REGISTRY.reset()
+            st.rerun()
+    with right:
+        st.download_button("Download metrics.txt", text, file_name="metrics.txt", mime="text/plain")
+    with st.expander("Prometheus text"):
+        st.code(text, language="text")
+    if SETTINGS.metrics_port:
+        st.caption(f"Also served at `:{SETTINGS.metrics_port}/metrics`.")
+
+
+if __name__ == "__main__":
+    page()
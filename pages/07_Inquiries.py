@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import time
+from datetime import date, timedelta
+from typing import Tuple, Union
+
+import streamlit as st
+
+from components.admin import require_admin
+from services.assets import inject_styles
+from services.inquiry_mirror import InquiryMirror, InquiryQuery, get_mirror
+from services.local_storage import SQLiteStorage
+from services.metrics import instrumented_fragment, instrumented_page
+from services.settings import get_settings
+
+SETTINGS = get_settings()
+BRAND_NAME: str = SETTINGS.brand_name
+SYNC_EVERY_SECONDS = 60.0
+PAGE_SIZES = (25, 50, 100, 250)
+SORTS = {
+    "Newest first": ("timestamp_utc", True),
+    "Oldest first": ("timestamp_utc", False),
+    "Name": ("name", False),
+    "Email": ("email", False),
+    "Source": ("source", False),
+    "Spam score": ("spam_score", True),
+}
+LIKELY_SPAM = 0.5
+PAGE_KEY = "inquiries_page"
+
+Source = Union[InquiryMirror, SQLiteStorage]
+
+
+def _sync(mirror: InquiryMirror, force: bool = False) -> None:
+    if not force and time.time() - mirror.synced_at < SYNC_EVERY_SECONDS:
+        return
+    try:
+        with st.spinner("Fetching new rows from the Google Sheet…"):
+            result = mirror.sync()
+    except Exception as e:
+        st.warning(f"Could not sync with the Google Sheet; showing the local copy. ({e})")
+        return
+    if result.rebuilt:
+        st.info("The sheet's rows changed order or were removed, so the local copy was rebuilt.")
+    elif result.added:
+        st.toast(f"{result.added} new inquiries")
+
+
+def _date_bounds(picked: Tuple[date, ...]) -> Tuple[str, str]:
+    if not picked:
+        return "", ""
+    start, end = picked[0], picked[-1]
+    return start.isoformat(), (end + timedelta(days=1)).isoformat()
+
+
+def _go_to(page: int) -> None:
+    st.session_state[PAGE_KEY] = page  # callbacks run before the rerun they trigger
+
+
+@st.fragment
+@instrumented_fragment("inquiries", "table")
+def inquiry_browser(source: Source) -> None:
+    """Filters and the result page; changing them reruns only this block."""
+    left, mid, right = st.columns([3, 2, 2])
+    text = left.text_input("Search", placeholder="Name, email, phone, goals or notes")
+    picked = mid.date_input("Date range", value=(), format="YYYY-MM-DD")
+    sources = right.multiselect("Source", source.sources())
+    left, mid, right = st.columns([3, 2, 2])
+    hide_spam = left.checkbox(f"Hide likely spam (score ≥ {LIKELY_SPAM})", value=True)
+    sort_label = mid.selectbox("Sort", list(SORTS))
+    page_size = right.selectbox("Rows per page", PAGE_SIZES, index=1)
+
+    since, until = _date_bounds(tuple(picked) if isinstance(picked, (list, tuple)) else (picked,))
+    sort, descending = SORTS[sort_label]
+    filters = (text, since, until, tuple(sources), hide_spam, sort_label, page_size)
+    if st.session_state.get("inquiries_filters") != filters:  # new filters start on page 1
+        st.session_state["inquiries_filters"] = filters
+        st.session_state[PAGE_KEY] = 1
+
+    result = source.query(
+        InquiryQuery(
+            text=text,
+            since=since,
+            until=until,
+            sources=tuple(sources),
+            spam_below=LIKELY_SPAM if hide_spam else None,
+            sort=sort,
+            descending=descending,
+            page=st.session_state.get(PAGE_KEY, 1),
+            page_size=page_size,
+        )
+    )
+    if not result.total:
+        st.info("No inquiries match these filters.")
+        return
+
+    st.dataframe(
+        [
+            {
+                "received (UTC)": r["timestamp_utc"][:16].replace("T", " "),
+                "name": r["name"],
+                "email": r["email"],
+                "phone": r["phone"],
+                "source": r["source"],
+                "spam": r["spam_score"],
+                "goals": r["goals"],
+                "notes": r["notes"],
+            }
+            for r in result.rows
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+    first = (result.page - 1) * page_size + 1
+    left, mid, right = st.columns([1, 4, 1])
+    left.button(
+        "← Prev", disabled=result.page <= 1, use_container_width=True, on_click=_go_to, args=(result.page - 1,)
+    )
+    last = first + len(result.rows) - 1
+    mid.caption(f"Showing {first:,}–{last:,} of {result.total:,} · page {result.page} of {result.pages}")
+    right.button(
+        "Next →",
+        disabled=result.page >= result.pages,
+        use_container_width=True,
+        on_click=_go_to,
+        args=(result.page + 1,),
+    )
+
+
+@instrumented_page("inquiries")
+def page() -> None:
+    st.set_page_config(page_title=f"Inquiries — {BRAND_NAME}", page_icon="🗂️", layout="wide")
+    inject_styles()
+    st.markdown("## Inquiries")
+    if not require_admin():
+        return
+
+    source: Source
+    if SETTINGS.storage_backend == "sqlite":
+        source = SQLiteStorage.shared()
+        st.caption(f"From the local database `{source.path}`.")
+    else:
+        source = get_mirror()
+        left, right = st.columns([5, 1])
+        with right:
+            force = st.button("Sync now", use_container_width=True)
+        _sync(source, force)
+        synced = source.synced_at
+        left.caption(
+            f"Local copy of the Google Sheet `{source.sheet.sheet_name}`, last synced "
+            + (time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(synced)) if synced else "never")
+            + f"; new rows are fetched every {SYNC_EVERY_SECONDS:.0f}s."
+        )
+
+    inquiry_browser(source)
+
+
+if __name__ == "__main__":
+    page()
@@ -0,0 +1,160 @@
+"""
+Stylesheet pipeline: ``assets/styles.css`` is read, minified and split into
+critical (above-the-fold) and deferred rules once per file version.
+
+Every page and session shares the same prebuilt ``<style>`` payloads; the
+file's mtime is checked at most once per ``RECHECK_SECONDS`` so reruns do
+no file I/O.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import streamlit as st
+
+STYLES_CSS = Path("assets") / "styles.css"
+RECHECK_SECONDS = 1.0
+# Rules whose selectors mention any of these render above the fold
+CRITICAL_SELECTORS = (
+    ":root",
+    "html",
+    "body",
+    ".stApp",
+    ".brand-",
+    ".hero",
+    ".cta-row",
+    ".btn",
+    ".social-badge",
+    ".ig-handle",
+)
+
+_STRING_RE = re.compile(r"\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*'")
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_SPACE_RE = re.compile(r"\s+")
+_PUNCT_RE = re.compile(r"\s*([{};,>~])\s*")  # not "+"/"-": calc() needs the spaces
+_DECL_COLON_RE = re.compile(r"\s*:\s*(?=[^{}]*[;}])")  # declarations only, not selectors
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace; quoted strings are left untouched."""
+    strings: List[str] = []
+
+    def stash(m: re.Match) -> str:
+        strings.append(m.group(0))
+        return f"\x00{len(strings) - 1}\x00"
+
+    css = _STRING_RE.sub(stash, css)
+    css = _COMMENT_RE.sub("", css)
+    css = _SPACE_RE.sub(" ", css)
+    css = _PUNCT_RE.sub(r"\1", css)
+    css = _DECL_COLON_RE.sub(":", css)
+    css = css.replace(";}", "}").strip()
+    return re.sub(r"\x00(\d+)\x00", lambda m: strings[int(m.group(1))], css)
+
+
+def _top_level_rules(css: str) -> List[str]:
+    """Split minified CSS into top-level rules (at-rule blocks stay whole)."""
+    rules, depth, start = [], 0, 0
+    for i, ch in enumerate(css):
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                rules.append(css[start : i + 1])
+                start = i + 1
+        elif ch == ";" and depth == 0:  # @import / @charset
+            rules.append(css[start : i + 1])
+            start = i + 1
+    if css[start:].strip():
+        rules.append(css[start:])
+    return rules
+
+
+def split_critical(css: str) -> Tuple[str, str]:
+    critical, deferred = [], []
+    for rule in _top_level_rules(css):
+        head = rule.split("{", 1)[0]
+        if head.startswith(("@import", "@charset", "@font-face")) or (
+            not head.startswith("@") and any(sel in head for sel in CRITICAL_SELECTORS)
+        ):
+            critical.append(rule)
+        else:
+            deferred.append(rule)
+    return "".join(critical), "".join(deferred)
+
+
+@dataclass(frozen=True)
+class Stylesheet:
+    minified: str = ""
+    critical: str = ""
+    deferred: str = ""
+    digest: str = ""
+    mtime_ns: int = -1
+
+    @property
+    def critical_tag(self) -> str:
+        return f"<style>{self.critical}</style>" if self.critical else ""
+
+    @property
+    def deferred_tag(self) -> str:
+        return f"<style>{self.deferred}</style>" if self.deferred else ""
+
+    @property
+    def full_tag(self) -> str:
+        return f"<style>{self.minified}</style>" if self.minified else ""
+
+
+_lock = threading.Lock()
+_sheets: Dict[Path, Tuple[Stylesheet, float]] = {}  # absolute path -> (stylesheet, checked at)
+
+
+def load_stylesheet(path: Optional[Path] = None, now: Optional[float] = None) -> Stylesheet:
+    """Current stylesheet at ``path`` (default ``STYLES_CSS``), rebuilt only when the file's mtime changes."""
+    now = time.monotonic() if now is None else now
+    path = Path(os.path.abspath(path or STYLES_CSS))  # no filesystem calls, unlike resolve()
+    cached = _sheets.get(path)
+    if cached is not None and now - cached[1] < RECHECK_SECONDS:
+        return cached[0]
+    with _lock:
+        current = _sheets[path][0] if path in _sheets else Stylesheet()
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            current = Stylesheet()
+        else:
+            if mtime != current.mtime_ns:
+                minified = minify_css(path.read_text(encoding="utf-8"))
+                critical, deferred = split_critical(minified)
+                digest = hashlib.sha256(minified.encode("utf-8")).hexdigest()[:10]
+                current = Stylesheet(minified, critical, deferred, digest, mtime)
+        _sheets[path] = (current, now)
+        return current
+
+
+def inject_critical_css() -> None:
+    """Above-the-fold rules; call right after ``st.set_page_config``."""
+    tag = load_stylesheet().critical_tag
+    if tag:
+        st.markdown(tag, unsafe_allow_html=True)
+
+
+def inject_deferred_css() -> None:
+    """Remaining rules; call once the above-the-fold content has been emitted."""
+    tag = load_stylesheet().deferred_tag
+    if tag:
+        st.markdown(tag, unsafe_allow_html=True)
+
+
+def inject_styles() -> None:
+    """The whole minified stylesheet in one block, for pages that don't split."""
+    tag = load_stylesheet().full_tag
+    if tag:
+        st.markdown(tag, unsafe_allow_html=True)
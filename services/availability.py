@@ -0,0 +1,313 @@
+"""
+Bookable slots for the Schedule page, from a pluggable availability feed.
+
+Providers (``AVAILABILITY_PROVIDER`` in secrets):
+
+- ``"ics"``:   an iCalendar feed whose VEVENTs are the open slots
+- ``"json"``:  ``[{"start": ISO, "end": ISO, "url": optional}, …]`` (or ``{"slots": [...]}``)
+- ``"local"``: a weekday-hours stand-in for development and demos
+
+``AVAILABILITY_URL`` is an http(s) URL or a local path. Slots are held in
+memory by ``AvailabilityCache``: the first request fetches, later requests
+are served from memory, and once ``AVAILABILITY_TTL`` seconds have passed
+the next request triggers a refresh on a background thread while still
+returning the current slots. A failed refresh keeps the last good slots.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+FETCH_TIMEOUT = 10.0
+USER_AGENT = "Mozilla/5.0 (compatible; ThriveAvailability/1.0)"
+_DURATION_RE = re.compile(r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+
+@dataclass(frozen=True, order=True)
+class Slot:
+    start: datetime  # timezone-aware
+    end: datetime
+    booking_url: str = ""
+
+    @property
+    def minutes(self) -> int:
+        return int((self.end - self.start).total_seconds() // 60)
+
+
+class AvailabilityProvider(Protocol):
+    def fetch(self) -> List[Slot]: ...
+
+
+def zone(name: str) -> tzinfo:
+    if not name or name.upper() == "UTC":
+        return timezone.utc
+    from zoneinfo import ZoneInfo
+
+    return ZoneInfo(name)
+
+
+def _read(source: str) -> bytes:
+    if source.startswith(("http://", "https://")):
+        import urllib.request
+
+        req = urllib.request.Request(source, headers={"User-Agent": USER_AGENT})
+        with urllib.request.urlopen(req, timeout=FETCH_TIMEOUT) as resp:
+            return resp.read()
+    return Path(source).read_bytes()
+
+
+# ---------- iCalendar ----------
+
+
+def _ics_lines(text: str) -> Iterable[str]:
+    """Unfold continuation lines (RFC 5545 §3.1)."""
+    current = ""
+    for raw in text.splitlines():
+        if raw[:1] in (" ", "\t"):
+            current += raw[1:]
+            continue
+        if current:
+            yield current
+        current = raw
+    if current:
+        yield current
+
+
+def _ics_datetime(value: str, params: Dict[str, str], default_tz: tzinfo) -> Optional[datetime]:
+    if params.get("VALUE") == "DATE" or "T" not in value:
+        return None  # all-day entries are not bookable slots
+    if value.endswith("Z"):
+        return datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+    dt = datetime.strptime(value, "%Y%m%dT%H%M%S")
+    return dt.replace(tzinfo=zone(params["TZID"]) if "TZID" in params else default_tz)
+
+
+def _ics_duration(value: str) -> Optional[timedelta]:
+    m = _DURATION_RE.match(value)
+    if not m:
+        return None
+    d, h, mi, s = (int(x or 0) for x in m.groups())
+    return timedelta(days=d, hours=h, minutes=mi, seconds=s)
+
+
+def parse_ics(text: str, default_tz: tzinfo = timezone.utc) -> List[Slot]:
+    slots: List[Slot] = []
+    event: Optional[Dict[str, Tuple[str, Dict[str, str]]]] = None
+    for line in _ics_lines(text):
+        head, _, value = line.partition(":")
+        name, *raw_params = head.split(";")
+        name = name.upper()
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            event = {}
+        elif name == "END" and value.upper() == "VEVENT" and event is not None:
+            try:
+                slot = _ics_slot(event, default_tz)
+            except (KeyError, ValueError) as e:  # e.g. a Windows TZID like "Pacific Standard Time"
+                logger.warning("Skipping calendar event %s: %r", event.get("UID", ("?", {}))[0], e)
+                slot = None
+            if slot is not None:
+                slots.append(slot)
+            event = None
+        elif event is not None:
+            params = dict(p.split("=", 1) for p in raw_params if "=" in p)
+            event[name] = (value.strip(), {k.upper(): v.strip('"') for k, v in params.items()})
+    return sorted(slots)
+
+
+def _ics_slot(event: Dict[str, Tuple[str, Dict[str, str]]], default_tz: tzinfo) -> Optional[Slot]:
+    if "DTSTART" not in event or event.get("STATUS", ("", {}))[0].upper() == "CANCELLED":
+        return None
+    start = _ics_datetime(*event["DTSTART"], default_tz)
+    if start is None:
+        return None
+    end = _ics_datetime(*event["DTEND"], default_tz) if "DTEND" in event else None
+    if end is None and "DURATION" in event:
+        duration = _ics_duration(event["DURATION"][0])
+        end = start + duration if duration else None
+    if end is None or end <= start:
+        return None
+    return Slot(start, end, event.get("URL", ("", {}))[0])
+
+
+class ICSProvider:
+    def __init__(self, source: str, default_tz: tzinfo = timezone.utc) -> None:
+        self.source = source
+        self.default_tz = default_tz
+
+    def fetch(self) -> List[Slot]:
+        return parse_ics(_read(self.source).decode("utf-8", errors="replace"), self.default_tz)
+
+
+# ---------- JSON ----------
+
+
+def _iso(value: Any, default_tz: tzinfo) -> datetime:
+    dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.replace(tzinfo=default_tz)
+
+
+def parse_json_slots(doc: Any, default_tz: tzinfo = timezone.utc) -> List[Slot]:
+    items = doc.get("slots", []) if isinstance(doc, dict) else doc
+    if not isinstance(items, list):
+        raise ValueError("expected a list of slots")
+    slots = []
+    for i, item in enumerate(items):
+        try:
+            start = _iso(item["start"], default_tz)
+            end = _iso(item["end"], default_tz) if "end" in item else start + timedelta(minutes=int(item["minutes"]))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Skipping availability entry %d: %s", i, e)
+            continue
+        if end > start:
+            slots.append(Slot(start, end, str(item.get("url", "") or "")))
+    return sorted(slots)
+
+
+class JSONProvider:
+    def __init__(self, source: str, default_tz: tzinfo = timezone.utc) -> None:
+        self.source = source
+        self.default_tz = default_tz
+
+    def fetch(self) -> List[Slot]:
+        return parse_json_slots(json.loads(_read(self.source)), self.default_tz)
+
+
+# ---------- Local stand-in ----------
+
+
+class LocalProvider:
+    """Weekday slots between ``open_hour`` and ``close_hour``, with about a third marked booked."""
+
+    def __init__(
+        self,
+        tz: tzinfo = timezone.utc,
+        days: int = 14,
+        open_hour: int = 7,
+        close_hour: int = 19,
+        slot_minutes: int = 60,
+        weekdays: Sequence[int] = (0, 1, 2, 3, 4),
+    ) -> None:
+        self.tz = tz
+        self.days = days
+        self.open_hour = open_hour
+        self.close_hour = close_hour
+        self.slot_minutes = slot_minutes
+        self.weekdays = frozenset(weekdays)
+
+    def fetch(self) -> List[Slot]:
+        today = datetime.now(self.tz).date()
+        step = timedelta(minutes=self.slot_minutes)
+        slots = []
+        for offset in range(self.days):
+            day = today + timedelta(days=offset)
+            if day.weekday() not in self.weekdays:
+                continue
+            t = datetime(day.year, day.month, day.day, self.open_hour, tzinfo=self.tz)
+            close = datetime(day.year, day.month, day.day, self.close_hour, tzinfo=self.tz)
+            while t + step <= close:
+                # Stable per slot, so refreshes don't reshuffle what's "booked"
+                if zlib.crc32(t.isoformat().encode()) % 3:
+                    slots.append(Slot(t, t + step))
+                t += step
+        return slots
+
+
+# ---------- Cache ----------
+
+
+@dataclass(frozen=True)
+class Availability:
+    slots: Tuple[Slot, ...] = ()
+    fetched_at: float = 0.0  # wall clock, 0 when never fetched
+    error: str = ""
+
+    def upcoming(self, now: Optional[datetime] = None) -> List[Slot]:
+        now = now or datetime.now(timezone.utc)
+        return [s for s in self.slots if s.start > now]
+
+    def by_day(self, tz: tzinfo, now: Optional[datetime] = None) -> Dict[date, List[Slot]]:
+        days: Dict[date, List[Slot]] = {}
+        for s in self.upcoming(now):
+            days.setdefault(s.start.astimezone(tz).date(), []).append(s)
+        return days
+
+
+class AvailabilityCache:
+    """Serve-stale-while-refreshing cache around one provider, shared by all sessions."""
+
+    def __init__(self, provider: AvailabilityProvider, ttl: float = 300.0) -> None:
+        self.provider = provider
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._current = Availability()
+        self._loaded_at = float("-inf")  # monotonic
+        self._refreshing = False
+
+    def _refresh(self) -> None:
+        try:
+            slots = tuple(sorted(self.provider.fetch()))
+            result = Availability(slots, time.time())
+        except Exception as e:
+            logger.exception("Availability refresh failed; keeping the last good slots.")
+            result = Availability(self._current.slots, self._current.fetched_at, f"{type(e).__name__}: {e}")
+        with self._lock:
+            self._current = result
+            self._loaded_at = time.monotonic()
+            self._refreshing = False
+
+    def get(self) -> Availability:
+        now = time.monotonic()
+        if now - self._loaded_at < self.ttl:
+            return self._current
+        with self._lock:
+            if now - self._loaded_at < self.ttl or self._refreshing:
+                return self._current
+            self._refreshing = True
+            first = self._current.fetched_at == 0.0 and not self._current.error
+        if first:
+            self._refresh()  # nothing to show yet: fetch inline once
+        else:
+            threading.Thread(target=self._refresh, name="availability-refresh", daemon=True).start()
+        return self._current
+
+
+_cache_lock = threading.Lock()
+_cache: Optional[AvailabilityCache] = None
+_cache_config: Tuple[Any, ...] = ()
+
+
+def get_availability() -> Optional[AvailabilityCache]:
+    """Process-wide cache for the configured provider, or ``None`` when none is set."""
+    global _cache, _cache_config
+    from services.settings import get_settings
+
+    s = get_settings()
+    config = (s.availability_provider, s.availability_url, s.availability_ttl, s.scheduling_timezone)
+    with _cache_lock:
+        if config != _cache_config:
+            _cache, _cache_config = _build_cache(*config), config
+        return _cache
+
+
+def _build_cache(kind: str, url: str, ttl: float, tz_name: str) -> Optional[AvailabilityCache]:
+    tz = zone(tz_name)
+    provider: AvailabilityProvider
+    if kind == "local":
+        provider = LocalProvider(tz)
+    elif kind in ("ics", "json") and url:
+        provider = ICSProvider(url, tz) if kind == "ics" else JSONProvider(url, tz)
+    else:
+        if kind:
+            logger.warning("AVAILABILITY_PROVIDER %r needs AVAILABILITY_URL; using the embed only.", kind)
+        return None
+    return AvailabilityCache(provider, ttl)
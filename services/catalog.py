@@ -0,0 +1,195 @@
+"""
+The services catalog (``data/services.json``), parsed and validated once per
+file version.
+
+Entries become immutable ``ServiceEntry`` records; the parsed catalog is
+shared by every session (and, with ``SHARED_CACHE_PATH``, every process on
+the host) and reloaded only when the file's mtime changes.
+Malformed files raise ``CatalogError`` listing every problem instead of
+quietly rendering an empty page.
+"""
+from __future__ import annotations
+
+import bisect
+import json
+import re
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple, Union
+
+from services.shared_cache import get_shared_cache
+
+SERVICES_JSON = Path("data") / "services.json"
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+REQUIRED_FIELDS = ("title",)
+OPTIONAL_FIELDS = ("blurb", "session_length", "delivery_type")
+
+
+class CatalogError(ValueError):
+    def __init__(self, path: Path, problems: List[str]) -> None:
+        self.path = path
+        self.problems = problems
+        super().__init__(f"{path}: " + "; ".join(problems))
+
+    def __reduce__(self):
+        return type(self), (self.path, self.problems)
+
+
+@dataclass(frozen=True, slots=True)
+class ServiceEntry:
+    title: str
+    blurb: str = ""
+    session_length: str = ""
+    delivery_type: str = ""
+
+
+@dataclass(frozen=True)
+class Catalog:
+    entries: Tuple[ServiceEntry, ...] = ()
+    mtime_ns: int = -1
+    warnings: Tuple[str, ...] = ()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    @cached_property
+    def index(self) -> "CatalogIndex":
+        """Search index, built once per catalog version on first use."""
+        return CatalogIndex(self.entries)
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.casefold())
+
+
+class CatalogIndex:
+    """
+    Inverted index over title, blurb, delivery_type and session_length.
+
+    Query words match as prefixes ("stren" finds "strength") and are ANDed;
+    delivery type and session length are exact facet filters. Results keep
+    catalog order and are returned as entry positions so callers can key
+    widgets stably.
+    """
+
+    def __init__(self, entries: Sequence[ServiceEntry]) -> None:
+        self.entries = tuple(entries)
+        postings: Dict[str, set] = {}
+        self.delivery_types: Dict[str, FrozenSet[int]] = {}
+        self.session_lengths: Dict[str, FrozenSet[int]] = {}
+        by_delivery: Dict[str, set] = {}
+        by_length: Dict[str, set] = {}
+        for i, e in enumerate(self.entries):
+            for w in set(_words(f"{e.title} {e.blurb} {e.delivery_type} {e.session_length}")):
+                postings.setdefault(w, set()).add(i)
+            if e.delivery_type:
+                by_delivery.setdefault(e.delivery_type, set()).add(i)
+            if e.session_length:
+                by_length.setdefault(e.session_length, set()).add(i)
+        self._postings = {w: frozenset(ids) for w, ids in postings.items()}
+        self._vocab = sorted(self._postings)
+        self.delivery_types = {k: frozenset(v) for k, v in sorted(by_delivery.items())}
+        self.session_lengths = {k: frozenset(v) for k, v in sorted(by_length.items())}
+
+    def _prefix(self, word: str) -> FrozenSet[int]:
+        lo = bisect.bisect_left(self._vocab, word)
+        hits: set = set()
+        for w in self._vocab[lo:]:
+            if not w.startswith(word):
+                break
+            hits |= self._postings[w]
+        return frozenset(hits)
+
+    def search(
+        self,
+        query: str = "",
+        delivery_types: Iterable[str] = (),
+        session_lengths: Iterable[str] = (),
+    ) -> List[int]:
+        """Positions of matching entries, in catalog order."""
+        matches: Optional[FrozenSet[int]] = None
+
+        def narrow(ids: FrozenSet[int]) -> None:
+            nonlocal matches
+            matches = ids if matches is None else matches & ids
+
+        for word in _words(query):
+            narrow(self._prefix(word))
+        if delivery_types := list(delivery_types):
+            narrow(frozenset().union(*(self.delivery_types.get(d, frozenset()) for d in delivery_types)))
+        if session_lengths := list(session_lengths):
+            narrow(frozenset().union(*(self.session_lengths.get(s, frozenset()) for s in session_lengths)))
+        if matches is None:
+            return list(range(len(self.entries)))
+        return sorted(matches)
+
+
+def parse_catalog(raw: Any, path: Path = SERVICES_JSON) -> Tuple[Tuple[ServiceEntry, ...], Tuple[str, ...]]:
+    """Validate decoded JSON; returns (entries, warnings) or raises ``CatalogError``."""
+    if not isinstance(raw, list):
+        raise CatalogError(path, [f"expected a list of services, got {type(raw).__name__}"])
+    problems: List[str] = []
+    warnings: List[str] = []
+    entries: List[ServiceEntry] = []
+    for i, item in enumerate(raw):
+        where = f"entry {i}"
+        if not isinstance(item, dict):
+            problems.append(f"{where}: expected an object, got {type(item).__name__}")
+            continue
+        fields: Dict[str, str] = {}
+        for name in REQUIRED_FIELDS + OPTIONAL_FIELDS:
+            value = item.get(name, "")
+            if not isinstance(value, (str, int, float)) or isinstance(value, bool):
+                problems.append(f"{where}: '{name}' must be text")
+                continue
+            fields[name] = str(value).strip()
+        if len(fields) < len(REQUIRED_FIELDS + OPTIONAL_FIELDS):
+            continue  # type problems already reported
+        if not fields["title"]:
+            problems.append(f"{where}: 'title' is required")
+            continue
+        unknown = sorted(set(item) - set(REQUIRED_FIELDS + OPTIONAL_FIELDS))
+        if unknown:
+            warnings.append(f"{where} ({fields['title']}): ignored keys {', '.join(unknown)}")
+        entries.append(ServiceEntry(**fields))
+    if problems:
+        raise CatalogError(path, problems)
+    return tuple(entries), tuple(warnings)
+
+
+def _parse_file(path: Path, mtime: int) -> Tuple[int, Union[Catalog, CatalogError]]:
+    result: Union[Catalog, CatalogError]
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            raw = json.load(f)
+        entries, warnings = parse_catalog(raw, path)
+        result = Catalog(entries, mtime, warnings)
+    except json.JSONDecodeError as e:
+        result = CatalogError(path, [f"invalid JSON at line {e.lineno}, column {e.colno}: {e.msg}"])
+    except CatalogError as e:
+        result = e
+    return mtime, result
+
+
+def load_catalog(path: Optional[Path] = None) -> Catalog:
+    """
+    Current catalog; a missing file is an empty catalog. Parse results,
+    including errors, are kept in the host's shared cache until the file's
+    mtime changes.
+    """
+    path = path or SERVICES_JSON
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return Catalog()
+    _, result = get_shared_cache().get_or_set(
+        "catalog", str(path.resolve()), lambda: _parse_file(path, mtime), valid=lambda v: v[0] == mtime
+    )
+    if isinstance(result, CatalogError):
+        raise result
+    return result
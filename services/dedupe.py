@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Hashable, List, Optional, Sequence
+
+from components.forms import InquiryData
+from services.storage import Storage, StorageResult
+
+
+def content_hash(data: InquiryData) -> str:
+    """Stable digest of the user-visible fields (case/whitespace-insensitive)."""
+    parts = (data.name, data.email, data.phone, data.goals, data.notes)
+    norm = "\x1f".join(" ".join(p.split()).lower() for p in parts)
+    return hashlib.blake2b(norm.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _keys(data: InquiryData) -> List[Hashable]:
+    keys: List[Hashable] = [("c", data.email.lower(), content_hash(data))]
+    if data.token:
+        keys.append(("t", data.token))
+    return keys
+
+
+class RecentSubmissions:
+    """
+    Bounded, TTL-evicted index of recently accepted submissions.
+
+    Entries are keyed by idempotency token and by (email, content hash);
+    insertion order doubles as expiry order, so eviction only ever looks
+    at the oldest entries.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 900.0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, float]" = OrderedDict()
+
+    def _evict(self, now: float) -> None:
+        entries = self._entries
+        while entries:
+            key, expires = next(iter(entries.items()))
+            if expires > now and len(entries) <= self.max_entries:
+                break
+            entries.popitem(last=False)
+
+    def claim(self, data: InquiryData, now: Optional[float] = None) -> bool:
+        """Record ``data`` and return True, or return False if it was already seen."""
+        now = time.time() if now is None else now
+        keys = _keys(data)
+        with self._lock:
+            self._evict(now)
+            if any(k in self._entries for k in keys):
+                return False
+            for k in keys:
+                self._entries[k] = now + self.ttl
+            self._evict(now)
+            return True
+
+    def release(self, data: InquiryData) -> None:
+        """Forget a claim whose write failed so a retry can go through."""
+        with self._lock:
+            for k in _keys(data):
+                self._entries.pop(k, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+RECENT = RecentSubmissions()
+
+
+class IdempotentStorage(Storage):
+    """Skips the backend for submissions already in ``index``."""
+
+    def __init__(self, inner: Storage, index: RecentSubmissions = RECENT) -> None:
+        self.inner = inner
+        self.index = index
+
+    def save_inquiry(self, data: InquiryData) -> StorageResult:
+        if not self.index.claim(data):
+            return StorageResult(ok=True, message="Already received.", duplicate=True)
+        try:
+            result = self.inner.save_inquiry(data)
+        except Exception:
+            self.index.release(data)
+            raise
+        if not result.ok:
+            self.index.release(data)
+        return result
+
+    def save_inquiries(self, items: Sequence[InquiryData]) -> StorageResult:
+        fresh = [d for d in items if self.index.claim(d)]
+        if not fresh:
+            return StorageResult(ok=True, message="Already received.", duplicate=True, saved=0)
+        try:
+            result = self.inner.save_inquiries(fresh)
+        except Exception:
+            for d in fresh:
+                self.index.release(d)
+            raise
+        if not result.ok:
+            for d in fresh:
+                self.index.release(d)
+        elif result.saved is None and len(fresh) < len(items):
+            result = replace(result, saved=len(fresh))
+        return result
@@ -0,0 +1,147 @@
+"""
+Local SMTP and HTTP servers standing in for the mail relay and the CRM
+webhook, for trying ``services.notify`` without either.
+
+    smtp = LocalSMTPServer(FaultPlan(latency=0.2, failure_rate=0.1)).start()
+    hook = LocalWebhookServer().start()
+    # SMTP_HOST = "127.0.0.1", SMTP_PORT = smtp.port, SMTP_STARTTLS = false
+    # NOTIFY_WEBHOOK_URL = hook.url
+
+Both run on daemon threads, keep what they received, and count the
+connections they accepted, which shows whether the client pools reuse them.
+Injected failures answer ``451`` (SMTP) or ``503`` (HTTP), both retryable.
+"""
+from __future__ import annotations
+
+import email
+import json
+import socketserver
+import threading
+from email.message import Message
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from services.fake_sheets import FakeAPIError, FaultPlan
+
+
+class _Recorder:
+    def __init__(self, faults: Optional[FaultPlan]) -> None:
+        self.faults = faults or FaultPlan()
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def _connected(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def _fails(self, op: str) -> bool:
+        try:
+            self.faults.hit(op)
+        except FakeAPIError:
+            return True
+        return False
+
+
+class LocalSMTPServer(_Recorder):
+    """Plain SMTP (no TLS, any login accepted) on ``127.0.0.1:port``."""
+
+    def __init__(self, faults: Optional[FaultPlan] = None, port: int = 0) -> None:
+        super().__init__(faults)
+        self.messages: List[Message] = []
+        recorder = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line: str) -> None:
+                self.wfile.write(f"{line}\r\n".encode())
+
+            def handle(self) -> None:
+                recorder._connected()
+                self.reply("220 localhost fake SMTP")
+                while True:
+                    raw = self.rfile.readline()
+                    if not raw:
+                        return
+                    verb = raw.decode("utf-8", "replace").strip().split(" ", 1)[0].upper()
+                    if verb == "EHLO":
+                        self.reply("250-localhost")
+                        self.reply("250-AUTH PLAIN LOGIN")
+                        self.reply("250 8BITMIME")
+                    elif verb == "AUTH":
+                        self.reply("235 ok")
+                    elif verb in ("HELO", "MAIL", "RCPT", "RSET", "NOOP"):
+                        self.reply("250 ok")
+                    elif verb == "DATA":
+                        self.reply("354 end with <CRLF>.<CRLF>")
+                        lines = []
+                        while True:
+                            line = self.rfile.readline()
+                            if not line or line in (b".\r\n", b".\n"):
+                                break
+                            lines.append(line[1:] if line.startswith(b"..") else line)
+                        if recorder._fails("data"):
+                            self.reply("451 injected failure")
+                            continue
+                        with recorder._lock:
+                            recorder.messages.append(email.message_from_bytes(b"".join(lines)))
+                        self.reply("250 queued")
+                    elif verb == "QUIT":
+                        self.reply("221 bye")
+                        return
+                    else:
+                        self.reply("502 not implemented")
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+
+    def start(self) -> "LocalSMTPServer":
+        threading.Thread(target=self._server.serve_forever, name="fake-smtp", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class LocalWebhookServer(_Recorder):
+    """Accepts ``POST`` on any path over HTTP/1.1 keep-alive and keeps the JSON bodies."""
+
+    def __init__(self, faults: Optional[FaultPlan] = None, port: int = 0, status: int = 200) -> None:
+        super().__init__(faults)
+        self.requests: List[Dict[str, Any]] = []
+        self.status = status
+        recorder = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                recorder._connected()
+
+            def do_POST(self) -> None:  # noqa: N802
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                status = 503 if recorder._fails("post") else recorder.status
+                if status < 300:
+                    with recorder._lock:
+                        recorder.requests.append(
+                            {"path": self.path, "headers": dict(self.headers), "json": json.loads(body or b"null")}
+                        )
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.port = self._server.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}/hooks/inquiry"
+
+    def start(self) -> "LocalWebhookServer":
+        threading.Thread(target=self._server.serve_forever, name="fake-webhook", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
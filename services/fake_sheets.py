@@ -0,0 +1,128 @@
+"""
+In-memory stand-in for the slice of gspread that the storage layer uses.
+
+Plug it in with ``services.storage.set_client_factory``::
+
+    client = FakeClient(FaultPlan(latency=0.25, failure_rate=0.05))
+    set_client_factory(lambda _info: client)
+"""
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+_RANGE_RE = re.compile(r"^([A-Z]+)(\d+):([A-Z]+)(\d+)?$")
+
+
+def _column_number(letters: str) -> int:
+    n = 0
+    for ch in letters:
+        n = n * 26 + ord(ch) - 64
+    return n
+
+
+class FakeAPIError(Exception):
+    """Raised for injected failures, standing in for ``gspread.exceptions.APIError``."""
+
+
+@dataclass
+class FaultPlan:
+    latency: float = 0.0  # seconds added to every API call
+    jitter: float = 0.0  # extra uniform [0, jitter) seconds
+    failure_rate: float = 0.0  # probability in [0, 1] that a call raises
+    seed: Optional[int] = None
+    calls: Dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    def hit(self, op: str) -> None:
+        with self._lock:
+            self.calls[op] = self.calls.get(op, 0) + 1
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.failure_rate > 0 and self._rng.random() < self.failure_rate
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise FakeAPIError(f"injected failure in {op}")
+
+
+class FakeWorksheet:
+    def __init__(self, faults: FaultPlan) -> None:
+        self.faults = faults
+        self._lock = threading.Lock()
+        self.rows: List[List[str]] = []
+
+    def get_all_values(self) -> List[List[str]]:
+        self.faults.hit("get_all_values")
+        with self._lock:
+            return [list(r) for r in self.rows]
+
+    def row_values(self, row: int) -> List[str]:
+        self.faults.hit("row_values")
+        with self._lock:
+            return list(self.rows[row - 1]) if 0 < row <= len(self.rows) else []
+
+    def get_values(self, range_name: str) -> List[List[str]]:
+        """Rows of an ``A<start>:<col><end>`` range, trailing empty rows dropped like the API does."""
+        self.faults.hit("get_values")
+        m = _RANGE_RE.match(range_name)
+        if not m:
+            raise ValueError(f"unsupported range {range_name!r}")
+        width = _column_number(m.group(3)) - _column_number(m.group(1)) + 1
+        start = int(m.group(2))
+        with self._lock:
+            rows = self.rows[start - 1 : int(m.group(4)) if m.group(4) else None]
+            return [list(r[:width]) for r in rows]
+
+    def update(self, range_name: str, values: List[List[str]]) -> None:
+        """Overwrite the cells of an ``<col><row>:<col><row>`` range, growing rows as needed."""
+        self.faults.hit("update")
+        m = _RANGE_RE.match(range_name)
+        if not m:
+            raise ValueError(f"unsupported range {range_name!r}")
+        col, start = _column_number(m.group(1)) - 1, int(m.group(2))
+        with self._lock:
+            for i, new in enumerate(values):
+                while len(self.rows) < start + i:
+                    self.rows.append([])
+                row = self.rows[start - 1 + i]
+                row.extend([""] * (col + len(new) - len(row)))
+                row[col : col + len(new)] = [str(v) for v in new]
+
+    def append_row(self, values: List[str], value_input_option: str = "RAW") -> None:
+        self.faults.hit("append_row")
+        with self._lock:
+            self.rows.append([str(v) for v in values])
+
+    def append_rows(self, values: List[List[str]], value_input_option: str = "RAW") -> None:
+        self.faults.hit("append_rows")
+        with self._lock:
+            self.rows.extend([str(v) for v in r] for r in values)
+
+
+class FakeSpreadsheet:
+    def __init__(self, faults: FaultPlan) -> None:
+        self.sheet1 = FakeWorksheet(faults)
+
+
+class FakeClient:
+    """Spreadsheets are created on first ``open`` and live as long as the client."""
+
+    def __init__(self, faults: Optional[FaultPlan] = None) -> None:
+        self.faults = faults or FaultPlan()
+        self._lock = threading.Lock()
+        self.books: Dict[str, FakeSpreadsheet] = {}
+
+    def open(self, title: str) -> FakeSpreadsheet:
+        self.faults.hit("open")
+        with self._lock:
+            if title not in self.books:
+                self.books[title] = FakeSpreadsheet(self.faults)
+            return self.books[title]
@@ -0,0 +1,158 @@
+"""
+Precomputed gallery manifest: ordering, dimensions and a placeholder color
+for every image in ``assets/images``.
+
+The manifest is persisted next to the image variants and rebuilt only when
+the directory's listing changes: a file added, removed, renamed, or
+replaced in place (its size or mtime differs). Unchanged files keep their
+probed metadata. Loaded manifests sit in the host's shared cache, so one
+process probes new images while the others wait for its result. The
+listing (one ``stat`` per image) is re-read at most once per
+``RECHECK_SECONDS`` per process, so most reruns do no file I/O.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from services.images import CACHE_DIR, IMAGE_EXTS, pillow_available, source_images
+from services.shared_cache import get_shared_cache
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 2
+DEFAULT_COLOR = "#E8E4DE"
+RECHECK_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class ImageEntry:
+    name: str
+    width: int
+    height: int
+    color: str  # dominant color, used as the loading placeholder
+    mtime_ns: int
+    size: int
+
+    @property
+    def aspect(self) -> float:
+        return self.height / self.width if self.width and self.height else 0.75
+
+
+def _probe(path: Path) -> Tuple[int, int, str]:
+    if not pillow_available():
+        return 0, 0, DEFAULT_COLOR
+    from PIL import Image  # type: ignore
+
+    try:
+        with Image.open(path) as im:
+            width, height = im.size
+            im.draft("RGB", (64, 64))  # JPEG: decode at reduced scale
+            r, g, b = im.convert("RGB").resize((1, 1), Image.BOX).getpixel((0, 0))
+    except Exception as e:
+        logger.warning("Could not read %s: %s", path, e)
+        return 0, 0, DEFAULT_COLOR
+    return width, height, f"#{r:02X}{g:02X}{b:02X}"
+
+
+def _signature(images_dir: Path) -> str:
+    """Digest of every image's name, size and mtime."""
+    files = []
+    with os.scandir(images_dir) as it:
+        for entry in it:
+            if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTS:
+                st_ = entry.stat()
+                files.append(f"{entry.name}:{st_.st_size}:{st_.st_mtime_ns}")
+    return hashlib.blake2b("\n".join(sorted(files)).encode("utf-8"), digest_size=16).hexdigest()
+
+
+_signature_lock = threading.Lock()
+_signatures: Dict[Path, Tuple[str, float]] = {}  # images dir -> (signature, checked at)
+
+
+def _current_signature(images_dir: Path, now: Optional[float] = None) -> str:
+    """``_signature`` of ``images_dir``, recomputed at most once per ``RECHECK_SECONDS``."""
+    now = time.monotonic() if now is None else now
+    cached = _signatures.get(images_dir)
+    if cached is not None and now - cached[1] < RECHECK_SECONDS:
+        return cached[0]
+    signature = _signature(images_dir)
+    with _signature_lock:
+        _signatures[images_dir] = (signature, now)
+    return signature
+
+
+def _manifest_path(images_dir: Path, cache_dir: Path) -> Path:
+    return cache_dir / f"manifest-{images_dir.name}.json"
+
+
+def _read(path: Path) -> Optional[dict]:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            doc = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return doc if doc.get("version") == MANIFEST_VERSION else None
+
+
+def build_manifest(
+    images_dir: Path, cache_dir: Path = CACHE_DIR, previous: Optional[dict] = None, signature: str = ""
+) -> dict:
+    old: Dict[str, dict] = {e["name"]: e for e in (previous or {}).get("entries", [])}
+    entries = []
+    for src in source_images(images_dir):
+        st_ = src.stat()
+        prev = old.get(src.name)
+        if prev and prev["mtime_ns"] == st_.st_mtime_ns and prev["size"] == st_.st_size:
+            entries.append(prev)
+            continue
+        width, height, color = _probe(src)
+        entries.append(asdict(ImageEntry(src.name, width, height, color, st_.st_mtime_ns, st_.st_size)))
+    doc = {
+        "version": MANIFEST_VERSION,
+        "signature": signature or _signature(images_dir),
+        "entries": entries,
+    }
+    out = _manifest_path(images_dir, cache_dir)
+    tmp: Optional[Path] = None
+    try:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=out.parent, suffix=".tmp", delete=False, encoding="utf-8") as f:
+            tmp = Path(f.name)
+            f.write(json.dumps(doc, separators=(",", ":")))
+        os.replace(tmp, out)
+    except OSError as e:  # read-only deploy: serve what was just built
+        logger.warning("Could not save the gallery manifest to %s: %s", out, e)
+        if tmp is not None:
+            tmp.unlink(missing_ok=True)
+    return doc
+
+
+def _load(images_dir: Path, cache_dir: Path, signature: str) -> Tuple[str, Tuple[ImageEntry, ...]]:
+    doc = _read(_manifest_path(images_dir, cache_dir))
+    if doc is None or doc["signature"] != signature:
+        doc = build_manifest(images_dir, cache_dir, previous=doc, signature=signature)
+    return doc["signature"], tuple(ImageEntry(**e) for e in doc["entries"])
+
+
+def load_manifest(images_dir: Path, cache_dir: Path = CACHE_DIR) -> Tuple[ImageEntry, ...]:
+    """Ordered gallery entries; empty when the directory doesn't exist."""
+    try:
+        signature = _current_signature(images_dir)
+    except OSError:
+        return ()
+    _, entries = get_shared_cache().get_or_set(
+        "gallery",
+        f"{images_dir.resolve()}|{cache_dir.resolve()}",
+        lambda: _load(images_dir, cache_dir, signature),
+        valid=lambda v: v[0] == signature,
+    )
+    return entries
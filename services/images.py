@@ -0,0 +1,178 @@
+"""
+Resized image variants for the gallery, cached by content key.
+
+Build ahead of time (uses a process pool)::
+
+    python -m services.images build --dir assets/images --workers 4
+
+or let ``variant_for`` build a missing variant on first request. Variants
+live in ``assets/.cache/images``; the cache key includes the source mtime and
+size, so an edited image gets fresh variants and stale ones are pruned on
+the next build. Pillow is optional: without it the originals are served.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp"}
+VARIANT_WIDTHS: Tuple[int, ...] = (320, 640, 1280)
+DEFAULT_FORMATS: Tuple[str, ...] = ("webp",)
+CACHE_DIR = Path("assets") / ".cache" / "images"
+_VARIANT_RE = re.compile(r"-[0-9a-f]{12}-\d+w\.")
+_SAVE_OPTS = {"webp": {"quality": 80, "method": 6}, "avif": {"quality": 60}}
+
+
+def _key(src: Path) -> str:
+    st_ = src.stat()
+    raw = f"{src.resolve()}:{st_.st_mtime_ns}:{st_.st_size}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def variant_path(src: Path, width: int, fmt: str = "webp", cache_dir: Path = CACHE_DIR) -> Path:
+    return cache_dir / f"{src.stem}-{_key(src)}-{width}w.{fmt}"
+
+
+def pillow_available() -> bool:
+    try:
+        import PIL  # noqa: F401  # type: ignore
+    except ImportError:
+        return False
+    return True
+
+
+def build_variant(src: Path, width: int, fmt: str = "webp", cache_dir: Path = CACHE_DIR) -> Path:
+    """Write one variant (never upscaled) and return its path; atomic via rename."""
+    from PIL import Image, ImageOps  # type: ignore
+
+    out = variant_path(src, width, fmt, cache_dir)
+    if out.exists():
+        return out
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with Image.open(src) as im:
+        im = ImageOps.exif_transpose(im)
+        if im.mode not in ("RGB", "RGBA"):
+            im = im.convert("RGBA" if "A" in im.getbands() else "RGB")
+        if im.width > width:
+            im.thumbnail((width, width * 10), Image.LANCZOS)
+        # Unique per call: sessions are threads, so two can render the same variant at once
+        with tempfile.NamedTemporaryFile(dir=out.parent, prefix=f".{out.stem}.", suffix=".tmp", delete=False) as f:
+            tmp = Path(f.name)
+            try:
+                im.save(f, format=fmt.upper(), **_SAVE_OPTS.get(fmt, {}))
+            except BaseException:
+                f.close()
+                tmp.unlink(missing_ok=True)
+                raise
+    os.replace(tmp, out)
+    return out
+
+
+def _build_task(args: Tuple[str, int, str, str]) -> Optional[str]:
+    src, width, fmt, cache_dir = args
+    try:
+        return str(build_variant(Path(src), width, fmt, Path(cache_dir)))
+    except Exception as e:  # keep going; the original is served instead
+        logger.warning("Could not build %s @%dw (%s): %s", src, width, fmt, e)
+        return None
+
+
+def source_images(images_dir: Path) -> List[Path]:
+    if not images_dir.exists():
+        return []
+    return sorted(p for p in images_dir.iterdir() if p.suffix.lower() in IMAGE_EXTS)
+
+
+def prune(sources: Iterable[Path], cache_dir: Path = CACHE_DIR) -> int:
+    """Delete cached variants whose source changed or disappeared."""
+    if not cache_dir.exists():
+        return 0
+    live = {f"{p.stem}-{_key(p)}-" for p in sources}
+    removed = 0
+    for f in cache_dir.iterdir():
+        if f.is_file() and _VARIANT_RE.search(f.name) and not any(f.name.startswith(prefix) for prefix in live):
+            f.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def build_all(
+    images_dir: Path,
+    widths: Sequence[int] = VARIANT_WIDTHS,
+    formats: Sequence[str] = DEFAULT_FORMATS,
+    cache_dir: Path = CACHE_DIR,
+    workers: Optional[int] = None,
+) -> Tuple[int, int]:
+    """Build missing variants in a process pool; returns (built, pruned)."""
+    sources = source_images(images_dir)
+    pruned = prune(sources, cache_dir)
+    tasks = [
+        (str(src), w, fmt, str(cache_dir))
+        for src in sources
+        for w in widths
+        for fmt in formats
+        if not variant_path(src, w, fmt, cache_dir).exists()
+    ]
+    if not tasks:
+        return 0, pruned
+    from concurrent.futures import ProcessPoolExecutor  # build-time only; keeps page imports light
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        built = sum(1 for r in pool.map(_build_task, tasks, chunksize=4) if r)
+    return built, pruned
+
+
+def variant_for(
+    src: Path,
+    display_px: int,
+    dpr: float = 2.0,
+    fmt: str = "webp",
+    widths: Sequence[int] = VARIANT_WIDTHS,
+    cache_dir: Path = CACHE_DIR,
+) -> Path:
+    """
+    Smallest variant at least ``display_px * dpr`` wide (or the largest one),
+    built on demand; falls back to ``src`` when Pillow is unavailable.
+    """
+    need = display_px * dpr
+    width = next((w for w in sorted(widths) if w >= need), max(widths))
+    try:
+        out = variant_path(src, width, fmt, cache_dir)
+    except OSError:
+        return src
+    if out.exists():
+        return out
+    if not pillow_available():
+        return src
+    built = _build_task((str(src), width, fmt, str(cache_dir)))
+    return Path(built) if built else src
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Build resized gallery image variants.")
+    ap.add_argument("command", choices=["build"])
+    ap.add_argument("--dir", type=Path, default=Path("assets") / "images")
+    ap.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    ap.add_argument("--formats", default=",".join(DEFAULT_FORMATS), help="comma-separated, e.g. webp,avif")
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args(argv)
+    if not pillow_available():
+        print("error: building variants needs Pillow (`pip install pillow`).", file=sys.stderr)
+        return 2
+    formats = [f.strip().lower() for f in args.formats.split(",") if f.strip()]
+    built, pruned = build_all(args.dir, formats=formats, cache_dir=args.cache_dir, workers=args.workers)
+    print(f"built {built} variants, pruned {pruned} stale files in {args.cache_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
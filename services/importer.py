@@ -0,0 +1,249 @@
+"""
+Streaming bulk import of lead lists (CSV or XLSX) into the configured storage.
+
+CLI::
+
+    python -m services.importer leads.csv --rejects rejects.csv
+    python -m services.importer event.xlsx --chunk-size 1000 --dry-run
+
+Rows are read and validated in chunks with the same rules as the inquiry form
+(``components.forms.validate_inquiry``), deduplicated, and written with one
+bulk ``save_inquiries`` call per chunk, so memory stays flat for any file size.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from components.forms import InquiryData, validate_inquiry
+from services.dedupe import RecentSubmissions
+from services.storage import Storage
+
+FIELDS = ("name", "email", "phone", "goals", "notes")
+HEADER_ALIASES: Dict[str, str] = {
+    "full_name": "name",
+    "e_mail": "email",
+    "email_address": "email",
+    "phone_number": "phone",
+    "mobile": "phone",
+    "goal": "goals",
+    "note": "notes",
+    "message": "notes",
+    "comments": "notes",
+}
+MAX_REJECT_SAMPLES = 1000
+
+Row = Tuple[int, Dict[str, str]]  # (1-based file row number, normalized record)
+Source = Union[str, Path, IO[bytes]]
+
+
+class LeadFileError(ValueError):
+    """Unreadable file or missing required columns."""
+
+
+@dataclass
+class ImportReport:
+    total: int = 0
+    saved: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    failed_chunks: int = 0
+    rejects: List[Tuple[int, str]] = field(default_factory=list)  # first MAX_REJECT_SAMPLES only
+    elapsed: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.total} rows: {self.saved} saved, {self.duplicates} duplicates, "
+            f"{self.rejected} rejected, {self.failed_chunks} failed chunks in {self.elapsed:.1f}s"
+        )
+
+
+def _normalize_header(cells: Iterable[object]) -> List[str]:
+    out = []
+    for c in cells:
+        key = str(c or "").strip().lower().replace("-", "_").replace(" ", "_")
+        out.append(HEADER_ALIASES.get(key, key))
+    if "email" not in out or "name" not in out:
+        raise LeadFileError("File needs at least 'name' and 'email' columns.")
+    return out
+
+
+def _records(header: List[str], rows: Iterable[Iterable[object]], first_row: int = 2) -> Iterator[Row]:
+    for num, cells in enumerate(rows, start=first_row):
+        values = ["" if c is None else str(c).strip() for c in cells]
+        if not any(values):
+            continue
+        yield num, {k: v for k, v in zip(header, values) if k in FIELDS}
+
+
+def read_csv(source: Source) -> Iterator[Row]:
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as fh:
+            yield from read_csv(fh)
+        return
+    stream = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+    reader = csv.reader(stream)
+    try:
+        header = _normalize_header(next(reader))
+    except StopIteration:
+        return
+    yield from _records(header, reader)
+
+
+def read_xlsx(source: Source) -> Iterator[Row]:
+    try:
+        from openpyxl import load_workbook  # type: ignore
+    except ImportError as e:  # optional dependency
+        raise LeadFileError("XLSX import needs openpyxl (`pip install openpyxl`).") from e
+
+    wb = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        try:
+            header = _normalize_header(next(rows))
+        except StopIteration:
+            return
+        yield from _records(header, rows)
+    finally:
+        wb.close()
+
+
+def read_rows(source: Source, filename: str = "") -> Iterator[Row]:
+    name = (filename or str(getattr(source, "name", source))).lower()
+    if name.endswith((".xlsx", ".xlsm")):
+        return read_xlsx(source)
+    if name.endswith((".csv", ".txt")):
+        return read_csv(source)
+    raise LeadFileError(f"Unsupported file type: {name or 'unknown'} (use .csv or .xlsx)")
+
+
+def _chunks(rows: Iterable[Row], size: int) -> Iterator[List[Row]]:
+    chunk: List[Row] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def validate_batch(
+    chunk: List[Row], seen: RecentSubmissions, now: float
+) -> Tuple[List[Tuple[int, InquiryData]], List[Tuple[int, str]], int]:
+    """Valid (row number, record) pairs, (row number, reason) rejects, and duplicate count."""
+    valid: List[Tuple[int, InquiryData]] = []
+    rejects: List[Tuple[int, str]] = []
+    dupes = 0
+    for num, rec in chunk:
+        data = InquiryData(
+            name=rec.get("name", ""),
+            email=rec.get("email", ""),
+            phone=rec.get("phone", ""),
+            goals=rec.get("goals", ""),
+            notes=rec.get("notes", ""),
+            honey="",
+            submitted_ts=now,
+            source="import",
+        )
+        ok, msg = validate_inquiry(data)
+        if not ok:
+            rejects.append((num, msg))
+        elif not seen.claim(data, now=now):
+            dupes += 1
+        else:
+            valid.append((num, data))
+    return valid, rejects, dupes
+
+
+def import_rows(
+    rows: Iterable[Row],
+    storage: Optional[Storage],
+    chunk_size: int = 500,
+    on_reject: Optional[Callable[[int, str], None]] = None,
+    on_progress: Optional[Callable[[ImportReport], None]] = None,
+    max_tracked: int = 200_000,
+) -> ImportReport:
+    """
+    Validate and write ``rows`` chunk by chunk. ``storage=None`` is a dry run.
+
+    Duplicate detection is bounded to the most recent ``max_tracked`` records.
+    """
+    report = ImportReport()
+    seen = RecentSubmissions(max_entries=max_tracked, ttl=float("inf"))
+    t0 = time.perf_counter()
+    for chunk in _chunks(rows, chunk_size):
+        valid, rejects, dupes = validate_batch(chunk, seen, time.time())
+        report.total += len(chunk)
+        report.duplicates += dupes
+        report.rejected += len(rejects)
+        for num, msg in rejects:
+            if len(report.rejects) < MAX_REJECT_SAMPLES:
+                report.rejects.append((num, msg))
+            if on_reject:
+                on_reject(num, msg)
+        if valid and storage is not None:
+            result = storage.save_inquiries([data for _, data in valid])
+            if result.ok:
+                saved = len(valid) if result.saved is None else result.saved
+                report.saved += saved
+                report.duplicates += len(valid) - saved  # skipped by the storage as already received
+            else:
+                report.failed_chunks += 1
+                if on_reject:
+                    for num, _ in valid:
+                        on_reject(num, f"write failed: {result.message}")
+        elif storage is None:
+            report.saved += len(valid)
+        if on_progress:
+            on_progress(report)
+    report.elapsed = time.perf_counter() - t0
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("path", type=Path)
+    ap.add_argument("--chunk-size", type=int, default=500)
+    ap.add_argument("--rejects", type=Path, help="write rejected row numbers and reasons to this CSV")
+    ap.add_argument("--dry-run", action="store_true", help="validate only, write nothing")
+    args = ap.parse_args(argv)
+
+    storage: Optional[Storage] = None
+    if not args.dry_run:
+        from services.storage import get_storage
+
+        storage = get_storage(dedupe=False)
+
+    reject_file = args.rejects.open("w", newline="", encoding="utf-8") if args.rejects else None
+    writer = csv.writer(reject_file) if reject_file else None
+    if writer:
+        writer.writerow(["row", "reason"])
+    try:
+        report = import_rows(
+            read_rows(args.path),
+            storage,
+            chunk_size=args.chunk_size,
+            on_reject=(lambda n, m: writer.writerow([n, m])) if writer else None,
+        )
+    except LeadFileError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if reject_file:
+            reject_file.close()
+    print(report.summary())
+    if not writer:
+        for num, msg in report.rejects[:20]:
+            print(f"  row {num}: {msg}")
+    return 0 if report.failed_chunks == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
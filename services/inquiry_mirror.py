@@ -0,0 +1,253 @@
+"""
+Local, queryable copy of the inquiries for the admin dashboard.
+
+With the Google Sheet backend, ``InquiryMirror`` keeps the sheet's rows in
+a SQLite file (``INQUIRY_MIRROR_PATH``) keyed by sheet row number. Rows are
+only ever appended to the sheet, so ``sync()`` asks for the rows below the
+last one it holds, in batches, and a sync with nothing new costs two small
+reads. The first of those re-reads the last known row; if it no longer
+matches (rows deleted or re-sorted by hand) the copy is rebuilt from
+scratch. With the SQLite backend the inquiries are local already and are
+queried in place.
+
+``query_inquiries`` filters, sorts and pages either source. Date, source
+and sort columns are indexed, so a page costs a millisecond or two with
+years of history; free-text search is a ``LIKE`` scan (about 80 ms per
+100k rows).
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from services.settings import get_settings
+from services.storage import SHEET_HEADER, GoogleSheetStorage
+
+SORT_COLUMNS = ("timestamp_utc", "name", "email", "source", "spam_score")
+TEXT_COLUMNS = ("name", "email", "phone", "goals", "notes")
+BATCH_ROWS = 2000
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    added: int
+    rebuilt: bool
+    last_row: int
+    seconds: float
+
+
+@dataclass(frozen=True)
+class InquiryQuery:
+    text: str = ""  # substring of name, email, phone, goals or notes
+    since: str = ""  # ISO-8601 UTC bounds on timestamp_utc: since <= t < until
+    until: str = ""
+    sources: Tuple[str, ...] = ()
+    spam_below: Optional[float] = None  # keep rows scoring under this
+    sort: str = "timestamp_utc"
+    descending: bool = True
+    page: int = 1  # 1-based
+    page_size: int = 50
+
+
+@dataclass
+class InquiryPage:
+    rows: List[Dict[str, str]] = field(default_factory=list)
+    total: int = 0
+    page: int = 1
+    pages: int = 1
+
+
+def query_inquiries(conn: sqlite3.Connection, q: InquiryQuery) -> InquiryPage:
+    """One page of ``inquiries`` rows (columns of ``SHEET_HEADER``) matching ``q``."""
+    where: List[str] = []
+    args: List[object] = []
+    if q.text.strip():
+        # LIKE is case-insensitive for ASCII and much cheaper than lower() on every row
+        pattern = "%" + q.text.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        where.append("(" + " OR ".join(f"{c} LIKE ? ESCAPE '\\'" for c in TEXT_COLUMNS) + ")")
+        args += [pattern] * len(TEXT_COLUMNS)
+    if q.since:
+        where.append("timestamp_utc >= ?")
+        args.append(q.since)
+    if q.until:
+        where.append("timestamp_utc < ?")
+        args.append(q.until)
+    if q.sources:
+        where.append(f"source IN ({', '.join('?' for _ in q.sources)})")
+        args += list(q.sources)
+    if q.spam_below is not None:
+        where.append("CAST(spam_score AS REAL) < ?")
+        args.append(q.spam_below)
+    clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+    sort = q.sort if q.sort in SORT_COLUMNS else "timestamp_utc"
+    order_by = "CAST(spam_score AS REAL)" if sort == "spam_score" else sort
+    if sort in ("name", "email"):
+        order_by += " COLLATE NOCASE"
+    direction = "DESC" if q.descending else "ASC"
+
+    total = int(conn.execute(f"SELECT COUNT(*) FROM inquiries {clause}", args).fetchone()[0])
+    page_size = max(1, q.page_size)
+    pages = max(1, -(-total // page_size))
+    page = min(max(1, q.page), pages)
+    cur = conn.execute(
+        f"SELECT {', '.join(SHEET_HEADER)} FROM inquiries {clause}"
+        f" ORDER BY {order_by} {direction}, rowid {direction} LIMIT ? OFFSET ?",
+        args + [page_size, (page - 1) * page_size],
+    )
+    return InquiryPage([dict(zip(SHEET_HEADER, r)) for r in cur.fetchall()], total, page, pages)
+
+
+def distinct_sources(conn: sqlite3.Connection) -> List[str]:
+    return [r[0] for r in conn.execute("SELECT DISTINCT source FROM inquiries WHERE source != '' ORDER BY source")]
+
+
+class InquiryMirror:
+    """SQLite copy of the inquiry sheet, appended to by ``sync``."""
+
+    def __init__(self, path: Path, sheet: Optional[GoogleSheetStorage] = None) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.sheet = sheet or GoogleSheetStorage()
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # a copy: the sheet is the source of truth
+        columns = ", ".join(f"{c} TEXT NOT NULL DEFAULT ''" for c in SHEET_HEADER)
+        self._conn.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS inquiries (sheet_row INTEGER PRIMARY KEY, {columns});
+            CREATE INDEX IF NOT EXISTS ix_mirror_ts ON inquiries (timestamp_utc);
+            CREATE INDEX IF NOT EXISTS ix_mirror_email ON inquiries (email COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS ix_mirror_name ON inquiries (name COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS ix_mirror_source ON inquiries (source);
+            CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            """
+        )
+
+    def _state(self, key: str, default: str = "") -> str:
+        row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_state(self, **values: object) -> None:
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", [(k, str(v)) for k, v in values.items()]
+        )
+
+    @property
+    def last_row(self) -> int:
+        with self._lock:
+            return int(self._state("last_row", "1"))  # row 1 is the header
+
+    @property
+    def synced_at(self) -> float:
+        with self._lock:
+            return float(self._state("synced_at", "0"))
+
+    def _fingerprint(self, row: Sequence[str]) -> str:
+        return "\x1f".join((list(row) + ["", "", ""])[:3])  # timestamp, name, email
+
+    def _reset(self) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute("DELETE FROM inquiries")
+            self._conn.execute("DELETE FROM sync_state")
+            self._conn.execute("COMMIT")
+
+    def sync(self, batch_rows: int = BATCH_ROWS) -> SyncResult:
+        """Fetch the rows appended to the sheet since the last sync."""
+        t0 = time.perf_counter()
+        with self._sync_lock:
+            rebuilt = False
+            with self._lock:
+                sheet_name = self._state("sheet")
+                last = int(self._state("last_row", "1"))
+                fingerprint = self._state("fingerprint")
+                stored_header = self._state("header").split("\x1f")
+            if sheet_name != self.sheet.sheet_name:
+                rebuilt = sheet_name != ""
+                self._reset()
+                last, fingerprint = 1, ""
+            elif last > 1 and self._fingerprint(self.sheet.row(last)) != fingerprint:
+                rebuilt = True
+                self._reset()
+                last, fingerprint = 1, ""
+            elif last > 1 and -1 in _positions(stored_header) and self.sheet.row(1) != stored_header:
+                # A column was named since the copy was made (an upgraded sheet); re-read it all
+                rebuilt = True
+                self._reset()
+                last, fingerprint = 1, ""
+
+            if last == 1:
+                header = self.sheet.row(1)
+                with self._lock:
+                    self._set_state(sheet=self.sheet.sheet_name, header="\x1f".join(header))
+            else:
+                header = stored_header
+            positions = _positions(header)
+            width = max(positions) + 1 if positions else len(SHEET_HEADER)
+
+            added = 0
+            while True:
+                rows = self.sheet.rows(last + 1, batch_rows, width)
+                mapped = [[r[i] if i >= 0 else "" for i in positions] for r in rows]
+                if rows:
+                    with self._lock:
+                        self._conn.execute("BEGIN IMMEDIATE")
+                        try:
+                            self._conn.executemany(
+                                f"INSERT OR REPLACE INTO inquiries (sheet_row, {', '.join(SHEET_HEADER)})"
+                                f" VALUES (?, {', '.join('?' for _ in SHEET_HEADER)})",
+                                [[last + 1 + i] + m for i, m in enumerate(mapped) if any(m)],  # skip blank rows
+                            )
+                            last += len(rows)
+                            fingerprint = self._fingerprint(rows[-1])
+                            self._set_state(last_row=last, fingerprint=fingerprint)
+                        except Exception:
+                            self._conn.execute("ROLLBACK")
+                            raise
+                        self._conn.execute("COMMIT")
+                    added += len(rows)
+                if len(rows) < batch_rows:
+                    break
+            with self._lock:
+                self._set_state(synced_at=time.time())
+        return SyncResult(added, rebuilt, last, time.perf_counter() - t0)
+
+    def query(self, q: InquiryQuery) -> InquiryPage:
+        with self._lock:
+            return query_inquiries(self._conn, q)
+
+    def sources(self) -> List[str]:
+        with self._lock:
+            return distinct_sources(self._conn)
+
+
+def _positions(header: Sequence[str]) -> List[int]:
+    """Where each ``SHEET_HEADER`` column sits in the sheet's own header (-1 when absent)."""
+    names = [h.strip().lower() for h in header]
+    if not any(names):
+        return list(range(len(SHEET_HEADER)))
+    return [names.index(c) if c in names else -1 for c in SHEET_HEADER]
+
+
+_mirror_lock = threading.Lock()
+_mirror: Optional[InquiryMirror] = None
+_mirror_config: Tuple[object, ...] = ()
+
+
+def get_mirror() -> InquiryMirror:
+    """Process-wide mirror of the configured sheet."""
+    global _mirror, _mirror_config
+    s = get_settings()
+    config = (s.inquiry_mirror_path, s.google_sheet_name, s.google_service_account_json)
+    with _mirror_lock:
+        if _mirror is None or config != _mirror_config:
+            _mirror = InquiryMirror(s.inquiry_mirror_path)
+            _mirror_config = config
+        return _mirror
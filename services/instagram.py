@@ -0,0 +1,161 @@
+"""
+Local snapshot of the Instagram posts listed in ``INSTAGRAM_POST_URLS``.
+
+Refresh offline or from cron::
+
+    python -m services.instagram refresh            # URLs from secrets
+    python -m services.instagram refresh URL [URL…] --max-age 3600
+
+Each post's caption, author and thumbnail are stored in
+``data/instagram_snapshot.json``; thumbnails are downloaded to
+``assets/.cache/instagram`` so visitors never hit Instagram until they ask
+for the real embed. Metadata comes from the oEmbed API when
+``INSTAGRAM_OEMBED_TOKEN`` is set, otherwise from the post page's og: tags.
+"""
+from __future__ import annotations
+
+import argparse
+import html
+import json
+import logging
+import os
+import re
+import sys
+import time
+import urllib.parse
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from services.shared_cache import get_shared_cache
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATH = Path("data") / "instagram_snapshot.json"
+THUMB_DIR = Path("assets") / ".cache" / "instagram"
+OEMBED_URL = "https://graph.facebook.com/v19.0/instagram_oembed"
+USER_AGENT = "Mozilla/5.0 (compatible; ThriveSnapshot/1.0)"
+_META_RE = re.compile(r'<meta[^>]+property="og:(image|description|title)"[^>]+content="([^"]*)"', re.IGNORECASE)
+_SHORTCODE_RE = re.compile(r"instagram\.com/(?:p|reel|tv)/([A-Za-z0-9_-]+)")
+
+
+@dataclass(frozen=True)
+class InstagramPost:
+    permalink: str
+    caption: str = ""
+    author: str = ""
+    thumbnail: str = ""  # local path under THUMB_DIR, or "" when not fetched
+
+    @property
+    def thumbnail_path(self) -> Optional[Path]:
+        if self.thumbnail and Path(self.thumbnail).exists():
+            return Path(self.thumbnail)
+        return None
+
+
+def _shortcode(url: str) -> str:
+    m = _SHORTCODE_RE.search(url)
+    return m.group(1) if m else re.sub(r"\W+", "_", url)[-40:]
+
+
+def _get(url: str, timeout: float = 10.0) -> bytes:
+    import urllib.request  # refresh-only; pulls in http.client and ssl
+
+    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return resp.read()
+
+
+def _fetch_meta(url: str, token: str) -> Tuple[str, str, str]:
+    """(caption, author, thumbnail_url) for one post."""
+    if token:
+        q = urllib.parse.urlencode({"url": url, "access_token": token, "omitscript": "true"})
+        doc = json.loads(_get(f"{OEMBED_URL}?{q}"))
+        return doc.get("title", ""), doc.get("author_name", ""), doc.get("thumbnail_url", "")
+    page = _get(url).decode("utf-8", errors="replace")
+    meta = {k.lower(): html.unescape(v) for k, v in _META_RE.findall(page)}
+    return meta.get("description", ""), meta.get("title", ""), meta.get("image", "")
+
+
+def fetch_post(url: str, token: str = "", thumb_dir: Path = THUMB_DIR) -> InstagramPost:
+    caption, author, thumb_url = _fetch_meta(url, token)
+    thumbnail = ""
+    if thumb_url:
+        thumb_dir.mkdir(parents=True, exist_ok=True)
+        out = thumb_dir / f"{_shortcode(url)}.jpg"
+        tmp = out.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(_get(thumb_url))
+        os.replace(tmp, out)
+        thumbnail = str(out)
+    return InstagramPost(permalink=url, caption=caption[:500], author=author, thumbnail=thumbnail)
+
+
+def refresh_snapshot(urls: Iterable[str], token: str = "", path: Path = SNAPSHOT_PATH) -> List[InstagramPost]:
+    """Fetch every URL; a failed fetch keeps the previous snapshot entry."""
+    previous = {p.permalink: p for p in _read(path)}
+    posts = []
+    for url in urls:
+        try:
+            posts.append(fetch_post(url, token))
+        except Exception as e:
+            logger.warning("Could not refresh %s: %s", url, e)
+            posts.append(previous.get(url, InstagramPost(permalink=url)))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(
+        json.dumps({"fetched_at": time.time(), "posts": [asdict(p) for p in posts]}, ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    os.replace(tmp, path)
+    return posts
+
+
+def _read(path: Path) -> List[InstagramPost]:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            doc = json.load(f)
+        return [InstagramPost(**p) for p in doc.get("posts", [])]
+    except (OSError, ValueError, TypeError):
+        return []
+
+
+def load_posts(urls: Iterable[str], path: Path = SNAPSHOT_PATH) -> List[InstagramPost]:
+    """Snapshot entries for ``urls`` in order; URLs not in the snapshot get bare entries."""
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        mtime = -1
+    _, by_url = get_shared_cache().get_or_set(
+        "instagram",
+        str(path.resolve()),
+        lambda: (mtime, {p.permalink: p for p in _read(path)}),
+        valid=lambda v: v[0] == mtime,
+    )
+    return [by_url.get(u, InstagramPost(permalink=u)) for u in urls]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Refresh the local Instagram post snapshot.")
+    ap.add_argument("command", choices=["refresh"])
+    ap.add_argument("urls", nargs="*", help="default: INSTAGRAM_POST_URLS from secrets")
+    ap.add_argument("--max-age", type=float, default=0.0, help="skip if the snapshot is younger (s)")
+    args = ap.parse_args(argv)
+
+    if args.max_age and SNAPSHOT_PATH.exists() and time.time() - SNAPSHOT_PATH.stat().st_mtime < args.max_age:
+        print("snapshot is fresh; nothing to do")
+        return 0
+    urls = list(args.urls)
+    token = os.environ.get("INSTAGRAM_OEMBED_TOKEN", "")
+    if not urls or not token:
+        from services.settings import get_settings
+
+        settings = get_settings()
+        urls = urls or list(settings.instagram_post_urls)
+        token = token or settings.instagram_oembed_token
+    posts = refresh_snapshot(urls, token)
+    print(f"snapshot: {sum(1 for p in posts if p.thumbnail)}/{len(posts)} posts with thumbnails -> {SNAPSHOT_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
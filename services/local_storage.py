@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from components.forms import InquiryData
+from services.inquiry_mirror import InquiryPage, InquiryQuery, distinct_sources, query_inquiries
+from services.metrics import instrument
+from services.settings import get_settings
+from services.storage import SHEET_HEADER, Storage, StorageResult, build_row
+
+
+class SQLiteStorage(Storage):
+    """
+    Embedded local storage for inquiries.
+
+    One WAL-mode connection per database file is shared by the whole process;
+    ``synchronous=NORMAL`` keeps commits in the low milliseconds while still
+    surviving an application crash. Columns mirror ``SHEET_HEADER``.
+
+    Secrets (optional):
+      - SQLITE_PATH (default ``data/inquiries.sqlite3``)
+    """
+
+    _instances: Dict[str, "SQLiteStorage"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        columns = ", ".join(f"{c} TEXT NOT NULL DEFAULT ''" for c in SHEET_HEADER)
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS inquiries (id INTEGER PRIMARY KEY AUTOINCREMENT, {columns})")
+        existing = {r[1] for r in self._conn.execute("PRAGMA table_info(inquiries)")}
+        for c in SHEET_HEADER:
+            if c not in existing:  # columns added to SHEET_HEADER after the file was created
+                self._conn.execute(f"ALTER TABLE inquiries ADD COLUMN {c} TEXT NOT NULL DEFAULT ''")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_inquiries_ts ON inquiries (timestamp_utc)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_inquiries_email ON inquiries (email COLLATE NOCASE)")
+
+    @classmethod
+    def shared(cls, path: Optional[Path] = None) -> "SQLiteStorage":
+        """Process-wide instance for ``path`` (``SQLITE_PATH`` from secrets by default)."""
+        if path is None:
+            path = get_settings().sqlite_path
+        key = str(path.resolve())
+        with cls._instances_lock:
+            inst = cls._instances.get(key)
+            if inst is None:
+                inst = cls._instances[key] = cls(path)
+            return inst
+
+    @instrument("storage.sqlite")
+    def save_inquiry(self, data: InquiryData) -> StorageResult:
+        placeholders = ", ".join("?" for _ in SHEET_HEADER)
+        try:
+            with self._lock:
+                self._conn.execute(
+                    f"INSERT INTO inquiries ({', '.join(SHEET_HEADER)}) VALUES ({placeholders})",
+                    build_row(data),
+                )
+        except sqlite3.Error as e:
+            return StorageResult(ok=False, message=f"Local database error: {e}")
+        return StorageResult(ok=True, message="Saved to local database.")
+
+    @instrument("storage.sqlite")
+    def save_inquiries(self, items: Sequence[InquiryData]) -> StorageResult:
+        placeholders = ", ".join("?" for _ in SHEET_HEADER)
+        rows = [build_row(d) for d in items]
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    self._conn.executemany(
+                        f"INSERT INTO inquiries ({', '.join(SHEET_HEADER)}) VALUES ({placeholders})", rows
+                    )
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            return StorageResult(ok=False, message=f"Local database error: {e}")
+        return StorageResult(ok=True, message=f"Saved {len(rows)} to local database.")
+
+    def find_by_email(self, email: str, limit: int = 50) -> List[dict]:
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT * FROM inquiries WHERE email = ? COLLATE NOCASE ORDER BY timestamp_utc DESC LIMIT ?",
+                (email, limit),
+            )
+            return [dict(r) for r in cur.fetchall()]
+
+    def recent(self, limit: int = 50, since: str = "") -> List[dict]:
+        """Newest first; ``since`` is an ISO-8601 UTC lower bound."""
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT * FROM inquiries WHERE timestamp_utc >= ? ORDER BY timestamp_utc DESC LIMIT ?",
+                (since, limit),
+            )
+            return [dict(r) for r in cur.fetchall()]
+
+    def query(self, q: InquiryQuery) -> InquiryPage:
+        """Filtered, sorted page for the admin dashboard."""
+        with self._lock:
+            return query_inquiries(self._conn, q)
+
+    def sources(self) -> List[str]:
+        with self._lock:
+            return distinct_sources(self._conn)
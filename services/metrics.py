@@ -0,0 +1,321 @@
+"""
+In-process render timing: latency histograms per (page, section) and rerun
+counts per page.
+
+    @instrumented_page("home")
+    def main() -> None: ...
+
+    @instrument("hero")
+    def render_hero(...): ...
+
+    with timed("storage.save"):
+        storage.save_inquiry(data)
+
+    @st.fragment
+    @instrumented_fragment("inquiry", "form")
+    def inquiry_section(): ...
+
+Sections are attributed to the page whose script is running on the current
+thread (Streamlit runs each session's script on its own thread); work on
+other threads, such as the spool writer, is recorded under ``"-"``.
+Recording is a ``perf_counter`` pair, a bisect and a short lock.
+
+``render_text()`` returns the Prometheus text format, plus the lines of any
+``add_collector`` callbacks (the inquiry rate limiter registers one); it is
+shown on the
+Metrics admin page and, with ``METRICS_PORT`` set in secrets, served at
+``http://<host>:<port>/metrics`` (read on the first rerun; changing it
+needs a restart).
+"""
+from __future__ import annotations
+
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Upper bounds in milliseconds; the last bucket is +Inf
+BUCKETS_MS: Tuple[float, ...] = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+NO_PAGE = "-"
+
+_local = threading.local()
+
+
+@dataclass
+class Histogram:
+    counts: List[int] = field(default_factory=lambda: [0] * (len(BUCKETS_MS) + 1))
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimate by linear interpolation inside the bucket holding the q-th sample."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lo = BUCKETS_MS[i - 1] if i else 0.0
+                hi = BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+                return min(lo + (hi - lo) * (rank - seen) / n, self.max_ms)
+            seen += n
+        return self.max_ms
+
+
+@dataclass(frozen=True)
+class SectionStats:
+    page: str
+    section: str
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sections: Dict[Tuple[str, str], Histogram] = {}
+        self._reruns: Dict[str, int] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self.started = time.time()
+
+    def observe(self, page: str, section: str, ms: float, error: bool = False) -> None:
+        key = (page, section)
+        with self._lock:
+            hist = self._sections.get(key)
+            if hist is None:
+                hist = self._sections[key] = Histogram()
+            hist.observe(ms)
+            if error:
+                self._errors[key] = self._errors.get(key, 0) + 1
+
+    def rerun(self, page: str) -> None:
+        with self._lock:
+            self._reruns[page] = self._reruns.get(page, 0) + 1
+
+    def reruns(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(sorted(self._reruns.items()))
+
+    def stats(self) -> List[SectionStats]:
+        with self._lock:
+            items = sorted(self._sections.items())
+            return [
+                SectionStats(p, s, h.count, h.mean_ms, h.quantile(0.5), h.quantile(0.95), h.max_ms)
+                for (p, s), h in items
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sections.clear()
+            self._reruns.clear()
+            self._errors.clear()
+            self.started = time.time()
+
+    def render_text(self) -> str:
+        """Prometheus text exposition format."""
+        with self._lock:
+            sections = sorted(
+                (k, Histogram(list(h.counts), h.count, h.total_ms, h.max_ms)) for k, h in self._sections.items()
+            )
+            reruns = sorted(self._reruns.items())
+            errors = sorted(self._errors.items())
+        lines = [
+            "# HELP thrive_reruns_total Script runs per page.",
+            "# TYPE thrive_reruns_total counter",
+        ]
+        lines += [f'thrive_reruns_total{{page="{_label(p)}"}} {n}' for p, n in reruns]
+        lines += [
+            "# HELP thrive_section_seconds Render time per page section.",
+            "# TYPE thrive_section_seconds histogram",
+        ]
+        for (page, section), h in sections:
+            labels = f'page="{_label(page)}",section="{_label(section)}"'
+            cumulative = 0
+            for bound, n in zip(BUCKETS_MS, h.counts):
+                cumulative += n
+                lines.append(f'thrive_section_seconds_bucket{{{labels},le="{bound / 1000:g}"}} {cumulative}')
+            lines.append(f'thrive_section_seconds_bucket{{{labels},le="+Inf"}} {h.count}')
+            lines.append(f"thrive_section_seconds_sum{{{labels}}} {h.total_ms / 1000:.6f}")
+            lines.append(f"thrive_section_seconds_count{{{labels}}} {h.count}")
+        if errors:
+            lines += [
+                "# HELP thrive_section_errors_total Sections that raised.",
+                "# TYPE thrive_section_errors_total counter",
+            ]
+            lines += [
+                f'thrive_section_errors_total{{page="{_label(p)}",section="{_label(s)}"}} {n}' for (p, s), n in errors
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REGISTRY = Registry()
+
+
+def current_page() -> str:
+    return getattr(_local, "page", NO_PAGE)
+
+
+def _is_control_flow(exc: BaseException) -> bool:
+    # st.rerun() / st.stop() unwind the script with exceptions; they are not failures
+    return type(exc).__name__ in ("RerunException", "StopException")
+
+
+@contextmanager
+def timed(section: str, registry: Registry = REGISTRY) -> Iterator[None]:
+    """Record the block's wall time under ``section`` of the current page."""
+    t0 = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException as e:
+        error = not _is_control_flow(e)
+        raise
+    finally:
+        registry.observe(current_page(), section, (time.perf_counter() - t0) * 1000.0, error)
+
+
+def instrument(section: str, registry: Registry = REGISTRY) -> Callable[[F], F]:
+    """Decorator form of ``timed``."""
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with timed(section, registry):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def instrumented_page(name: str, registry: Registry = REGISTRY) -> Callable[[F], F]:
+    """Count a rerun of page ``name`` and time the whole script as section ``"total"``."""
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _server is None:
+                _start_from_settings()
+            previous = getattr(_local, "page", NO_PAGE)
+            _local.page = name
+            registry.rerun(name)
+            try:
+                with timed("total", registry):
+                    return func(*args, **kwargs)
+            finally:
+                _local.page = previous
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def instrumented_fragment(page: str, section: str, registry: Registry = REGISTRY) -> Callable[[F], F]:
+    """
+    Time an ``st.fragment`` body as ``section`` of ``page``. Fragment-only
+    reruns (no page script around them) are counted as ``"page:section"``.
+    """
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            previous = getattr(_local, "page", NO_PAGE)
+            if previous == NO_PAGE:
+                registry.rerun(f"{page}:{section}")
+            _local.page = page
+            try:
+                with timed(section, registry):
+                    return func(*args, **kwargs)
+            finally:
+                _local.page = previous
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+_collectors: List[Callable[[], List[str]]] = []
+
+
+def add_collector(collect: Callable[[], List[str]]) -> None:
+    """Append ``collect()``'s exposition lines to ``render_text()``, for counters kept outside the registry."""
+    if collect not in _collectors:
+        _collectors.append(collect)
+
+
+def render_text() -> str:
+    lines = [REGISTRY.render_text().rstrip("\n")]
+    for collect in list(_collectors):
+        lines += collect()
+    return "\n".join(lines) + "\n"
+
+
+_server_lock = threading.Lock()
+_server: Optional[Any] = None
+
+
+def _start_from_settings() -> None:
+    global _server
+    from services.settings import get_settings
+
+    port = get_settings().metrics_port
+    if port:
+        start_metrics_server(port)
+    else:
+        _server = False  # disabled; takes a restart to turn on
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> None:
+    """Serve ``render_text()`` at ``/metrics`` from a daemon thread (once per process)."""
+    global _server
+    with _server_lock:
+        if _server is not None or not port:
+            return
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        try:
+            _server = ThreadingHTTPServer((host, port), Handler)
+        except OSError:
+            # Another replica process on this host already serves the port
+            _server = False
+            return
+        threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
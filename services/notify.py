@@ -0,0 +1,501 @@
+"""
+Notifications sent after an inquiry is saved: an email to the trainer and
+a webhook to the CRM, delivered off the Streamlit script thread.
+
+    get_dispatcher().submit(inquiry_event(data))   # returns immediately
+
+``NotificationDispatcher`` fans each event out to every configured channel
+as a separate delivery and runs deliveries on a fixed pool of worker
+threads fed by a bounded queue. ``submit`` never waits: when the queue is
+full the event is dropped and logged rather than slowing the rerun.
+Failed deliveries are retried with exponential backoff and jitter, up to
+``NOTIFY_MAX_ATTEMPTS``; a ``PermanentError`` (a 4xx response, a refused
+recipient) is not retried. Channels keep their SMTP and HTTP connections
+in small pools, so steady traffic reuses a handful of sockets.
+
+Configured from secrets (``NOTIFY_EMAIL_TO`` with ``SMTP_*``, and
+``NOTIFY_WEBHOOK_URL``). ``services.fake_notify`` has local SMTP and HTTP
+servers to point them at.
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import heapq
+import json
+import logging
+import queue
+import random
+import smtplib
+import ssl
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from email.message import EmailMessage
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, Protocol, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+from components.forms import InquiryData
+from services.metrics import timed
+from services.settings import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+C = TypeVar("C")
+
+
+class PermanentError(Exception):
+    """A delivery the receiver rejected outright; retrying would not help."""
+
+
+@dataclass(frozen=True)
+class Event:
+    kind: str  # e.g. "inquiry.created"
+    key: str  # idempotency key, stable across retries
+    payload: Dict[str, Any]
+    created: float = field(default_factory=time.time)
+
+
+def inquiry_event(data: InquiryData) -> Event:
+    payload = asdict(data)
+    payload.pop("honey", None)
+    return Event("inquiry.created", data.token or f"{data.email}:{data.submitted_ts}", payload)
+
+
+class Channel(Protocol):
+    name: str
+
+    def send(self, event: Event) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class _Pool(Generic[C]):
+    """
+    Idle connections kept for reuse, newest first. A connection that raised
+    is closed instead of returned; one idle longer than ``idle_timeout`` is
+    closed on the next checkout, since servers drop quiet clients anyway.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], C],
+        closer: Callable[[C], None],
+        max_idle: int = 4,
+        idle_timeout: float = 60.0,
+    ) -> None:
+        self.factory = factory
+        self.closer = closer
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.created = 0
+        self._lock = threading.Lock()
+        self._idle: List[Tuple[float, C]] = []
+
+    def _discard(self, conn: C) -> None:
+        try:
+            self.closer(conn)
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self) -> Iterator[C]:
+        conn: Optional[C] = None
+        stale: List[C] = []
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                since, candidate = self._idle.pop()
+                if now - since < self.idle_timeout:
+                    conn = candidate
+                    break
+                stale.append(candidate)
+        for old in stale:
+            self._discard(old)
+        if conn is None:
+            conn = self.factory()
+            with self._lock:
+                self.created += 1
+        try:
+            yield conn
+        except BaseException:
+            self._discard(conn)
+            raise
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append((time.monotonic(), conn))
+                return
+        self._discard(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for _, conn in idle:
+            self._discard(conn)
+
+
+# ---------- Email ----------
+
+
+class EmailChannel:
+    name = "email"
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        sender: str,
+        recipients: Tuple[str, ...],
+        username: str = "",
+        password: str = "",
+        starttls: bool = True,
+        timeout: float = 15.0,
+        brand: str = "",
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = recipients
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.brand = brand
+        self.pool: _Pool[smtplib.SMTP] = _Pool(self._connect, _quit)
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.port == 465:
+            smtp: smtplib.SMTP = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                smtp.starttls(context=ssl.create_default_context())
+        if self.username:
+            smtp.login(self.username, self.password)
+        return smtp
+
+    def message(self, event: Event) -> EmailMessage:
+        p = event.payload
+        msg = EmailMessage()
+        subject = f"New inquiry from {p.get('name') or 'a visitor'}"
+        msg["Subject"] = f"{subject} — {self.brand}" if self.brand else subject
+        msg["From"] = self.sender
+        msg["To"] = ", ".join(self.recipients)
+        if p.get("email"):
+            msg["Reply-To"] = p["email"]
+        msg["X-Inquiry-Key"] = event.key
+        submitted = time.strftime("%Y-%m-%d %H:%M", time.localtime(p.get("submitted_ts") or event.created))
+        msg.set_content(
+            f"Name: {p.get('name', '')}\n"
+            f"Email: {p.get('email', '')}\n"
+            f"Phone: {p.get('phone', '')}\n"
+            f"Submitted: {submitted}\n\n"
+            f"Goals:\n{p.get('goals', '')}\n\n"
+            f"Notes:\n{p.get('notes', '')}\n"
+        )
+        return msg
+
+    def send(self, event: Event) -> None:
+        msg = self.message(event)
+        rejected: Optional[Exception] = None
+        with self.pool.connection() as smtp:
+            try:
+                smtp.send_message(msg)
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException) as e:
+                # smtplib has already sent RSET, so the session stays usable
+                rejected = e
+        if isinstance(rejected, smtplib.SMTPRecipientsRefused):
+            raise PermanentError(f"recipients refused: {list(rejected.recipients)}") from rejected
+        if isinstance(rejected, smtplib.SMTPResponseException):
+            if 500 <= rejected.smtp_code < 600:
+                raise PermanentError(f"SMTP {rejected.smtp_code}: {rejected.smtp_error!r}") from rejected
+            raise rejected
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+def _quit(smtp: smtplib.SMTP) -> None:
+    try:
+        smtp.quit()
+    finally:
+        smtp.close()
+
+
+# ---------- Webhook ----------
+
+
+class WebhookChannel:
+    """
+    POSTs the event as JSON over kept-alive connections. With a secret the
+    body is signed (``X-Thrive-Signature: sha256=<hmac>``); ``Idempotency-Key``
+    lets the receiver ignore a retry of something it already took.
+    """
+
+    name = "webhook"
+
+    def __init__(self, url: str, secret: str = "", timeout: float = 10.0) -> None:
+        import http.client
+
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"unsupported webhook URL {url!r}")
+        self.url = url
+        self.secret = secret
+        self.timeout = timeout
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        host, port = parts.hostname, parts.port
+        self.pool: _Pool[http.client.HTTPConnection] = _Pool(
+            lambda: conn_cls(host, port, timeout=timeout), lambda c: c.close()
+        )
+
+    def send(self, event: Event) -> None:
+        body = json.dumps(
+            {"event": event.kind, "key": event.key, "created": event.created, "data": event.payload},
+            ensure_ascii=False,
+            default=str,
+        ).encode("utf-8")
+        headers = {
+            "Content-Type": "application/json",
+            "Idempotency-Key": event.key,
+            "User-Agent": "ThriveNotify/1.0",
+        }
+        if self.secret:
+            digest = hmac.new(self.secret.encode(), body, hashlib.sha256).hexdigest()
+            headers["X-Thrive-Signature"] = f"sha256={digest}"
+        with self.pool.connection() as conn:
+            conn.request("POST", self.path, body=body, headers=headers)
+            resp = conn.getresponse()
+            resp.read()  # drain so the connection can be reused
+            if resp.will_close:
+                conn.close()  # http.client reconnects on the next request
+        if 200 <= resp.status < 300:
+            return
+        if 400 <= resp.status < 500 and resp.status not in (408, 429):
+            raise PermanentError(f"webhook returned {resp.status}")
+        raise RuntimeError(f"webhook returned {resp.status}")
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+# ---------- Dispatcher ----------
+
+
+@dataclass(order=True)
+class _Delivery:
+    due: float  # monotonic
+    seq: int
+    channel: Channel = field(compare=False)
+    event: Event = field(compare=False)
+    attempt: int = field(default=1, compare=False)
+
+
+class NotificationDispatcher:
+    def __init__(
+        self,
+        channels: List[Channel],
+        workers: int = 4,
+        queue_size: int = 1000,
+        max_attempts: int = 5,
+        base_delay: float = 2.0,
+        max_delay: float = 300.0,
+    ) -> None:
+        self.channels = channels
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.counts: Dict[str, int] = {"sent": 0, "retried": 0, "failed": 0, "dropped": 0}
+        self._queue: "queue.Queue[Optional[_Delivery]]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._outstanding = 0  # accepted deliveries not yet sent or given up on
+        self._delayed: List[_Delivery] = []
+        self._wake = threading.Condition(self._lock)
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._work, name=f"notify-{i}", daemon=True) for i in range(workers)
+        ]
+        self._threads.append(threading.Thread(target=self._schedule, name="notify-retry", daemon=True))
+        for t in self._threads:
+            t.start()
+
+    def _count(self, what: str, done: bool = False) -> None:
+        with self._lock:
+            self.counts[what] += 1
+            if done:
+                self._outstanding -= 1
+
+    def submit(self, event: Event) -> bool:
+        """Queue ``event`` for every channel without blocking; ``False`` if any delivery was dropped."""
+        ok = True
+        for channel in self.channels:
+            with self._lock:
+                self._seq += 1
+                self._outstanding += 1
+                delivery = _Delivery(0.0, self._seq, channel, event)
+            try:
+                self._queue.put_nowait(delivery)
+            except queue.Full:
+                logger.error("Notification queue full; dropped %s %s for %s.", channel.name, event.kind, event.key)
+                self._count("dropped", done=True)
+                ok = False
+        return ok
+
+    def _work(self) -> None:
+        while True:
+            delivery = self._queue.get()
+            if delivery is None:
+                return
+            try:
+                with timed(f"notify.{delivery.channel.name}"):
+                    delivery.channel.send(delivery.event)
+            except Exception as e:
+                self._failed(delivery, e)
+            else:
+                self._count("sent", done=True)
+
+    def _failed(self, d: _Delivery, error: Exception) -> None:
+        if isinstance(error, PermanentError) or d.attempt >= self.max_attempts:
+            logger.error(
+                "%s notification %s gave up after %d attempt(s): %s", d.channel.name, d.event.key, d.attempt, error
+            )
+            self._count("failed", done=True)
+            return
+        delay = min(self.base_delay * 2 ** (d.attempt - 1), self.max_delay)
+        delay += random.uniform(0, delay / 2)
+        logger.warning(
+            "%s notification %s failed (attempt %d); retrying in %.1fs: %s",
+            d.channel.name,
+            d.event.key,
+            d.attempt,
+            delay,
+            error,
+        )
+        with self._wake:
+            self.counts["retried"] += 1
+            d.due = time.monotonic() + delay
+            d.attempt += 1
+            heapq.heappush(self._delayed, d)
+            self._wake.notify()
+
+    def _schedule(self) -> None:
+        """Move retries whose backoff has elapsed back onto the work queue."""
+        with self._wake:
+            while not self._closed:
+                now = time.monotonic()
+                while self._delayed and self._delayed[0].due <= now:
+                    d = heapq.heappop(self._delayed)
+                    try:
+                        self._queue.put_nowait(d)
+                    except queue.Full:
+                        d.due = now + self.base_delay
+                        heapq.heappush(self._delayed, d)
+                        break
+                timeout = self._delayed[0].due - now if self._delayed else None
+                self._wake.wait(timeout)
+
+    def pending(self) -> int:
+        """Deliveries queued, in flight or waiting to retry."""
+        with self._lock:
+            return self._outstanding
+
+    def drain(self, timeout: float = 30.0) -> bool:
+        """Wait until every accepted delivery is sent or given up on (scripts and tests)."""
+        deadline = time.monotonic() + timeout
+        while self.pending():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.02)
+        return True
+
+    def close(self) -> None:
+        """Stop after the queued deliveries; pending retries are abandoned."""
+        with self._wake:
+            self._closed = True
+            abandoned = len(self._delayed)
+            self._delayed.clear()
+            self._outstanding -= abandoned
+            self._wake.notify()
+        if abandoned:
+            logger.warning("Notification dispatcher closed with %d retries pending.", abandoned)
+        for _ in range(len(self._threads) - 1):
+            self._queue.put(None)
+        for channel in self.channels:
+            channel.close()
+
+
+def build_channels(s: Settings) -> List[Channel]:
+    channels: List[Channel] = []
+    if s.notify_email_to and s.smtp_host:
+        channels.append(
+            EmailChannel(
+                s.smtp_host,
+                s.smtp_port,
+                s.smtp_from or s.smtp_username or f"noreply@{s.smtp_host}",
+                s.notify_email_to,
+                username=s.smtp_username,
+                password=s.smtp_password,
+                starttls=s.smtp_starttls,
+                brand=s.brand_name,
+            )
+        )
+    elif s.notify_email_to:
+        logger.warning("NOTIFY_EMAIL_TO is set but SMTP_HOST is not; email notifications are off.")
+    if s.notify_webhook_url:
+        try:
+            channels.append(WebhookChannel(s.notify_webhook_url, s.notify_webhook_secret))
+        except ValueError as e:
+            logger.warning("NOTIFY_WEBHOOK_URL ignored: %s", e)
+    return channels
+
+
+_dispatcher_lock = threading.Lock()
+_dispatcher: Optional[NotificationDispatcher] = None
+_dispatcher_config: Tuple[Any, ...] = ()
+
+
+def get_dispatcher() -> Optional[NotificationDispatcher]:
+    """Process-wide dispatcher for the configured channels, or ``None`` when none are."""
+    global _dispatcher, _dispatcher_config
+    s = get_settings()
+    config = (
+        s.notify_email_to,
+        s.notify_webhook_url,
+        s.notify_webhook_secret,
+        s.notify_workers,
+        s.notify_max_attempts,
+        s.smtp_host,
+        s.smtp_port,
+        s.smtp_username,
+        s.smtp_password,
+        s.smtp_starttls,
+        s.smtp_from,
+    )
+    with _dispatcher_lock:
+        if config != _dispatcher_config:  # rebuilt when the notification secrets are edited
+            old = _dispatcher
+            channels = build_channels(s)
+            _dispatcher = (
+                NotificationDispatcher(channels, workers=s.notify_workers, max_attempts=s.notify_max_attempts)
+                if channels
+                else None
+            )
+            _dispatcher_config = config
+            if old is not None:
+                # Closing waits on its queue; keep that off the script thread
+                threading.Thread(target=old.close, name="notify-close", daemon=True).start()
+        return _dispatcher
+
+
+def notify_inquiry(data: InquiryData) -> None:
+    """Hand a saved inquiry to the dispatcher; a no-op when notifications are off."""
+    try:
+        dispatcher = get_dispatcher()
+        if dispatcher is not None:
+            dispatcher.submit(inquiry_event(data))
+    except Exception:
+        # The inquiry is already saved; a notification problem must not surface to the visitor
+        logger.exception("Could not queue inquiry notification.")
@@ -0,0 +1,327 @@
+"""
+Static export of the marketing pages (home, About, Services).
+
+    python -m services.prerender --out dist
+
+Writes ``index.html``, ``about.html`` and ``services.html`` with real
+``<head>`` metadata, plus content-fingerprinted copies of the stylesheet,
+logo and gallery images under ``assets/`` (safe to cache forever). Any CDN
+or plain file server can host the result; links to Schedule and Inquiry
+point at the Streamlit app (``APP_URL`` in secrets). Canonical URLs are
+emitted when ``SITE_URL`` is set. Re-exporting into the same directory
+replaces only the previous export's files; any other non-empty directory
+is refused unless ``--clean`` is given.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import html
+import importlib.util
+import json
+import re
+import shutil
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from components.feature_cards import feature_cards_html
+from components.fragments import fragment
+from components.hero import hero_html
+from services.assets import load_stylesheet
+from services.catalog import load_catalog
+from services.gallery_manifest import load_manifest
+from services.images import VARIANT_WIDTHS, variant_for
+from services.instagram import load_posts
+from services.seo import meta_tags
+from services.settings import get_settings
+
+ROOT = Path(__file__).resolve().parent.parent
+INTERACTIVE_PAGES = {"03_Schedule": "Schedule", "04_Inquiry": "Inquiry"}
+
+
+def _load_page(name: str) -> ModuleType:
+    path = ROOT / "pages" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(f"_prerender_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module
+
+
+_INLINE = [
+    (re.compile(r"\*\*(.+?)\*\*"), r"<strong>\1</strong>"),
+    (re.compile(r"\*(.+?)\*"), r"<em>\1</em>"),
+    (re.compile(r"`(.+?)`"), r"<code>\1</code>"),
+]
+
+
+def markdown_html(text: str) -> str:
+    """The small Markdown subset the page copy uses: paragraphs, bullets, bold, italics, code."""
+
+    def inline(s: str) -> str:
+        s = html.escape(s, quote=False)
+        for pattern, repl in _INLINE:
+            s = pattern.sub(repl, s)
+        return s
+
+    blocks = []
+    for block in re.split(r"\n\s*\n", text.strip()):
+        lines = block.splitlines()
+        if all(line.lstrip().startswith("- ") for line in lines):
+            items = "".join(f"<li>{inline(line.strip()[2:].strip())}</li>" for line in lines)
+            blocks.append(f"<ul>{items}</ul>")
+        else:
+            blocks.append(f"<p>{'<br>'.join(inline(line.strip()) for line in lines)}</p>")
+    return "\n".join(blocks)
+
+
+class AssetWriter:
+    """Copies files into ``out/assets`` under content-hashed names, once each."""
+
+    def __init__(self, out_dir: Path) -> None:
+        self.out_dir = out_dir
+        self.manifest: Dict[str, str] = {}
+
+    def url(self, src: Path, data: Optional[bytes] = None) -> str:
+        """Fingerprinted URL for ``src``; ``data`` overrides the file contents (e.g. minified)."""
+        key = str(src)
+        if key in self.manifest:
+            return self.manifest[key]
+        data = src.read_bytes() if data is None else data
+        digest = hashlib.sha256(data).hexdigest()[:10]
+        rel = f"assets/{src.stem}.{digest}{src.suffix}"
+        dest = self.out_dir / rel
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(data)
+        self.manifest[key] = rel
+        return rel
+
+
+class Site:
+    def __init__(self, out_dir: Path, app_url: str, site_url: str) -> None:
+        self.out_dir = out_dir
+        self.app_url = app_url.rstrip("/")
+        self.site_url = site_url.rstrip("/")
+        self.assets = AssetWriter(out_dir)
+        self.app = _load_app()
+
+    def href(self, target: str) -> str:
+        if target in INTERACTIVE_PAGES:
+            return f"{self.app_url}/{INTERACTIVE_PAGES[target]}"
+        return target
+
+    def _css_link(self) -> str:
+        """Critical rules inline, the full minified sheet as a fingerprinted file."""
+        css = ROOT / "assets" / "styles.css"
+        sheet = load_stylesheet(css)
+        if not sheet.minified:
+            return ""
+        href = self.assets.url(css, sheet.minified.encode("utf-8"))
+        return f'{sheet.critical_tag}\n<link rel="stylesheet" href="{href}">'
+
+    def _header(self) -> str:
+        app = self.app
+        logo = ROOT / "assets" / "logo.png"
+        logo_tag = f'<img class="logo" src="{self.assets.url(logo)}" alt="" width="64">' if logo.exists() else ""
+        nav = [
+            ("index.html", "Home"),
+            ("about.html", "About"),
+            ("services.html", "Services"),
+            (self.href("03_Schedule"), "Schedule"),
+            (self.href("04_Inquiry"), "Inquiry"),
+        ]
+        links = "".join(f'<a href="{html.escape(h)}">{html.escape(t)}</a>' for h, t in nav)
+        return f"""
+<header class="site-header">
+  <a href="index.html">{logo_tag}</a>
+  {fragment("brand_title", brand=app.BRAND_NAME, tagline=app.TAGLINE)}
+  <nav>{links}</nav>
+</header>"""
+
+    def write(self, filename: str, title: str, description: str, body: str) -> Path:
+        canonical = f"{self.site_url}/{filename}" if self.site_url else None
+        head = meta_tags(title, description, None, self.app.HEX_PRIMARY, canonical)
+        doc = f"""<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(title)}</title>
+{head}
+{self._css_link()}
+</head>
+<body>
+{self._header()}
+<main>
+{body}
+</main>
+</body>
+</html>
+"""
+        out = self.out_dir / filename
+        out.write_text(doc, encoding="utf-8")
+        return out
+
+    # ---- pages ----
+
+    def _image_tag(self, src: Path, alt: str, color: str, width: int, height: int) -> str:
+        urls: List[Tuple[int, str]] = []
+        for w in VARIANT_WIDTHS:
+            variant = variant_for(src, w, dpr=1.0)
+            if variant != src:
+                urls.append((w, self.assets.url(variant)))
+        if not urls:
+            urls = [(width, self.assets.url(src))]
+        srcset = ", ".join(f"{u} {w}w" for w, u in urls) if len(urls) > 1 else ""
+        dims = f' width="{width}" height="{height}"' if width and height else ""
+        srcset_attr = f' srcset="{srcset}" sizes="(min-width: 900px) 25vw, 50vw"' if srcset else ""
+        return (
+            f'<img src="{urls[0][1]}"{srcset_attr}{dims} alt="{html.escape(alt)}" loading="lazy" '
+            f'decoding="async" style="background:{html.escape(color)};width:100%;height:auto;">'
+        )
+
+    def home(self) -> Path:
+        app = self.app
+        hero = dict(app.HERO)
+        hero["primary_cta_href"] = self.href(hero["primary_cta_href"])
+        hero["secondary_cta_href"] = self.href(hero["secondary_cta_href"])
+        insta_url = app._instagram_url_from_handle(app.INSTAGRAM_HANDLE)
+        parts = [hero_html(**hero), app.social_badge_html(insta_url, app.INSTAGRAM_HANDLE)]
+
+        posts = load_posts(app.INSTAGRAM_POST_URLS[:3])
+        if posts:
+            cards = []
+            for p in posts:
+                thumb = p.thumbnail_path
+                img = self._image_tag(thumb, p.caption[:80], "#E8E4DE", 0, 0) if thumb else ""
+                caption = html.escape(p.caption[:140])
+                cards.append(
+                    f'<a class="ig-card" href="{html.escape(p.permalink)}" target="_blank" rel="noopener">'
+                    f"{img}<span>{caption or 'View on Instagram'}</span></a>"
+                )
+            parts.append(f'<section class="ig-cards">{"".join(cards)}</section>')
+
+        method = "".join(
+            f"<div><h3>{html.escape(h)}</h3><p>{html.escape(t)}</p></div>" for h, t in app.METHODOLOGY
+        )
+        parts.append(f'<section class="methodology">{method}</section>')
+        parts.append(feature_cards_html())
+
+        images_dir = ROOT / "assets" / "images"
+        tiles = "".join(
+            f"<figure>{self._image_tag(images_dir / e.name, e.name, e.color, e.width, e.height)}</figure>"
+            for e in load_manifest(images_dir)
+        )
+        if tiles:
+            parts.append(f'<section class="gallery"><h3>Gallery</h3><div class="gallery-grid">{tiles}</div></section>')
+        parts.append(app.footer_html(app.BRAND_NAME, app.CITY_REGION, insta_url))
+        return self.write(
+            "index.html", f"{app.BRAND_NAME} — {app.TAGLINE}", app.HOME_DESCRIPTION, "\n".join(parts)
+        )
+
+    def about(self) -> Path:
+        about = _load_page("01_About")
+        body = f"""
+<h2>About</h2>
+{markdown_html(about.ABOUT_BIO)}
+<h3>Who this is for</h3>
+{markdown_html(about.ABOUT_AUDIENCE)}"""
+        return self.write("about.html", f"About — {self.app.BRAND_NAME}", about.ABOUT_DESCRIPTION, body)
+
+    def services(self) -> Path:
+        svc_page = _load_page("02_Services")
+        cards = []
+        for svc in load_catalog(ROOT / "data" / "services.json"):
+            meta = " • ".join(
+                f"<strong>{label}</strong>: {html.escape(value)}"
+                for label, value in (("Session", svc.session_length), ("Delivery", svc.delivery_type))
+                if value
+            )
+            cards.append(
+                f'<article class="service"><h3>{html.escape(svc.title)}</h3><p>{html.escape(svc.blurb)}</p>'
+                f'{f"<p class=caption>{meta}</p>" if meta else ""}'
+                f'<p><a class="btn btn-primary" href="{self.href("03_Schedule")}">Schedule</a> '
+                f'<a class="btn btn-secondary" href="{self.href("04_Inquiry")}">Send Inquiry</a></p></article>'
+            )
+        body = f"""
+<h2>Services</h2>
+<p class="caption">Select a service to begin. Pricing is available upon request.</p>
+<div class="service-grid">{"".join(cards)}</div>"""
+        return self.write("services.html", f"Services — {self.app.BRAND_NAME}", svc_page.SERVICES_DESCRIPTION, body)
+
+
+def _load_app() -> ModuleType:
+    import app  # root module; main() only runs under __main__
+
+    return app
+
+
+MANIFEST_NAME = "asset-manifest.json"
+PAGE_FILES = ("index.html", "about.html", "services.html")
+
+
+class ExportDirError(RuntimeError):
+    """The output directory holds files this export didn't write."""
+
+
+def _remove_previous(out_dir: Path) -> None:
+    """Delete what an earlier export wrote (its pages, manifest and listed assets), nothing else."""
+    manifest = out_dir / MANIFEST_NAME
+    try:
+        previous: Dict[str, str] = json.loads(manifest.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = {}
+    root = out_dir.resolve()
+    for rel in [*previous.values(), *PAGE_FILES]:
+        target = (out_dir / rel).resolve()
+        if root in target.parents:  # never follow a manifest entry out of the export
+            target.unlink(missing_ok=True)
+    manifest.unlink(missing_ok=True)
+
+
+def export(out_dir: Path, app_url: str = "", site_url: str = "", clean: bool = False) -> Sequence[Path]:
+    """
+    Write the static site to ``out_dir``. Files from a previous export there
+    are replaced; a non-empty directory without one is refused unless
+    ``clean`` (which deletes everything in it first).
+    """
+    if out_dir.exists() and any(out_dir.iterdir()):
+        if clean:
+            shutil.rmtree(out_dir)
+        elif (out_dir / MANIFEST_NAME).exists():
+            _remove_previous(out_dir)
+        else:
+            raise ExportDirError(
+                f"{out_dir} is not empty and holds no previous export ({MANIFEST_NAME}); "
+                "pick another --out, or pass --clean to delete its contents"
+            )
+    out_dir.mkdir(parents=True, exist_ok=True)
+    site = Site(out_dir, app_url, site_url)
+    pages = [site.home(), site.about(), site.services()]
+    (out_dir / MANIFEST_NAME).write_text(json.dumps(site.assets.manifest, indent=2), encoding="utf-8")
+    return pages
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Prerender the marketing pages to static HTML.")
+    ap.add_argument("--out", type=Path, default=Path("dist"))
+    ap.add_argument("--app-url", default=None, help="Streamlit app base URL (default: APP_URL secret)")
+    ap.add_argument("--site-url", default=None, help="public URL of the export (default: SITE_URL secret)")
+    ap.add_argument("--clean", action="store_true", help="delete everything in --out first, not just a previous export")
+    args = ap.parse_args(argv)
+    settings = get_settings()
+    app_url = settings.app_url if args.app_url is None else args.app_url
+    site_url = settings.site_url if args.site_url is None else args.site_url
+    try:
+        pages = export(args.out, app_url, site_url, clean=args.clean)
+    except ExportDirError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    for path in pages:
+        print(f"wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
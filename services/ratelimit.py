@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+import streamlit as st
+
+from services import metrics
+from services.settings import get_settings
+
+
+class BucketStore(Protocol):
+    def take(self, key: str, rate: float, burst: float, now: float) -> bool: ...
+
+    def refund(self, key: str, burst: float) -> None: ...
+
+
+class MemoryBucketStore(BucketStore):
+    """
+    Token buckets for one process, kept in an LRU-bounded map.
+
+    Each entry is ``(tokens, last_update)``; an evicted client simply comes
+    back with a full bucket, which is the same state an idle one refills to.
+    """
+
+    def __init__(self, max_keys: int = 10_000) -> None:
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def take(self, key: str, rate: float, burst: float, now: float) -> bool:
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            ok = tokens >= 1.0
+            if ok:
+                tokens -= 1.0
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return ok
+
+    def refund(self, key: str, burst: float) -> None:
+        with self._lock:
+            if key in self._buckets:
+                tokens, updated = self._buckets[key]
+                self._buckets[key] = (min(burst, tokens + 1.0), updated)
+
+
+class SQLiteBucketStore(BucketStore):
+    """
+    Token buckets shared by every process on the host through a SQLite file.
+
+    Rows idle long enough to have refilled are pruned, which keeps the table
+    bounded by the number of recently active clients.
+    """
+
+    def __init__(self, path: Path, prune_every: int = 1000) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self.prune_every = prune_every
+        self._ops = 0
+
+    def take(self, key: str, rate: float, burst: float, now: float) -> bool:
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+                tokens, updated = row if row else (burst, now)
+                tokens = min(burst, tokens + (now - updated) * rate)
+                ok = tokens >= 1.0
+                if ok:
+                    tokens -= 1.0
+                conn.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)", (key, tokens, now))
+                self._ops += 1
+                if self._ops % self.prune_every == 0:
+                    # A bucket idle for an hour is full for any sane rate; forget it.
+                    conn.execute("DELETE FROM buckets WHERE updated < ?", (now - 3600.0,))
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return ok
+
+    def refund(self, key: str, burst: float) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE buckets SET tokens = MIN(?, tokens + 1.0) WHERE key = ?", (burst, key))
+
+
+class RateLimiter:
+    """
+    Per-client plus global token-bucket limiter shared by all sessions in a process.
+
+    Rates are in requests per second. A request must pass its client bucket
+    and then the global one; a token taken from the client bucket is given
+    back when the global bucket rejects.
+    """
+
+    GLOBAL_KEY = "__global__"
+
+    def __init__(
+        self,
+        client_rate: float,
+        client_burst: float,
+        global_rate: float,
+        global_burst: float,
+        store: Optional[BucketStore] = None,
+    ) -> None:
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.global_rate = global_rate
+        self.global_burst = global_burst
+        self.store: BucketStore = store or MemoryBucketStore()
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = {"allowed": 0, "rejected_client": 0, "rejected_global": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def allow(self, client: str, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        key = f"c:{client}"
+        if not self.store.take(key, self.client_rate, self.client_burst, now):
+            self._count("rejected_client")
+            return False
+        if not self.store.take(self.GLOBAL_KEY, self.global_rate, self.global_burst, now):
+            self.store.refund(key, self.client_burst)
+            self._count("rejected_global")
+            return False
+        self._count("allowed")
+        return True
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+
+def client_key() -> str:
+    """
+    Best-effort client identity: proxy header, then peer IP, then session id.
+
+    Clients can send any ``X-Forwarded-For`` they like, so only the entries
+    appended by our own proxies count: with ``TRUSTED_PROXY_HOPS = n`` the
+    client is the n-th address from the right.
+    """
+    try:
+        hops = get_settings().trusted_proxy_hops
+        forwarded = [a.strip() for a in st.context.headers.get("X-Forwarded-For", "").split(",") if a.strip()]
+        if hops and forwarded:
+            return forwarded[-min(hops, len(forwarded))]
+        ip = getattr(st.context, "ip_address", None)
+        if ip:
+            return str(ip)
+    except Exception:
+        pass
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx()
+        if ctx is not None:
+            return f"session:{ctx.session_id}"
+    except Exception:
+        pass
+    return "anonymous"
+
+
+_limiter_lock = threading.Lock()
+_limiter: Optional[RateLimiter] = None
+_limiter_config: Tuple[Any, ...] = ()
+
+
+def get_limiter() -> RateLimiter:
+    """
+    Process-wide inquiry limiter configured from secrets.
+
+    Secrets (optional):
+      - RATE_LIMIT_CLIENT_PER_MIN (default 10) / RATE_LIMIT_CLIENT_BURST (default 1)
+      - RATE_LIMIT_GLOBAL_PER_MIN (default 120) / RATE_LIMIT_GLOBAL_BURST (default 30)
+      - RATE_LIMIT_DB: SQLite path to share buckets across processes on the host;
+        defaults to SHARED_CACHE_PATH when that is set
+    """
+    global _limiter, _limiter_config
+    s = get_settings()
+    config = (
+        s.rate_limit_client_per_min,
+        s.rate_limit_client_burst,
+        s.rate_limit_global_per_min,
+        s.rate_limit_global_burst,
+        s.rate_limit_db or s.shared_cache_path,
+    )
+    with _limiter_lock:
+        if _limiter is None or config != _limiter_config:  # rebuilt when the limits are edited
+            previous = _limiter.snapshot() if _limiter is not None else {}
+            _limiter = RateLimiter(
+                client_rate=s.rate_limit_client_per_min / 60.0,
+                client_burst=s.rate_limit_client_burst,
+                global_rate=s.rate_limit_global_per_min / 60.0,
+                global_burst=s.rate_limit_global_burst,
+                store=SQLiteBucketStore(Path(config[-1])) if config[-1] else None,
+            )
+            _limiter.counters.update(previous)  # keep the exported counters monotonic
+            _limiter_config = config
+        return _limiter
+
+
+def current_limiter() -> Optional[RateLimiter]:
+    """The process limiter if a page has built one; unlike ``get_limiter`` this never creates it."""
+    return _limiter
+
+
+def _metric_lines() -> List[str]:
+    limiter = _limiter
+    if limiter is None:
+        return []
+    lines = [
+        "# HELP thrive_ratelimit_total Inquiry rate-limit decisions by result.",
+        "# TYPE thrive_ratelimit_total counter",
+    ]
+    lines += [f'thrive_ratelimit_total{{result="{k}"}} {n}' for k, n in limiter.snapshot().items()]
+    return lines
+
+
+metrics.add_collector(_metric_lines)
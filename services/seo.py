@@ -5,23 +5,43 @@ from typing import Optional
 
 import streamlit as st
 
+from services.metrics import instrument
 
+
+def meta_tags(
+    title: str,
+    description: str,
+    image_url: Optional[str] = None,
+    theme_color: str = "#0F1115",
+    canonical_url: Optional[str] = None,
+) -> str:
+    """Description, Open Graph and theme-color tags, escaped."""
+    desc = html.escape(description[:300])
+    tags = [
+        f'<meta name="description" content="{desc}">',
+        f'<meta property="og:title" content="{html.escape(title)}">',
+        f'<meta property="og:description" content="{desc}">',
+    ]
+    if image_url:
+        tags.append(f'<meta property="og:image" content="{html.escape(image_url)}"/>')
+    if canonical_url:
+        tags.append(f'<meta property="og:url" content="{html.escape(canonical_url)}">')
+        tags.append(f'<link rel="canonical" href="{html.escape(canonical_url)}">')
+    tags.append(f'<meta name="theme-color" content="{html.escape(theme_color)}">')
+    return "\n".join(tags)
+
+
+@instrument("seo")
 def inject_seo(
     title: str,
     description: str,
     image_url: Optional[str] = None,
     theme_color: str = "#0F1115",
 ) -> None:
-    """Inject basic meta tags into Streamlit via HTML."""
-    desc = html.escape(description[:300])
-    img_tag = f'<meta property="og:image" content="{image_url}"/>' if image_url else ""
-    st.markdown(
-        f"""
-        <meta name="description" content="{desc}">
-        <meta property="og:title" content="{html.escape(title)}">
-        <meta property="og:description" content="{desc}">
-        {img_tag}
-        <meta name="theme-color" content="{theme_color}">
-        """,
-        unsafe_allow_html=True,
-    )
+    """
+    Inject basic meta tags into Streamlit via HTML.
+
+    Streamlit can only place these in the body; the static export
+    (``services.prerender``) puts the same tags in a real ``<head>``.
+    """
+    st.markdown(meta_tags(title, description, image_url, theme_color), unsafe_allow_html=True)
@@ -0,0 +1,292 @@
+"""
+Typed application settings, read from ``st.secrets`` once per file version.
+
+``get_settings()`` returns a frozen ``Settings`` shared by every session.
+Values are converted and validated when the secrets are loaded (bad values
+fall back to their defaults and are listed in ``Settings.problems``), and
+the service-account JSON is parsed at the same time rather than on each
+save. ``secrets.toml`` is re-stat'ed at most once per ``RECHECK_SECONDS``;
+when it changes, or ``invalidate_settings()`` runs in any process sharing
+the host cache, the next call builds a fresh object.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, FrozenSet, Mapping, Optional, Tuple
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+SECRETS_FILES = (Path.home() / ".streamlit" / "secrets.toml", Path(".streamlit") / "secrets.toml")
+RECHECK_SECONDS = 1.0
+STORAGE_BACKENDS = ("sheets", "sqlite")
+AVAILABILITY_PROVIDERS = ("", "ics", "json", "local")
+_HEX_RE = re.compile(r"^#(?:[0-9a-fA-F]{3}){1,2}$")
+
+
+def parse_service_account(raw: Any) -> Optional[Mapping[str, Any]]:
+    """Service-account info from inline JSON or a TOML table; ``None`` when unset."""
+    if not raw:
+        return None
+    info = json.loads(raw) if isinstance(raw, (str, bytes)) else dict(raw)
+    if not isinstance(info, dict):
+        raise ValueError("expected a JSON object")
+    return MappingProxyType(info)
+
+
+@dataclass(frozen=True)
+class Settings:
+    # Brand
+    brand_name: str = "Thrive with Frida"
+    tagline: str = "Simplicity in Motion"
+    instagram_handle: str = "@thrivewfrida"
+    hex_primary: str = "#0F1115"
+    hex_accent: str = "#C7A97B"
+    city_region: str = ""
+    instagram_post_urls: Tuple[str, ...] = ()
+    instagram_oembed_token: str = ""
+    scheduling_embed_url: str = ""
+    scheduling_booking_url: str = ""  # may contain {start}, {date}, {time}
+    scheduling_timezone: str = "UTC"
+    availability_provider: str = ""  # "", "ics", "json" or "local"
+    availability_url: str = ""
+    availability_ttl: float = 300.0
+    app_url: str = ""
+    site_url: str = ""
+    # Storage
+    storage_backend: str = "sheets"
+    sheets_mirror: bool = False
+    google_sheet_name: str = "ThriveWFrida_Inquiries"
+    google_service_account_json: str = field(default="", repr=False)
+    google_service_account: Optional[Mapping[str, Any]] = field(default=None, repr=False)
+    sqlite_path: Path = Path("data") / "inquiries.sqlite3"
+    inquiry_spool_path: Path = Path("data") / "inquiry_spool.sqlite3"
+    inquiry_mirror_path: Path = Path("data") / "inquiry_mirror.sqlite3"
+    # Abuse protection
+    rate_limit_client_per_min: float = 10.0
+    rate_limit_client_burst: float = 1.0
+    rate_limit_global_per_min: float = 120.0
+    rate_limit_global_burst: float = 30.0
+    rate_limit_db: str = ""  # defaults to shared_cache_path when that is set
+    trusted_proxy_hops: int = 1  # reverse proxies that append to X-Forwarded-For; 0 ignores the header
+    spam_blocked_domains: FrozenSet[str] = frozenset()
+    # Notifications
+    notify_email_to: Tuple[str, ...] = ()
+    notify_webhook_url: str = ""
+    notify_webhook_secret: str = field(default="", repr=False)
+    notify_workers: int = 4
+    notify_max_attempts: int = 5
+    smtp_host: str = ""
+    smtp_port: int = 587
+    smtp_username: str = ""
+    smtp_password: str = field(default="", repr=False)
+    smtp_starttls: bool = True
+    smtp_from: str = ""
+    # Shared by the processes on a host
+    shared_cache_path: str = ""
+    # Admin
+    admin_password: str = field(default="", repr=False)
+    metrics_port: int = 0
+
+    problems: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_secrets(cls, secrets: Mapping[str, Any]) -> "Settings":
+        defaults = cls()
+        problems = []
+
+        def text(key: str, default: str) -> str:
+            value = secrets.get(key, default)
+            return default if value is None else str(value).strip()
+
+        def number(key: str, default: float) -> float:
+            value = secrets.get(key, default)
+            try:
+                n = float(value)
+            except (TypeError, ValueError):
+                problems.append(f"{key}: expected a number, got {value!r}")
+                return default
+            if n < 0:
+                problems.append(f"{key}: must not be negative")
+                return default
+            return n
+
+        def color(key: str, default: str) -> str:
+            value = text(key, default)
+            if not _HEX_RE.match(value):
+                problems.append(f"{key}: expected a hex color like #C7A97B, got {value!r}")
+                return default
+            return value
+
+        def strings(key: str) -> Tuple[str, ...]:
+            value = secrets.get(key, ())
+            if isinstance(value, str):
+                value = [value]
+            return tuple(s for s in (str(v).strip() for v in value or ()) if s)
+
+        backend = text("STORAGE_BACKEND", defaults.storage_backend).lower()
+        if backend not in STORAGE_BACKENDS:
+            problems.append(f"STORAGE_BACKEND: unknown backend {backend!r}; using Google Sheets")
+            backend = defaults.storage_backend
+
+        availability = text("AVAILABILITY_PROVIDER", "").lower()
+        if availability not in AVAILABILITY_PROVIDERS:
+            problems.append(f"AVAILABILITY_PROVIDER: unknown provider {availability!r}; slot picker disabled")
+            availability = ""
+        tz_name = text("SCHEDULING_TIMEZONE", defaults.scheduling_timezone) or defaults.scheduling_timezone
+        if tz_name.upper() != "UTC":
+            try:
+                from zoneinfo import ZoneInfo
+
+                ZoneInfo(tz_name)
+            except Exception:
+                problems.append(f"SCHEDULING_TIMEZONE: unknown time zone {tz_name!r}; using UTC")
+                tz_name = defaults.scheduling_timezone
+
+        booking_url = text("SCHEDULING_BOOKING_URL", "")
+        try:
+            booking_url.format(start="", date="", time="")
+        except (AttributeError, KeyError, IndexError, ValueError) as e:
+            problems.append(
+                "SCHEDULING_BOOKING_URL: only {start}, {date} and {time} may be used "
+                f"({e!r}); slots open the inquiry form instead"
+            )
+            booking_url = ""
+
+        raw_service = secrets.get("GOOGLE_SERVICE_ACCOUNT_JSON") or ""
+        try:
+            service = parse_service_account(raw_service)
+        except (ValueError, TypeError) as e:
+            problems.append(f"GOOGLE_SERVICE_ACCOUNT_JSON: not valid JSON ({e})")
+            service = None
+        if not isinstance(raw_service, str):  # TOML table; keep a string form as the pool key
+            raw_service = json.dumps(raw_service, sort_keys=True, default=str)
+
+        return cls(
+            brand_name=text("BRAND_NAME", defaults.brand_name),
+            tagline=text("TAGLINE", defaults.tagline),
+            instagram_handle=text("INSTAGRAM_HANDLE", defaults.instagram_handle),
+            hex_primary=color("HEX_PRIMARY", defaults.hex_primary),
+            hex_accent=color("HEX_ACCENT", defaults.hex_accent),
+            city_region=text("CITY_REGION", ""),
+            instagram_post_urls=strings("INSTAGRAM_POST_URLS"),
+            instagram_oembed_token=text("INSTAGRAM_OEMBED_TOKEN", ""),
+            scheduling_embed_url=text("SCHEDULING_EMBED_URL", ""),
+            scheduling_booking_url=booking_url,
+            scheduling_timezone=tz_name,
+            availability_provider=availability,
+            availability_url=text("AVAILABILITY_URL", ""),
+            availability_ttl=number("AVAILABILITY_TTL", defaults.availability_ttl),
+            app_url=text("APP_URL", ""),
+            site_url=text("SITE_URL", ""),
+            storage_backend=backend,
+            sheets_mirror=bool(secrets.get("SHEETS_MIRROR", False)),
+            google_sheet_name=text("GOOGLE_SHEET_NAME", defaults.google_sheet_name),
+            google_service_account_json=raw_service,
+            google_service_account=service,
+            sqlite_path=Path(text("SQLITE_PATH", str(defaults.sqlite_path))),
+            inquiry_spool_path=Path(text("INQUIRY_SPOOL_PATH", str(defaults.inquiry_spool_path))),
+            inquiry_mirror_path=Path(text("INQUIRY_MIRROR_PATH", str(defaults.inquiry_mirror_path))),
+            rate_limit_client_per_min=number("RATE_LIMIT_CLIENT_PER_MIN", defaults.rate_limit_client_per_min),
+            rate_limit_client_burst=number("RATE_LIMIT_CLIENT_BURST", defaults.rate_limit_client_burst),
+            rate_limit_global_per_min=number("RATE_LIMIT_GLOBAL_PER_MIN", defaults.rate_limit_global_per_min),
+            rate_limit_global_burst=number("RATE_LIMIT_GLOBAL_BURST", defaults.rate_limit_global_burst),
+            rate_limit_db=text("RATE_LIMIT_DB", ""),
+            trusted_proxy_hops=int(number("TRUSTED_PROXY_HOPS", defaults.trusted_proxy_hops)),
+            spam_blocked_domains=frozenset(d.lower() for d in strings("SPAM_BLOCKED_DOMAINS")),
+            notify_email_to=strings("NOTIFY_EMAIL_TO"),
+            notify_webhook_url=text("NOTIFY_WEBHOOK_URL", ""),
+            notify_webhook_secret=text("NOTIFY_WEBHOOK_SECRET", ""),
+            notify_workers=max(1, int(number("NOTIFY_WORKERS", defaults.notify_workers))),
+            notify_max_attempts=max(1, int(number("NOTIFY_MAX_ATTEMPTS", defaults.notify_max_attempts))),
+            smtp_host=text("SMTP_HOST", ""),
+            smtp_port=int(number("SMTP_PORT", defaults.smtp_port)),
+            smtp_username=text("SMTP_USERNAME", ""),
+            smtp_password=text("SMTP_PASSWORD", ""),
+            smtp_starttls=bool(secrets.get("SMTP_STARTTLS", defaults.smtp_starttls)),
+            smtp_from=text("SMTP_FROM", ""),
+            shared_cache_path=text("SHARED_CACHE_PATH", ""),
+            admin_password=text("ADMIN_PASSWORD", ""),
+            metrics_port=int(number("METRICS_PORT", 0)),
+            problems=tuple(problems),
+        )
+
+
+def _plain(value: Any) -> Any:
+    """Secrets sections are read-only mappings; turn them into plain dicts/lists."""
+    if isinstance(value, Mapping):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+def _read_secrets() -> Mapping[str, Any]:
+    try:
+        return {k: _plain(st.secrets[k]) for k in st.secrets}
+    except FileNotFoundError:  # no secrets.toml: run on defaults
+        return {}
+    except Exception:
+        logger.exception("Could not read secrets; using defaults.")
+        return {}
+
+
+def _secrets_version() -> Tuple[int, ...]:
+    version = []
+    for path in SECRETS_FILES:
+        try:
+            version.append(path.stat().st_mtime_ns)
+        except OSError:
+            version.append(-1)
+    # Bumped by invalidate_settings() in any process sharing the cache
+    from services.shared_cache import current_cache
+
+    cache = current_cache()
+    version.append(cache.generation("settings") if cache is not None else 0)
+    return tuple(version)
+
+
+_lock = threading.Lock()
+_current: Optional[Settings] = None
+_version: Tuple[int, ...] = ()
+_checked_at = 0.0
+
+
+def get_settings() -> Settings:
+    """Current settings; rebuilt only when a ``secrets.toml`` file changes."""
+    global _current, _version, _checked_at
+    now = time.monotonic()
+    if _current is not None and now - _checked_at < RECHECK_SECONDS:
+        return _current
+    with _lock:
+        _checked_at = now
+        version = _secrets_version()
+        if _current is None or version != _version:
+            _current = Settings.from_secrets(_read_secrets())
+            _version = version
+            for problem in _current.problems:
+                logger.warning("secrets: %s", problem)
+        return _current
+
+
+def reset_settings() -> None:
+    """Forget the cached settings (tests and scripts that swap ``st.secrets``)."""
+    global _current
+    with _lock:
+        _current = None
+
+
+def invalidate_settings() -> None:
+    """Make every process on the host re-read secrets, e.g. after a mounted file was swapped in place."""
+    from services.shared_cache import get_shared_cache
+
+    get_shared_cache().invalidate("settings")
+    reset_settings()
@@ -0,0 +1,393 @@
+"""
+Cache shared by every Streamlit process on a host, so replicas behind one
+load balancer build the catalog, gallery manifest and Instagram snapshot
+once per host rather than once each.
+
+    cache = get_shared_cache()
+    catalog = cache.get_or_set("catalog", str(path), build, valid=lambda v: v.mtime_ns == mtime)
+
+Values live in namespaces. Each entry may have a TTL, and
+``invalidate(ns)`` drops a whole namespace for every process: namespaces
+carry a generation number, and each process rechecks the generations it
+uses at most once per ``RECHECK_SECONDS``. Processes keep the values they
+read in a small in-memory layer, so a hit costs a dict lookup and the
+shared store is read only after a change. ``get_or_set`` takes a lease
+before computing, so when several processes miss at once one builds and
+the others wait for its result.
+
+Backends:
+
+- ``MemoryBackend``: this process only, used when ``SHARED_CACHE_PATH`` is unset
+- ``SQLiteBackend``: a WAL-mode SQLite file at ``SHARED_CACHE_PATH``; put it
+  under ``/dev/shm`` to keep it in shared memory
+
+The SQLite file holds pickles and must only be writable by the app.
+From a shell::
+
+    python -m services.shared_cache stats
+    python -m services.shared_cache invalidate settings catalog
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
+
+RECHECK_SECONDS = 1.0
+LEASE_SECONDS = 60.0
+MISSING: Any = object()
+
+
+class CacheBackend(Protocol):
+    def get(self, ns: str, key: str, now: float) -> Optional[Tuple[Any, float]]:
+        """``(value, expires)`` (0 = no expiry), or ``None`` when absent or expired."""
+        ...
+
+    def set(self, ns: str, key: str, value: Any, expires: float) -> None: ...
+
+    def add(self, ns: str, key: str, value: Any, expires: float, now: float) -> bool:
+        """Store only if absent or expired; ``True`` when stored."""
+        ...
+
+    def generation(self, ns: str) -> int: ...
+
+    def invalidate(self, ns: str) -> int: ...
+
+    def lease(self, ns: str, key: str, seconds: float, now: float) -> bool: ...
+
+    def release(self, ns: str, key: str) -> None: ...
+
+    def stats(self) -> Dict[str, int]: ...
+
+
+class MemoryBackend:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+        self._generations: Dict[str, int] = {}
+
+    def get(self, ns: str, key: str, now: float) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            hit = self._entries.get((ns, key))
+        if hit is None or (hit[1] and hit[1] <= now):
+            return None
+        return hit
+
+    def set(self, ns: str, key: str, value: Any, expires: float) -> None:
+        with self._lock:
+            self._entries[(ns, key)] = (value, expires)
+
+    def add(self, ns: str, key: str, value: Any, expires: float, now: float) -> bool:
+        with self._lock:
+            hit = self._entries.get((ns, key))
+            if hit is not None and not (hit[1] and hit[1] <= now):
+                return False
+            self._entries[(ns, key)] = (value, expires)
+            if len(self._entries) % 1000 == 0:
+                self._entries = {k: v for k, v in self._entries.items() if not (v[1] and v[1] <= now)}
+            return True
+
+    def generation(self, ns: str) -> int:
+        with self._lock:
+            return self._generations.get(ns, 0)
+
+    def invalidate(self, ns: str) -> int:
+        with self._lock:
+            self._entries = {k: v for k, v in self._entries.items() if k[0] != ns}
+            gen = self._generations[ns] = self._generations.get(ns, 0) + 1
+            return gen
+
+    def lease(self, ns: str, key: str, seconds: float, now: float) -> bool:
+        return True  # SharedCache already serializes builders within the process
+
+    def release(self, ns: str, key: str) -> None:
+        pass
+
+    def stats(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for ns, _ in self._entries:
+                counts[ns] = counts.get(ns, 0) + 1
+        return dict(sorted(counts.items()))
+
+
+class SQLiteBackend:
+    """One SQLite file per host; expired rows are pruned every ``prune_every`` writes."""
+
+    def __init__(self, path: Path, prune_every: int = 500) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.prune_every = prune_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # a cache: losing the last write to a crash is fine
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                ns TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, expires REAL NOT NULL,
+                PRIMARY KEY (ns, key)
+            );
+            CREATE TABLE IF NOT EXISTS generations (ns TEXT PRIMARY KEY, gen INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS leases (
+                ns TEXT NOT NULL, key TEXT NOT NULL, owner TEXT NOT NULL, expires REAL NOT NULL,
+                PRIMARY KEY (ns, key)
+            );
+            """
+        )
+        self._owner = f"{os.getpid()}:{id(self)}"
+
+    def _wrote(self, now: float) -> None:
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            self._conn.execute("DELETE FROM cache WHERE expires > 0 AND expires <= ?", (now,))
+
+    def get(self, ns: str, key: str, now: float) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires FROM cache WHERE ns = ? AND key = ? AND (expires = 0 OR expires > ?)",
+                (ns, key, now),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return pickle.loads(row[0]), row[1]
+        except Exception:
+            return None  # written by an incompatible version of the app; recompute
+
+    def set(self, ns: str, key: str, value: Any, expires: float) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (ns, key, value, expires) VALUES (?, ?, ?, ?)", (ns, key, blob, expires)
+            )
+            self._wrote(time.time())
+
+    def add(self, ns: str, key: str, value: Any, expires: float, now: float) -> bool:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            cur = self._conn.execute(
+                """
+                INSERT INTO cache (ns, key, value, expires) VALUES (?, ?, ?, ?)
+                ON CONFLICT (ns, key) DO UPDATE SET value = excluded.value, expires = excluded.expires
+                WHERE cache.expires > 0 AND cache.expires <= ?
+                """,
+                (ns, key, blob, expires, now),
+            )
+            self._wrote(now)
+            return cur.rowcount == 1
+
+    def generation(self, ns: str) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT gen FROM generations WHERE ns = ?", (ns,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def invalidate(self, ns: str) -> int:
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM cache WHERE ns = ?", (ns,))
+                conn.execute(
+                    "INSERT INTO generations (ns, gen) VALUES (?, 1) ON CONFLICT (ns) DO UPDATE SET gen = gen + 1",
+                    (ns,),
+                )
+                gen = conn.execute("SELECT gen FROM generations WHERE ns = ?", (ns,)).fetchone()[0]
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return int(gen)
+
+    def lease(self, ns: str, key: str, seconds: float, now: float) -> bool:
+        with self._lock:
+            cur = self._conn.execute(
+                """
+                INSERT INTO leases (ns, key, owner, expires) VALUES (?, ?, ?, ?)
+                ON CONFLICT (ns, key) DO UPDATE SET owner = excluded.owner, expires = excluded.expires
+                WHERE leases.expires <= ?
+                """,
+                (ns, key, self._owner, now + seconds, now),
+            )
+            return cur.rowcount == 1
+
+    def release(self, ns: str, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE ns = ? AND key = ? AND owner = ?", (ns, key, self._owner))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT ns, COUNT(*) FROM cache GROUP BY ns ORDER BY ns").fetchall()
+        return {ns: int(n) for ns, n in rows}
+
+
+class SharedCache:
+    """A ``CacheBackend`` behind a per-process layer of recently read values."""
+
+    def __init__(self, backend: CacheBackend, recheck: float = RECHECK_SECONDS, max_local: int = 512) -> None:
+        self.backend = backend
+        self.recheck = recheck
+        self.max_local = max_local
+        self._lock = threading.Lock()
+        self._local: "OrderedDict[Tuple[str, str], Tuple[int, float, Any]]" = OrderedDict()
+        self._generations: Dict[str, Tuple[float, int]] = {}
+        self._building: Dict[Tuple[str, str], threading.Lock] = {}
+
+    def generation(self, ns: str) -> int:
+        now = time.monotonic()
+        checked = self._generations.get(ns)
+        if checked is not None and now - checked[0] < self.recheck:
+            return checked[1]
+        gen = self.backend.generation(ns)
+        self._generations[ns] = (now, gen)
+        return gen
+
+    def get(self, ns: str, key: str) -> Any:
+        """The cached value, or ``MISSING``."""
+        gen = self.generation(ns)
+        now = time.time()
+        with self._lock:
+            hit = self._local.get((ns, key))
+            if hit is not None and hit[0] == gen and not (hit[1] and hit[1] <= now):
+                self._local.move_to_end((ns, key))
+                return hit[2]
+        stored = self.backend.get(ns, key, now)
+        if stored is None:
+            return MISSING
+        self._remember(ns, key, gen, stored[1], stored[0])
+        return stored[0]
+
+    def _remember(self, ns: str, key: str, gen: int, expires: float, value: Any) -> None:
+        with self._lock:
+            self._local[(ns, key)] = (gen, expires, value)
+            self._local.move_to_end((ns, key))
+            while len(self._local) > self.max_local:
+                self._local.popitem(last=False)
+
+    def set(self, ns: str, key: str, value: Any, ttl: float = 0.0) -> None:
+        expires = time.time() + ttl if ttl else 0.0
+        self.backend.set(ns, key, value, expires)
+        self._remember(ns, key, self.generation(ns), expires, value)
+
+    def add(self, ns: str, key: str, value: Any, ttl: float = 0.0) -> bool:
+        """Store unless a live entry exists, atomically across processes; ``True`` when stored."""
+        now = time.time()
+        return self.backend.add(ns, key, value, now + ttl if ttl else 0.0, now)
+
+    def get_or_set(
+        self,
+        ns: str,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: float = 0.0,
+        valid: Optional[Callable[[Any], bool]] = None,
+        wait: float = LEASE_SECONDS,
+    ) -> Any:
+        """
+        Cached value, or ``compute()`` stored under ``key``. A cached value
+        that fails ``valid`` (e.g. built from an older file) counts as a miss.
+        """
+
+        def lookup() -> Any:
+            value = self.get(ns, key)
+            return value if value is not MISSING and (valid is None or valid(value)) else MISSING
+
+        value = lookup()
+        if value is not MISSING:
+            return value
+        with self._lock:
+            building = self._building.setdefault((ns, key), threading.Lock())
+        with building:
+            value = lookup()  # another session of this process may have just built it
+            if value is not MISSING:
+                return value
+            deadline = time.monotonic() + wait
+            while not self.backend.lease(ns, key, wait, time.time()):
+                # Another process is building it; take its result when it lands
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(0.05)
+                with self._lock:
+                    self._local.pop((ns, key), None)
+                value = lookup()
+                if value is not MISSING:
+                    return value
+            try:
+                value = compute()
+                self.set(ns, key, value, ttl)
+            finally:
+                self.backend.release(ns, key)
+            return value
+
+    def invalidate(self, ns: str) -> int:
+        """Drop ``ns`` here now and in the other processes within ``recheck`` seconds."""
+        gen = self.backend.invalidate(ns)
+        with self._lock:
+            for k in [k for k in self._local if k[0] == ns]:
+                del self._local[k]
+        self._generations[ns] = (time.monotonic(), gen)
+        return gen
+
+
+_cache_lock = threading.Lock()
+_cache: Optional[SharedCache] = None
+_cache_path: Optional[str] = None
+
+
+def _build(path: str) -> SharedCache:
+    return SharedCache(SQLiteBackend(Path(path)) if path else MemoryBackend())
+
+
+def get_shared_cache() -> SharedCache:
+    """Process-wide cache on ``SHARED_CACHE_PATH``, or in memory when that is unset."""
+    global _cache, _cache_path
+    from services.settings import get_settings
+
+    path = get_settings().shared_cache_path
+    with _cache_lock:
+        if _cache is None or path != _cache_path:
+            _cache, _cache_path = _build(path), path
+        return _cache
+
+
+def current_cache() -> Optional[SharedCache]:
+    """The cache if one has been built, without reading settings (settings itself uses this)."""
+    return _cache
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Inspect or invalidate the shared cache.")
+    ap.add_argument("--path", help="cache file (default: SHARED_CACHE_PATH from secrets)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats", help="entries per namespace")
+    inv = sub.add_parser("invalidate", help="drop namespaces in every process")
+    inv.add_argument("namespaces", nargs="+")
+    args = ap.parse_args(argv)
+
+    if args.path is None:
+        from services.settings import get_settings
+
+        args.path = get_settings().shared_cache_path
+    if not args.path:
+        print("SHARED_CACHE_PATH is not set; each process has its own in-memory cache.", file=sys.stderr)
+        return 1
+    cache = _build(args.path)
+    if args.cmd == "stats":
+        for ns, n in cache.backend.stats().items():
+            print(f"{ns:<20} {n:>8}  gen={cache.backend.generation(ns)}")
+    else:
+        for ns in args.namespaces:
+            print(f"{ns}: generation {cache.invalidate(ns)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, FrozenSet, Iterable, List, Optional, Protocol, Tuple
+
+from components.forms import InquiryData
+from services.settings import get_settings
+from services.shared_cache import SharedCache, get_shared_cache
+
+BLOCK_THRESHOLD = 1.0
+MIN_FILL_SECONDS = 3.0
+RECENT_BODY_TTL = 24 * 3600.0
+LINK_RE = re.compile(r"https?://|www\.", re.IGNORECASE)
+DISPOSABLE_DOMAINS: FrozenSet[str] = frozenset(
+    {
+        "mailinator.com",
+        "guerrillamail.com",
+        "10minutemail.com",
+        "tempmail.com",
+        "temp-mail.org",
+        "yopmail.com",
+        "trashmail.com",
+        "sharklasers.com",
+        "getnada.com",
+        "dispostable.com",
+    }
+)
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings (double hashing on one blake2b digest)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item: str) -> None:
+        for p in self._positions(item):
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+class RecentBodies:
+    """
+    "Seen recently?" set for message bodies, in constant memory.
+
+    Two bloom generations: once the current one is full it becomes the
+    previous one, so memory stays at two filters and old bodies age out.
+    """
+
+    def __init__(self, capacity: int = 10_000, error_rate: float = 0.01) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous: Optional[BloomFilter] = None
+
+    def seen_then_add(self, body: str) -> bool:
+        with self._lock:
+            seen = body in self._current or (self._previous is not None and body in self._previous)
+            if not seen:
+                if self._current.count >= self.capacity:
+                    self._previous, self._current = self._current, BloomFilter(self.capacity, self.error_rate)
+                self._current.add(body)
+            return seen
+
+
+class SharedRecentBodies:
+    """
+    "Seen recently?" across every process on the host, through the shared
+    cache: one exact entry per body digest, expiring after ``ttl`` seconds.
+    """
+
+    def __init__(self, cache: SharedCache, ttl: float = RECENT_BODY_TTL) -> None:
+        self.cache = cache
+        self.ttl = ttl
+
+    def seen_then_add(self, body: str) -> bool:
+        digest = hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+        return not self.cache.add("spam.bodies", digest, True, self.ttl)
+
+
+class BodySet(Protocol):
+    def seen_then_add(self, body: str) -> bool: ...
+
+
+@dataclass
+class SpamVerdict:
+    score: float = 0.0
+    reasons: List[str] = field(default_factory=list)
+
+    @property
+    def blocked(self) -> bool:
+        return self.score >= BLOCK_THRESHOLD
+
+
+Rule = Callable[[InquiryData], Tuple[float, str]]
+
+
+def _fill_time(data: InquiryData) -> Tuple[float, str]:
+    if data.started_ts and data.submitted_ts - data.started_ts < MIN_FILL_SECONDS:
+        return 1.0, "form filled too quickly"
+    return 0.0, ""
+
+
+def _links(data: InquiryData) -> Tuple[float, str]:
+    if LINK_RE.search(data.name):
+        return 1.0, "link in name"
+    n = len(LINK_RE.findall(data.goals)) + len(LINK_RE.findall(data.notes))
+    if n >= 2:
+        return 0.4 * (n - 1), f"{n} links"
+    return 0.0, ""
+
+
+def _email_domain(blocked: FrozenSet[str]) -> Rule:
+    def rule(data: InquiryData) -> Tuple[float, str]:
+        domain = data.email.rpartition("@")[2].lower()
+        if domain in blocked:
+            return 1.0, f"blocked domain {domain}"
+        return 0.0, ""
+
+    return rule
+
+
+def _repeat_body(recent: BodySet, min_len: int = 40) -> Rule:
+    def rule(data: InquiryData) -> Tuple[float, str]:
+        body = " ".join(f"{data.goals} {data.notes}".split()).lower()
+        if len(body) >= min_len and recent.seen_then_add(body):
+            return 0.6, "message seen recently"
+        return 0.0, ""
+
+    return rule
+
+
+class SpamScorer:
+    """
+    Ordered rules, cheapest first; scoring stops as soon as the total blocks.
+
+    The bloom-filter rule runs last so blocked submissions never pollute it.
+    """
+
+    def __init__(self, rules: List[Rule]) -> None:
+        self.rules = rules
+
+    def score(self, data: InquiryData) -> SpamVerdict:
+        verdict = SpamVerdict()
+        for rule in self.rules:
+            points, reason = rule(data)
+            if points:
+                verdict.score += points
+                verdict.reasons.append(reason)
+                if verdict.blocked:
+                    break
+        return verdict
+
+
+_scorer_lock = threading.Lock()
+_scorer: Optional[SpamScorer] = None
+_scorer_config: Tuple[FrozenSet[str], str] = (frozenset(), "")
+_recent_bodies = RecentBodies()  # survives scorer rebuilds
+
+
+def get_scorer() -> SpamScorer:
+    """
+    Process-wide scorer. ``SPAM_BLOCKED_DOMAINS`` in secrets extends the
+    built-in disposable-domain list; with ``SHARED_CACHE_PATH`` set, repeated
+    bodies are recognised across all processes on the host.
+    """
+    global _scorer, _scorer_config
+    s = get_settings()
+    config = (s.spam_blocked_domains, s.shared_cache_path)
+    with _scorer_lock:
+        if _scorer is None or config != _scorer_config:  # rebuilt when the blocklist is edited
+            extra, shared = config
+            recent: BodySet = SharedRecentBodies(get_shared_cache()) if shared else _recent_bodies
+            _scorer = SpamScorer([_fill_time, _links, _email_domain(DISPOSABLE_DOMAINS | extra), _repeat_body(recent)])
+            _scorer_config = config
+        return _scorer
@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import random
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from components.forms import InquiryData
+from services.metrics import instrument
+from services.settings import get_settings
+from services.storage import GoogleSheetStorage, Storage, StorageResult, build_row
+
+logger = logging.getLogger(__name__)
+
+
+class InquirySpool:
+    """
+    Durable FIFO of sheet rows waiting to be written, kept in a SQLite WAL file.
+
+    ``put`` returns only after the row is committed with ``synchronous=FULL``,
+    so anything acknowledged to the user survives a container restart.
+
+    Several processes (replicas on one host) may drain the same file: a
+    writer ``claim``s rows under a lease before appending them, so no two
+    writers send the same row unless a lease runs out mid-write. Rows that
+    fail ``max_attempts`` times move to the ``dead`` table instead of
+    blocking the queue; ``requeue_dead`` puts them back.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None, timeout=10.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS spool (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                row TEXT NOT NULL,
+                created REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS dead (
+                id INTEGER PRIMARY KEY,
+                row TEXT NOT NULL,
+                created REAL NOT NULL,
+                attempts INTEGER NOT NULL,
+                error TEXT NOT NULL,
+                failed_at REAL NOT NULL
+            );
+            """
+        )
+        # Spool files written before claiming existed lack the lease columns
+        have = {r[1] for r in self._conn.execute("PRAGMA table_info(spool)")}
+        for column, decl in (
+            ("owner", "TEXT NOT NULL DEFAULT ''"),
+            ("lease_until", "REAL NOT NULL DEFAULT 0"),
+            ("attempts", "INTEGER NOT NULL DEFAULT 0"),
+            ("last_error", "TEXT NOT NULL DEFAULT ''"),
+        ):
+            if column not in have:
+                self._conn.execute(f"ALTER TABLE spool ADD COLUMN {column} {decl}")
+
+    @instrument("storage.spool")
+    def put(self, row: List[str]) -> int:
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO spool (row, created) VALUES (?, ?)",
+                (json.dumps(row, ensure_ascii=False), time.time()),
+            )
+            return int(cur.lastrowid)
+
+    @instrument("storage.spool")
+    def put_many(self, rows: List[List[str]]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO spool (row, created) VALUES (?, ?)",
+                    [(json.dumps(r, ensure_ascii=False), now) for r in rows],
+                )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _in(self, ids: Sequence[int]) -> str:
+        return f"id IN ({', '.join('?' for _ in ids)})"
+
+    def claim(self, owner: str, limit: int, lease: float) -> List[Tuple[int, List[str]]]:
+        """Take up to ``limit`` unleased rows, oldest first, for ``lease`` seconds."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")  # one claimer at a time across processes
+            try:
+                now = time.time()
+                rows = self._conn.execute(
+                    "SELECT id, row FROM spool WHERE lease_until <= ? ORDER BY id LIMIT ?", (now, limit)
+                ).fetchall()
+                ids = [rid for rid, _ in rows]
+                if ids:
+                    self._conn.execute(
+                        f"UPDATE spool SET owner = ?, lease_until = ? WHERE {self._in(ids)}",
+                        [owner, now + lease, *ids],
+                    )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return [(rid, json.loads(raw)) for rid, raw in rows]
+
+    def ack(self, ids: List[int], owner: str) -> None:
+        if not ids:
+            return
+        with self._lock:
+            self._conn.execute(f"DELETE FROM spool WHERE owner = ? AND {self._in(ids)}", [owner, *ids])
+
+    def postpone(self, ids: List[int], owner: str, error: str, retry_in: float) -> None:
+        """
+        Keep ``ids`` leased for ``retry_in`` more seconds after a failure
+        that wasn't their fault (sheet unreachable, auth, quota), so other
+        writers back off too. Attempts are not counted.
+        """
+        if not ids:
+            return
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE spool SET last_error = ?, lease_until = ? WHERE owner = ? AND {self._in(ids)}",
+                [error[:500], time.time() + retry_in, owner, *ids],
+            )
+
+    def fail(self, ids: List[int], owner: str, error: str, retry_in: float, max_attempts: int) -> int:
+        """
+        Count a write the sheet rejected because of these rows; like
+        ``postpone`` otherwise. Rows that reached ``max_attempts`` move to
+        ``dead``. Returns how many did.
+        """
+        if not ids:
+            return 0
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                mine = f"owner = ? AND {self._in(ids)}"
+                self._conn.execute(
+                    f"UPDATE spool SET attempts = attempts + 1, last_error = ?, lease_until = ? WHERE {mine}",
+                    [error[:500], now + retry_in, owner, *ids],
+                )
+                spent = f"{mine} AND attempts >= ?"
+                dead = self._conn.execute(
+                    "INSERT INTO dead (id, row, created, attempts, error, failed_at)"
+                    f" SELECT id, row, created, attempts, last_error, ? FROM spool WHERE {spent}",
+                    [now, owner, *ids, max_attempts],
+                ).rowcount
+                self._conn.execute(f"DELETE FROM spool WHERE {spent}", [owner, *ids, max_attempts])
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return dead
+
+    def dead_count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM dead").fetchone()[0])
+
+    def dead_letters(self, limit: int = 20) -> List[Tuple[int, int, str]]:
+        """``(id, attempts, error)`` of the oldest dead-lettered rows."""
+        with self._lock:
+            cur = self._conn.execute("SELECT id, attempts, error FROM dead ORDER BY id LIMIT ?", (limit,))
+            return [(int(i), int(n), str(err)) for i, n, err in cur.fetchall()]
+
+    def requeue_dead(self) -> int:
+        """Move dead-lettered rows back into the spool with a fresh attempt count."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                moved = self._conn.execute(
+                    "INSERT INTO spool (id, row, created) SELECT id, row, created FROM dead"
+                ).rowcount
+                self._conn.execute("DELETE FROM dead")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return moved
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM spool").fetchone()[0])
+
+
+class SheetWriter(threading.Thread):
+    """
+    Background thread draining the spool into the sheet with ``append_rows``.
+
+    Failures back off exponentially (with jitter) up to ``max_delay``; rows
+    stay in the spool until the sheet accepts them, so a restart simply
+    replays whatever is left. An outage (no connection, auth, quota, 5xx)
+    never counts against the rows, however long it lasts. Only when the
+    sheet rejects a write as invalid (a 4xx) does the writer fall back to
+    one row at a time, and a single row rejected ``max_attempts`` times is
+    dead-lettered; ``python -m services.spool requeue`` puts it back.
+    """
+
+    def __init__(
+        self,
+        spool: InquirySpool,
+        sheet: GoogleSheetStorage,
+        batch_size: int = 50,
+        base_delay: float = 1.0,
+        max_delay: float = 300.0,
+        idle_poll: float = 30.0,
+        lease: float = 120.0,
+        max_attempts: int = 5,
+    ) -> None:
+        super().__init__(name="inquiry-sheet-writer", daemon=True)
+        self.spool = spool
+        self.sheet = sheet
+        self.batch_size = batch_size
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.idle_poll = idle_poll
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._wake = threading.Event()
+        self._halt = threading.Event()
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._halt.set()
+        self._wake.set()
+
+    def _sleep(self, seconds: float) -> None:
+        self._wake.wait(seconds)
+        self._wake.clear()
+
+    def run(self) -> None:
+        delay = self.base_delay
+        limit = self.batch_size
+        while not self._halt.is_set():
+            try:
+                batch = self.spool.claim(self.owner, limit, self.lease)
+            except sqlite3.OperationalError as e:  # another writer held the lock past the timeout
+                logger.warning("Could not claim spool rows: %s", e)
+                self._sleep(self.base_delay)
+                continue
+            if not batch:
+                # Rows leased by another writer become claimable when it acks or its lease runs out
+                self._sleep(self.idle_poll)
+                continue
+            ids = [rid for rid, _ in batch]
+            try:
+                self.sheet.append_rows([row for _, row in batch])
+            except Exception as e:
+                wait = delay + random.uniform(0, delay / 2)
+                if not _rejects_rows(e):
+                    self.spool.postpone(ids, self.owner, str(e), wait)
+                elif len(batch) > 1:
+                    # Some row in the batch is bad: retry one at a time to find it, without blaming the rest
+                    self.spool.postpone(ids, self.owner, str(e), 0.0)
+                    limit = 1
+                    continue
+                else:
+                    dead = self.spool.fail(ids, self.owner, str(e), wait, self.max_attempts)
+                    if dead:
+                        logger.error(
+                            "Moved an inquiry row to the dead-letter table after %s rejections: %s",
+                            self.max_attempts,
+                            e,
+                        )
+                        continue
+                logger.warning("Sheet write failed (%s rows); retrying in %.1fs: %s", len(batch), wait, e)
+                # Don't let new submissions cut the backoff short
+                self._halt.wait(wait)
+                delay = min(delay * 2, self.max_delay)
+                continue
+            self.spool.ack(ids, self.owner)
+            delay = self.base_delay
+            limit = self.batch_size
+
+
+def _rejects_rows(error: Exception) -> bool:
+    """
+    Whether the sheet refused the data itself (HTTP 400-ish) rather than
+    being unreachable; only that should count against the rows.
+    """
+    code = getattr(error, "code", None)
+    if not isinstance(code, int):
+        code = getattr(getattr(error, "response", None), "status_code", None)
+    return isinstance(code, int) and 400 <= code < 500 and code not in (401, 403, 404, 408, 409, 429)
+
+
+_writer_lock = threading.Lock()
+_writer: Optional[SheetWriter] = None
+
+
+def _ensure_writer() -> SheetWriter:
+    """Start the process-wide writer on first use; it replays any leftover spool rows."""
+    global _writer
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = SheetWriter(InquirySpool(get_settings().inquiry_spool_path), GoogleSheetStorage())
+            _writer.start()
+        return _writer
+
+
+class SpooledSheetStorage(Storage):
+    """
+    Write-behind Google Sheet storage.
+
+    ``save_inquiry`` returns once the row is committed to the local spool;
+    the background ``SheetWriter`` batches it into the sheet.
+    """
+
+    def __init__(self, writer: Optional[SheetWriter] = None) -> None:
+        self.writer = writer or _ensure_writer()
+
+    def save_inquiry(self, data: InquiryData) -> StorageResult:
+        try:
+            self.writer.spool.put(build_row(data))
+        except Exception:
+            logger.exception("Failed to spool inquiry; writing to Google Sheet directly.")
+            return self.writer.sheet.save_inquiry(data)
+        self.writer.notify()
+        return StorageResult(ok=True, message="Queued for Google Sheet.")
+
+    def save_inquiries(self, items: Sequence[InquiryData]) -> StorageResult:
+        try:
+            self.writer.spool.put_many([build_row(d) for d in items])
+        except Exception as e:
+            logger.exception("Failed to spool inquiries.")
+            return StorageResult(ok=False, message=f"Spool error: {e}")
+        self.writer.notify()
+        return StorageResult(ok=True, message=f"Queued {len(items)} for Google Sheet.")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Inspect the inquiry spool or replay its dead-lettered rows.")
+    ap.add_argument("--path", type=Path, help="spool file (default: INQUIRY_SPOOL_PATH from secrets)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats", help="pending and dead-lettered rows")
+    sub.add_parser("requeue", help="move dead-lettered rows back into the spool")
+    args = ap.parse_args(argv)
+
+    path = args.path or get_settings().inquiry_spool_path
+    if not path.exists():
+        print(f"{path} does not exist; nothing has been spooled.", file=sys.stderr)
+        return 1
+    spool = InquirySpool(path)
+    if args.cmd == "stats":
+        print(f"pending {len(spool):>8}")
+        print(f"dead    {spool.dead_count():>8}")
+        for rid, attempts, error in spool.dead_letters():
+            print(f"  #{rid} after {attempts} attempt(s): {error}")
+    else:
+        print(f"requeued {spool.requeue_dead()} row(s); running writers pick them up on their next poll")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
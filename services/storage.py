@@ -1,87 +1,217 @@
 from __future__ import annotations
 
-import json
 import logging
+import threading
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
-from typing import Optional, Protocol
+from typing import Any, Callable, Dict, List, Mapping, Optional, Protocol, Sequence, Tuple
 
 import streamlit as st
 
 from components.forms import InquiryData
+from services.metrics import instrument
+from services.settings import get_settings, parse_service_account
 
 logger = logging.getLogger(__name__)
 
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+SHEET_HEADER = [
+    "timestamp_utc",
+    "name",
+    "email",
+    "phone",
+    "goals",
+    "notes",
+    "source",
+    "user_agent",
+    "spam_score",
+]
+
 
 @dataclass
 class StorageResult:
     ok: bool
     message: str
+    duplicate: bool = False  # already received; nothing was written
+    saved: Optional[int] = None  # items a bulk save wrote, when that's not all of them
 
 
 class Storage(Protocol):
     def save_inquiry(self, data: InquiryData) -> StorageResult: ...
 
+    def save_inquiries(self, items: Sequence[InquiryData]) -> StorageResult:
+        """Bulk write. Backends override this with a single round trip."""
+        saved = sum(1 for data in items if self.save_inquiry(data).ok)
+        return StorageResult(ok=saved == len(items), message=f"Saved {saved} of {len(items)}.", saved=saved)
+
+
+def build_row(data: InquiryData) -> List[str]:
+    """Row in ``SHEET_HEADER`` order, stamped with the current UTC time."""
+    ts = datetime.now(tz=timezone.utc).isoformat()
+    user_agent = st.session_state.get("_user_agent", "")
+    return [
+        ts,
+        data.name,
+        data.email,
+        data.phone,
+        data.goals,
+        data.notes,
+        data.source,
+        user_agent,
+        f"{data.spam_score:.2f}",
+    ]
+
+
+def _authorize(info: Mapping[str, Any]):
+    import gspread
+    from google.oauth2.service_account import Credentials  # type: ignore
+
+    creds = Credentials.from_service_account_info(dict(info), scopes=SCOPES)
+    # gspread wraps the credentials in an AuthorizedSession, which refreshes
+    # the access token on its own once it expires, so the client can be kept.
+    return gspread.authorize(creds)
+
+
+_client_factory: Callable[[Mapping[str, Any]], Any] = _authorize
+
+
+def set_client_factory(factory: Optional[Callable[[Mapping[str, Any]], Any]]) -> None:
+    """
+    Swap the gspread client constructor, e.g. for ``services.fake_sheets``.
+
+    ``None`` restores the real one. Cached worksheet handles are dropped.
+    """
+    global _client_factory
+    _client_factory = factory or _authorize
+    _POOL.clear()
+
+
+def _open_worksheet(service_info: Mapping[str, Any], sheet_name: str):
+    """Authorize, open the spreadsheet and make sure the header row exists."""
+    client = _client_factory(service_info)
+    ws = client.open(sheet_name).sheet1
+    # Only fetch the first row; the full sheet grows with every inquiry.
+    header = ws.row_values(1)
+    if not header:
+        ws.append_row(SHEET_HEADER)
+    elif len(header) < len(SHEET_HEADER) and [h.strip().lower() for h in header] == SHEET_HEADER[: len(header)]:
+        # Sheets created before a column was added: name the new columns so readers can map them
+        start, end = _column_letter(len(header) + 1), _column_letter(len(SHEET_HEADER))
+        ws.update(range_name=f"{start}1:{end}1", values=[SHEET_HEADER[len(header) :]])
+    return ws
+
+
+def _column_letter(n: int) -> str:
+    """1 -> "A", 27 -> "AA"."""
+    letters = ""
+    while n:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+class _WorksheetPool:
+    """Process-wide worksheet handles shared by every Streamlit session."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._handles: Dict[Tuple[str, str], Any] = {}
+
+    def get(self, service_json: str, sheet_name: str, service_info: Mapping[str, Any]):
+        key = (service_json, sheet_name)
+        ws = self._handles.get(key)
+        if ws is not None:
+            return ws
+        with self._lock:
+            ws = self._handles.get(key)
+            if ws is None:
+                ws = _open_worksheet(service_info, sheet_name)
+                self._handles[key] = ws
+            return ws
+
+    def invalidate(self, service_json: str, sheet_name: str) -> None:
+        with self._lock:
+            self._handles.pop((service_json, sheet_name), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._handles.clear()
+
+
+_POOL = _WorksheetPool()
+
 
 class GoogleSheetStorage(Storage):
     """
     Writes inquiries to a Google Sheet using gspread.
 
+    The authorized client and worksheet are opened once per process and
+    reused, so a submit costs a single ``append_row`` call.
+
     Secrets required:
       - GOOGLE_SERVICE_ACCOUNT_JSON (inline JSON)
       - GOOGLE_SHEET_NAME
     """
 
-    def __init__(self) -> None:
-        self.sheet_name: str = st.secrets.get("GOOGLE_SHEET_NAME", "ThriveWFrida_Inquiries")
-        self.service_json: Optional[str] = st.secrets.get("GOOGLE_SERVICE_ACCOUNT_JSON", None)
+    def __init__(self, sheet_name: Optional[str] = None, service_json: Optional[str] = None) -> None:
+        settings = get_settings()
+        self.sheet_name: str = settings.google_sheet_name if sheet_name is None else sheet_name
+        if service_json is None:
+            self.service_json: str = settings.google_service_account_json
+            self.service_info = settings.google_service_account
+        else:
+            self.service_json = service_json
+            self.service_info = parse_service_account(service_json)
 
     def _client_worksheet(self):
-        import gspread
-        from google.oauth2.service_account import Credentials  # type: ignore
-
-        if not self.service_json:
+        if self.service_info is None:
             raise RuntimeError("Missing GOOGLE_SERVICE_ACCOUNT_JSON in secrets")
+        return _POOL.get(self.service_json, self.sheet_name, self.service_info)
+
+    @instrument("storage.sheets_append")
+    def append_rows(self, rows: List[List[str]]) -> None:
+        """Write rows in one request; raises on failure after dropping the cached handle."""
+        try:
+            self._client_worksheet().append_rows(rows, value_input_option="RAW")
+        except Exception:
+            # Drop the cached handle so the next attempt re-opens the sheet
+            if self.service_info is not None:
+                _POOL.invalidate(self.service_json, self.sheet_name)
+            raise
+
+    def _read(self, fetch: Callable[[Any], Any]) -> Any:
+        try:
+            return fetch(self._client_worksheet())
+        except Exception:
+            if self.service_info is not None:
+                _POOL.invalidate(self.service_json, self.sheet_name)
+            raise
+
+    def row(self, number: int) -> List[str]:
+        """One sheet row (1-based); ``[]`` past the end."""
+        return self._read(lambda ws: ws.row_values(number))
 
-        info = json.loads(self.service_json)
-        scopes = ["https://www.googleapis.com/auth/spreadsheets"]
-        creds = Credentials.from_service_account_info(info, scopes=scopes)
-        client = gspread.authorize(creds)
-        sh = client.open(self.sheet_name)
-        ws = sh.sheet1
-        # Prepare header if empty
-        if len(ws.get_all_values()) == 0:
-            ws.append_row(
-                [
-                    "timestamp_utc",
-                    "name",
-                    "email",
-                    "phone",
-                    "goals",
-                    "notes",
-                    "source",
-                    "user_agent",
-                ]
-            )
-        return ws
+    def rows(self, start: int, count: int, width: int = len(SHEET_HEADER)) -> List[List[str]]:
+        """
+        Up to ``count`` rows from sheet row ``start`` in one request, each
+        ``width`` columns wide; fewer than ``count`` means the end was reached.
+        """
+        end = _column_letter(width)
+
+        def fetch(ws: Any) -> List[List[str]]:
+            try:
+                values = ws.get_values(f"A{start}:{end}{start + count - 1}")
+            except Exception as e:
+                if "exceeds grid limits" in str(e):  # asked past the sheet's last row
+                    return []
+                raise
+            return [(list(r) + [""] * width)[:width] for r in values]
+
+        return self._read(fetch)
 
     def save_inquiry(self, data: InquiryData) -> StorageResult:
         try:
-            ws = self._client_worksheet()
-            ts = datetime.now(tz=timezone.utc).isoformat()
-            user_agent = st.session_state.get("_user_agent", "")
-            ws.append_row(
-                [
-                    ts,
-                    data.name,
-                    data.email,
-                    data.phone,
-                    data.goals,
-                    data.notes,
-                    "streamlit",
-                    user_agent,
-                ]
-            )
+            self.append_rows([build_row(data)])
             return StorageResult(ok=True, message="Saved to Google Sheet.")
         except Exception as e:
             # Fallback to console log so the app still passes acceptance locally
@@ -89,3 +219,66 @@ class GoogleSheetStorage(Storage):
             print("=== Inquiry (console fallback) ===")
             print(asdict(data))
             return StorageResult(ok=True, message=f"Saved locally (console fallback). Error: {e}")
+
+    def save_inquiries(self, items: Sequence[InquiryData]) -> StorageResult:
+        try:
+            self.append_rows([build_row(d) for d in items])
+        except Exception as e:
+            logger.exception("Bulk write to Google Sheet failed.")
+            return StorageResult(ok=False, message=f"Google Sheet error: {e}")
+        return StorageResult(ok=True, message=f"Saved {len(items)} to Google Sheet.")
+
+
+class MirroredStorage(Storage):
+    """Saves to ``primary`` and, once that succeeds, best-effort to ``mirror``."""
+
+    def __init__(self, primary: Storage, mirror: Storage) -> None:
+        self.primary = primary
+        self.mirror = mirror
+
+    def save_inquiry(self, data: InquiryData) -> StorageResult:
+        result = self.primary.save_inquiry(data)
+        if result.ok:
+            try:
+                self.mirror.save_inquiry(data)
+            except Exception:
+                logger.exception("Mirror write failed; primary copy kept.")
+        return result
+
+    def save_inquiries(self, items: Sequence[InquiryData]) -> StorageResult:
+        result = self.primary.save_inquiries(items)
+        if result.ok:
+            try:
+                self.mirror.save_inquiries(items)
+            except Exception:
+                logger.exception("Mirror bulk write failed; primary copy kept.")
+        return result
+
+
+def get_storage(dedupe: bool = True) -> Storage:
+    """
+    Storage selected by secrets, wrapped so repeat submissions are skipped.
+
+    ``STORAGE_BACKEND = "sheets"`` (default) spools to Google Sheets;
+    ``"sqlite"`` writes to a local database, optionally mirrored to the sheet
+    with ``SHEETS_MIRROR = true``. Bulk imports pass ``dedupe=False``: they
+    deduplicate the file themselves and would otherwise flood the web form's
+    index of recent submissions.
+    """
+    from services.dedupe import IdempotentStorage
+
+    settings = get_settings()
+    storage: Storage
+    if settings.storage_backend == "sqlite":
+        from services.local_storage import SQLiteStorage
+
+        storage = SQLiteStorage.shared()
+        if settings.sheets_mirror:
+            from services.spool import SpooledSheetStorage
+
+            storage = MirroredStorage(storage, SpooledSheetStorage())
+    else:
+        from services.spool import SpooledSheetStorage
+
+        storage = SpooledSheetStorage()
+    return IdempotentStorage(storage) if dedupe else storage
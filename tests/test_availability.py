@@ -0,0 +1,129 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from services.availability import Availability, AvailabilityCache, Slot, parse_ics, parse_json_slots, zone
+
+UTC = timezone.utc
+
+
+def _calendar(*events: str) -> str:
+    return "BEGIN:VCALENDAR\r\nVERSION:2.0\r\n" + "".join(events) + "END:VCALENDAR\r\n"
+
+
+def _event(*lines: str) -> str:
+    return "BEGIN:VEVENT\r\n" + "".join(f"{line}\r\n" for line in lines) + "END:VEVENT\r\n"
+
+
+def test_ics_unfolds_continuation_lines():
+    text = _calendar(
+        _event(
+            "UID:1",
+            "DTSTART;TZID=Europe/Ber",
+            " lin:20300107T090000",
+            "DTEND:20300107T090000Z",
+            "URL:https://example.com/b",
+            "\took/1",
+        )
+    )
+    [slot] = parse_ics(text)
+    assert slot.start == datetime(2030, 1, 7, 8, 0, tzinfo=UTC)  # 09:00 in Berlin, UTC+1 in January
+    assert slot.booking_url == "https://example.com/book/1"
+
+
+def test_ics_tzid_utc_and_floating_times():
+    text = _calendar(
+        _event(
+            "UID:tz",
+            "DTSTART;TZID=America/New_York:20300701T090000",
+            "DTEND;TZID=America/New_York:20300701T100000",
+        ),
+        _event("UID:z", "DTSTART:20300701T120000Z", "DTEND:20300701T123000Z"),
+        _event("UID:floating", "DTSTART:20300701T150000", "DTEND:20300701T160000"),
+    )
+    slots = parse_ics(text, default_tz=zone("Europe/London"))
+    assert [s.start.astimezone(UTC).hour for s in slots] == [12, 13, 14]
+    assert [s.minutes for s in slots] == [30, 60, 60]
+
+
+def test_ics_duration_instead_of_dtend():
+    text = _calendar(
+        _event("UID:1", "DTSTART:20300107T090000Z", "DURATION:PT1H30M"),
+        _event("UID:2", "DTSTART:20300108T090000Z", "DURATION:P1D"),
+    )
+    assert [s.end - s.start for s in parse_ics(text)] == [timedelta(minutes=90), timedelta(days=1)]
+
+
+def test_ics_skips_unbookable_and_broken_events():
+    text = _calendar(
+        _event("UID:allday", "DTSTART;VALUE=DATE:20300107", "DTEND;VALUE=DATE:20300108"),
+        _event("UID:cancelled", "STATUS:CANCELLED", "DTSTART:20300107T090000Z", "DURATION:PT1H"),
+        _event("UID:no-end", "DTSTART:20300107T090000Z"),
+        _event("UID:windows-tz", "DTSTART;TZID=Pacific Standard Time:20300107T090000", "DURATION:PT1H"),
+        _event("UID:ok", "DTSTART:20300107T100000Z", "DURATION:PT1H"),
+    )
+    assert [s.start.hour for s in parse_ics(text)] == [10]
+
+
+def test_json_slots_accept_end_or_minutes_and_skip_bad_entries():
+    doc = {
+        "slots": [
+            {"start": "2030-01-07T10:00:00Z", "minutes": 45, "url": "https://example.com/x"},
+            {"start": "2030-01-07T09:00:00", "end": "2030-01-07T10:00:00"},
+            {"start": "not a date", "minutes": 30},
+            {"minutes": 30},
+        ]
+    }
+    slots = parse_json_slots(doc, default_tz=UTC)
+    assert [(s.start.hour, s.minutes, s.booking_url) for s in slots] == [(9, 60, ""), (10, 45, "https://example.com/x")]
+
+
+class _Provider:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def fetch(self):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def _slot(hours: int) -> Slot:
+    start = datetime.now(UTC).replace(microsecond=0) + timedelta(hours=hours)
+    return Slot(start, start + timedelta(hours=1))
+
+
+def _wait_for(cache: AvailabilityCache, check, timeout: float = 2.0) -> Availability:
+    deadline = time.monotonic() + timeout
+    while True:
+        availability = cache.get()
+        if check(availability) or time.monotonic() > deadline:
+            return availability
+        time.sleep(0.01)
+
+
+def test_cache_serves_fresh_slots_without_refetching():
+    provider = _Provider([_slot(2), _slot(1)])
+    cache = AvailabilityCache(provider, ttl=60)
+    first = cache.get()
+    assert first.slots == tuple(sorted(first.slots)) and len(first.slots) == 2
+    assert cache.get() is first
+    assert provider.calls == 1
+
+
+def test_cache_keeps_last_good_slots_when_a_refresh_fails():
+    good = [_slot(1)]
+    provider = _Provider(good, RuntimeError("feed down"), [_slot(3)])
+    cache = AvailabilityCache(provider, ttl=0.05)
+    assert cache.get().slots == tuple(good)
+
+    time.sleep(0.06)
+    stale = _wait_for(cache, lambda a: bool(a.error))
+    assert "feed down" in stale.error
+    assert stale.slots == tuple(good)
+
+    time.sleep(0.06)
+    recovered = _wait_for(cache, lambda a: not a.error)
+    assert not recovered.error and recovered.slots[0].start > good[0].start
@@ -0,0 +1,99 @@
+import pytest
+
+from services.fake_sheets import FakeClient
+from services.inquiry_mirror import InquiryMirror, InquiryQuery
+from services.storage import SHEET_HEADER, GoogleSheetStorage, set_client_factory
+
+
+def _row(i: int, spam: str = "0.00", source: str = "web") -> list:
+    timestamp = f"2030-01-{i % 28 + 1:02d}T10:00:{i % 60:02d}+00:00"
+    return [timestamp, f"Person {i}", f"p{i}@example.com", "", "", "", source, "ua", spam]
+
+
+@pytest.fixture
+def client():
+    fake = FakeClient()
+    set_client_factory(lambda _info: fake)
+    yield fake
+    set_client_factory(None)
+
+
+@pytest.fixture
+def mirror(client, tmp_path):
+    return InquiryMirror(tmp_path / "mirror.sqlite3", GoogleSheetStorage(sheet_name="inquiries", service_json="{}"))
+
+
+def _sheet(client: FakeClient):
+    return client.open("inquiries").sheet1
+
+
+def test_first_sync_copies_every_row_in_batches(client, mirror):
+    _sheet(client).append_rows([SHEET_HEADER] + [_row(i) for i in range(25)])
+    result = mirror.sync(batch_rows=10)
+    assert (result.added, result.rebuilt, result.last_row) == (25, False, 26)
+    assert mirror.query(InquiryQuery(page_size=100)).total == 25
+
+
+def test_later_syncs_fetch_only_new_rows(client, mirror):
+    ws = _sheet(client)
+    ws.append_rows([SHEET_HEADER] + [_row(i) for i in range(25)])
+    mirror.sync(batch_rows=10)
+
+    ws.append_rows([_row(i) for i in range(25, 30)])
+    before = dict(client.faults.calls)
+    result = mirror.sync(batch_rows=10)
+    assert (result.added, result.rebuilt, result.last_row) == (5, False, 31)
+    assert client.faults.calls["get_values"] - before["get_values"] == 1
+    assert mirror.query(InquiryQuery()).total == 30
+
+    assert mirror.sync().added == 0
+
+
+def test_deleted_rows_trigger_a_rebuild(client, mirror):
+    ws = _sheet(client)
+    ws.append_rows([SHEET_HEADER] + [_row(i) for i in range(10)])
+    mirror.sync()
+
+    del ws.rows[3]  # someone removed a row by hand
+    result = mirror.sync()
+    assert result.rebuilt and result.added == 9
+    emails = {r["email"] for r in mirror.query(InquiryQuery(page_size=100)).rows}
+    assert "p2@example.com" not in emails and len(emails) == 9
+
+
+def test_columns_are_mapped_by_header_name(client, mirror):
+    header = ["Email", "Name", "timestamp_utc", "spam_score", "extra"]
+    _sheet(client).append_rows([header, ["a@example.com", "Ann", "2030-01-01T00:00:00+00:00", "0.90", "x"]])
+    mirror.sync()
+    [row] = mirror.query(InquiryQuery()).rows
+    assert (row["name"], row["email"], row["spam_score"], row["source"]) == ("Ann", "a@example.com", "0.90", "")
+
+
+def test_sheet_from_before_spam_score_gets_the_column_named(client, mirror):
+    ws = _sheet(client)
+    ws.append_rows([SHEET_HEADER[:8]] + [_row(i)[:8] for i in range(3)])
+    mirror.sheet.append_rows([_row(3, spam="0.95")])
+    assert ws.rows[0] == SHEET_HEADER
+
+    mirror.sync()
+    visible = mirror.query(InquiryQuery(spam_below=0.5)).rows  # rows from before scoring count as 0
+    assert sorted(r["name"] for r in visible) == ["Person 0", "Person 1", "Person 2"]
+    assert mirror.query(InquiryQuery(sort="spam_score")).rows[0]["spam_score"] == "0.95"
+
+
+def test_query_filters_sorts_and_pages(client, mirror):
+    rows = [_row(i, spam="0.90" if i % 5 == 0 else "0.10", source="import" if i % 2 else "web") for i in range(40)]
+    _sheet(client).append_rows([SHEET_HEADER] + rows)
+    mirror.sync()
+
+    assert mirror.query(InquiryQuery(spam_below=0.5)).total == 32
+    assert mirror.query(InquiryQuery(sources=("import",))).total == 20
+    assert [r["name"] for r in mirror.query(InquiryQuery(text="person 17")).rows] == ["Person 17"]
+    assert mirror.query(InquiryQuery(text="100%")).total == 0  # LIKE wildcards are escaped
+
+    page = mirror.query(InquiryQuery(sort="email", descending=False, page=2, page_size=15))
+    assert (page.total, page.page, page.pages, len(page.rows)) == (40, 2, 3, 15)
+    emails = [r["email"] for r in mirror.query(InquiryQuery(sort="email", descending=False, page_size=40)).rows]
+    assert emails == sorted(emails, key=str.lower)
+    assert mirror.query(InquiryQuery(page=99, page_size=15)).page == 3
+    assert mirror.sources() == ["import", "web"]
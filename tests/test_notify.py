@@ -0,0 +1,163 @@
+import hashlib
+import hmac
+import json
+import threading
+
+import pytest
+
+from services.fake_notify import LocalSMTPServer, LocalWebhookServer
+from services.notify import EmailChannel, Event, NotificationDispatcher, PermanentError, WebhookChannel
+
+
+def _event(key: str = "k1") -> Event:
+    return Event("inquiry.created", key, {"name": "Ann", "email": "ann@example.com", "notes": "hi"})
+
+
+class _Channel:
+    """Fails with the queued errors, then succeeds."""
+
+    name = "fake"
+
+    def __init__(self, *errors: Exception) -> None:
+        self.errors = list(errors)
+        self.attempts = 0
+        self.sent = []
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def send(self, event: Event) -> None:
+        with self._lock:
+            self.attempts += 1
+            if self.errors:
+                raise self.errors.pop(0)
+            self.sent.append(event.key)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _dispatcher(*channels, **kwargs) -> NotificationDispatcher:
+    kwargs.setdefault("base_delay", 0.01)
+    kwargs.setdefault("max_delay", 0.02)
+    return NotificationDispatcher(list(channels), workers=2, **kwargs)
+
+
+def test_transient_failures_are_retried_until_sent():
+    channel = _Channel(RuntimeError("timeout"), RuntimeError("timeout"))
+    d = _dispatcher(channel)
+    try:
+        assert d.submit(_event())
+        assert d.drain(timeout=5)
+    finally:
+        d.close()
+    assert channel.sent == ["k1"]
+    assert channel.attempts == 3
+    assert d.counts == {"sent": 1, "retried": 2, "failed": 0, "dropped": 0}
+    assert channel.closed
+
+
+def test_permanent_error_is_not_retried():
+    channel = _Channel(PermanentError("webhook returned 400"))
+    d = _dispatcher(channel)
+    try:
+        d.submit(_event())
+        assert d.drain(timeout=5)
+    finally:
+        d.close()
+    assert channel.attempts == 1
+    assert d.counts["failed"] == 1 and d.counts["retried"] == 0
+
+
+def test_gives_up_after_max_attempts():
+    channel = _Channel(*[RuntimeError("down")] * 10)
+    d = _dispatcher(channel, max_attempts=3)
+    try:
+        d.submit(_event())
+        assert d.drain(timeout=5)
+    finally:
+        d.close()
+    assert channel.attempts == 3
+    assert d.counts == {"sent": 0, "retried": 2, "failed": 1, "dropped": 0}
+
+
+def test_one_failing_channel_does_not_hold_up_the_others():
+    broken, working = _Channel(PermanentError("no")), _Channel()
+    d = _dispatcher(broken, working)
+    try:
+        d.submit(_event("a"))
+        d.submit(_event("b"))
+        assert d.drain(timeout=5)
+    finally:
+        d.close()
+    assert sorted(working.sent) == ["a", "b"]
+    assert broken.sent == ["b"]
+
+
+def test_submit_drops_instead_of_blocking_when_the_queue_is_full():
+    release = threading.Event()
+
+    class Slow(_Channel):
+        def send(self, event: Event) -> None:
+            release.wait(5)
+            super().send(event)
+
+    d = NotificationDispatcher([Slow()], workers=1, queue_size=1)
+    try:
+        results = [d.submit(_event(str(i))) for i in range(5)]
+        assert not all(results)
+        assert d.counts["dropped"] >= 1
+    finally:
+        release.set()
+        d.drain(timeout=5)
+        d.close()
+
+
+@pytest.fixture
+def webhook():
+    server = LocalWebhookServer().start()
+    yield server
+    server.stop()
+
+
+def test_webhook_signs_the_body_and_sends_the_idempotency_key(webhook):
+    channel = WebhookChannel(webhook.url, secret="s3cret")
+    try:
+        channel.send(_event("abc"))
+        channel.send(_event("def"))
+    finally:
+        channel.close()
+    first = webhook.requests[0]
+    assert first["headers"]["Idempotency-Key"] == "abc"
+    assert first["json"]["event"] == "inquiry.created" and first["json"]["data"]["name"] == "Ann"
+    body = json.dumps(first["json"], ensure_ascii=False).encode("utf-8")
+    expected = hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+    assert first["headers"]["X-Thrive-Signature"] == f"sha256={expected}"
+    assert webhook.connections == 1  # kept alive between the two posts
+
+
+@pytest.mark.parametrize(
+    "status, error", [(400, PermanentError), (422, PermanentError), (429, RuntimeError), (503, RuntimeError)]
+)
+def test_webhook_status_decides_whether_to_retry(status, error):
+    server = LocalWebhookServer(status=status).start()
+    channel = WebhookChannel(server.url)
+    try:
+        with pytest.raises(error):
+            channel.send(_event())
+    finally:
+        channel.close()
+        server.stop()
+
+
+def test_email_reuses_the_smtp_connection():
+    server = LocalSMTPServer().start()
+    channel = EmailChannel("127.0.0.1", server.port, "site@example.com", ("trainer@example.com",), starttls=False)
+    try:
+        for key in ("a", "b", "c"):
+            channel.send(_event(key))
+    finally:
+        channel.close()
+        server.stop()
+    assert [m["X-Inquiry-Key"] for m in server.messages] == ["a", "b", "c"]
+    assert server.messages[0]["Reply-To"] == "ann@example.com"
+    assert server.connections == 1
@@ -0,0 +1,72 @@
+import pytest
+
+from services import metrics, ratelimit
+from services.ratelimit import MemoryBucketStore, RateLimiter, SQLiteBucketStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBucketStore()
+    return SQLiteBucketStore(tmp_path / "buckets.sqlite3")
+
+
+def _limiter(store=None, client_rate=1.0, client_burst=2.0, global_rate=1000.0, global_burst=1000.0) -> RateLimiter:
+    return RateLimiter(client_rate, client_burst, global_rate, global_burst, store=store)
+
+
+def test_a_client_gets_its_burst_and_then_waits_for_refill(store):
+    limiter = _limiter(store)
+    assert [limiter.allow("a", now=0.0) for _ in range(3)] == [True, True, False]
+    assert limiter.allow("a", now=0.5) is False  # half a token
+    assert limiter.allow("a", now=1.0) is True
+    assert limiter.allow("a", now=1.0) is False
+
+
+def test_refill_is_capped_at_the_burst(store):
+    limiter = _limiter(store)
+    limiter.allow("a", now=0.0)
+    assert [limiter.allow("a", now=3600.0) for _ in range(3)] == [True, True, False]
+
+
+def test_clients_have_separate_buckets(store):
+    limiter = _limiter(store, client_burst=1.0)
+    assert limiter.allow("a", now=0.0) is True
+    assert limiter.allow("a", now=0.0) is False
+    assert limiter.allow("b", now=0.0) is True
+
+
+def test_a_global_rejection_refunds_the_client_token(store):
+    limiter = _limiter(store, client_rate=0.0, client_burst=1.0, global_rate=0.0, global_burst=1.0)
+    assert limiter.allow("a", now=0.0) is True
+    # Had "b" been charged for the first attempt, the second would be a client rejection
+    assert limiter.allow("b", now=0.0) is False
+    assert limiter.allow("b", now=0.0) is False
+    assert limiter.snapshot() == {"allowed": 1, "rejected_client": 0, "rejected_global": 2}
+
+
+def test_memory_store_evicts_the_least_recently_used_client():
+    store = MemoryBucketStore(max_keys=2)
+    assert store.take("a", 0.0, 1.0, now=0.0) is True
+    assert store.take("b", 0.0, 1.0, now=0.0) is True
+    assert store.take("a", 0.0, 1.0, now=1.0) is False  # touches "a"
+    assert store.take("c", 0.0, 1.0, now=2.0) is True
+    assert list(store._buckets) == ["a", "c"]
+    # An evicted client comes back with a full bucket; "a" is still empty
+    assert store.take("b", 0.0, 1.0, now=3.0) is True
+    assert store.take("c", 0.0, 1.0, now=3.0) is False
+    assert len(store._buckets) == 2
+
+
+def test_counters_are_exported_only_once_a_limiter_exists(monkeypatch):
+    monkeypatch.setattr(ratelimit, "_limiter", None)
+    assert "thrive_ratelimit_total" not in metrics.render_text()
+
+    limiter = _limiter(client_burst=1.0)
+    monkeypatch.setattr(ratelimit, "_limiter", limiter)
+    limiter.allow("a", now=0.0)
+    limiter.allow("a", now=0.0)
+    text = metrics.render_text()
+    assert 'thrive_ratelimit_total{result="allowed"} 1' in text
+    assert 'thrive_ratelimit_total{result="rejected_client"} 1' in text
+    assert 'thrive_ratelimit_total{result="rejected_global"} 0' in text
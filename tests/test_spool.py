@@ -0,0 +1,165 @@
+import sqlite3
+import time
+
+import pytest
+
+from services.fake_sheets import FakeAPIError, FakeClient
+from services.spool import InquirySpool, SheetWriter, main
+from services.storage import GoogleSheetStorage, set_client_factory
+
+
+@pytest.fixture
+def spool(tmp_path):
+    return InquirySpool(tmp_path / "spool.sqlite3")
+
+
+def _fill(spool: InquirySpool, n: int) -> None:
+    spool.put_many([[f"row {i}"] for i in range(n)])
+
+
+def test_claimed_rows_are_not_handed_to_another_writer(spool):
+    _fill(spool, 5)
+    a = spool.claim("a", 3, lease=60)
+    b = spool.claim("b", 3, lease=60)
+    assert [r for _, r in a] == [["row 0"], ["row 1"], ["row 2"]]
+    assert [r for _, r in b] == [["row 3"], ["row 4"]]
+    assert spool.claim("c", 3, lease=60) == []
+
+
+def test_only_the_owner_can_ack(spool):
+    _fill(spool, 2)
+    ids = [rid for rid, _ in spool.claim("a", 2, lease=60)]
+    spool.ack(ids, "b")
+    assert len(spool) == 2
+    spool.ack(ids, "a")
+    assert len(spool) == 0
+
+
+def test_an_expired_lease_lets_another_writer_take_over(spool):
+    _fill(spool, 1)
+    [(rid, _)] = spool.claim("a", 1, lease=0.05)
+    time.sleep(0.06)
+    assert [i for i, _ in spool.claim("b", 1, lease=60)] == [rid]
+    spool.ack([rid], "a")  # the late writer no longer owns it
+    assert len(spool) == 1
+
+
+def test_postponed_rows_wait_and_keep_their_attempts(spool):
+    _fill(spool, 1)
+    ids = [rid for rid, _ in spool.claim("a", 1, lease=60)]
+    spool.postpone(ids, "a", "sheet down", retry_in=0.05)
+    assert spool.claim("b", 1, lease=60) == []
+    time.sleep(0.06)
+    assert spool.claim("b", 1, lease=60)
+    assert spool.dead_count() == 0
+
+
+def test_rows_rejected_max_attempts_times_are_dead_lettered_and_can_be_requeued(spool):
+    _fill(spool, 1)
+    for attempt in range(1, 4):
+        ids = [rid for rid, _ in spool.claim("a", 1, lease=60)]
+        assert spool.fail(ids, "a", "invalid", retry_in=0.0, max_attempts=3) == (1 if attempt == 3 else 0)
+    assert (len(spool), spool.dead_count()) == (0, 1)
+    assert spool.dead_letters() == [(ids[0], 3, "invalid")]
+
+    assert spool.requeue_dead() == 1
+    assert (len(spool), spool.dead_count()) == (1, 0)
+    assert spool.claim("a", 1, lease=60)[0][1] == ["row 0"]
+
+
+def test_old_spool_files_get_the_lease_columns(tmp_path):
+    path = tmp_path / "old.sqlite3"
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE spool (id INTEGER PRIMARY KEY AUTOINCREMENT, row TEXT NOT NULL, created REAL NOT NULL)")
+    conn.execute("""INSERT INTO spool (row, created) VALUES ('["left over"]', 0)""")
+    conn.commit()
+    conn.close()
+    assert InquirySpool(path).claim("a", 5, lease=60)[0][1] == ["left over"]
+
+
+def _writer(spool: InquirySpool, sheet, **kwargs) -> SheetWriter:
+    kwargs.setdefault("base_delay", 0.01)
+    kwargs.setdefault("max_delay", 0.02)
+    return SheetWriter(spool, sheet, idle_poll=0.05, **kwargs)
+
+
+def _wait(check, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not check() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def fake_sheet():
+    client = FakeClient()
+    set_client_factory(lambda _info: client)
+    yield client, GoogleSheetStorage(sheet_name="spool", service_json="{}")
+    set_client_factory(None)
+
+
+def test_an_outage_never_dead_letters_rows(spool, fake_sheet):
+    client, sheet = fake_sheet
+    client.faults.failure_rate = 1.0
+    _fill(spool, 5)
+    writer = _writer(spool, sheet, max_attempts=2)
+    writer.start()
+    _wait(lambda: sum(client.faults.calls.values()) > 30)
+    assert (len(spool), spool.dead_count()) == (5, 0)
+
+    client.faults.failure_rate = 0.0
+    _wait(lambda: len(spool) == 0)
+    writer.stop()
+    assert [r[0] for r in client.open("spool").sheet1.rows[1:]] == [f"row {i}" for i in range(5)]
+
+
+class _RejectingSheet:
+    """Refuses, with an HTTP 400, any batch containing a row marked bad."""
+
+    def __init__(self) -> None:
+        self.rows = []
+        self.calls = 0
+
+    def append_rows(self, rows):
+        self.calls += 1
+        if any(r[0].startswith("bad") for r in rows):
+            error = FakeAPIError("invalid value")
+            error.code = 400
+            raise error
+        self.rows.extend(rows)
+
+
+def test_only_the_rejected_row_is_dead_lettered(spool):
+    spool.put_many([["ok 0"], ["bad"], ["ok 1"], ["ok 2"]])
+    sheet = _RejectingSheet()
+    writer = _writer(spool, sheet, max_attempts=3)
+    writer.start()
+    _wait(lambda: len(spool) == 0)
+    writer.stop()
+    assert sheet.rows == [["ok 0"], ["ok 1"], ["ok 2"]]
+    assert [attempts for _, attempts, _ in spool.dead_letters()] == [3]
+
+
+def test_several_writers_send_each_row_once(tmp_path, fake_sheet):
+    client, sheet = fake_sheet
+    client.faults.latency = 0.005
+    spools = [InquirySpool(tmp_path / "shared.sqlite3") for _ in range(3)]
+    _fill(spools[0], 200)
+    writers = [_writer(s, sheet, batch_size=10) for s in spools]
+    for w in writers:
+        w.start()
+    _wait(lambda: len(spools[0]) == 0)
+    for w in writers:
+        w.stop()
+    written = [r[0] for r in client.open("spool").sheet1.rows[1:]]
+    assert sorted(written) == sorted(f"row {i}" for i in range(200))
+
+
+def test_cli_reports_and_requeues_dead_rows(spool, capsys):
+    _fill(spool, 1)
+    ids = [rid for rid, _ in spool.claim("a", 1, lease=60)]
+    spool.fail(ids, "a", "invalid", retry_in=0.0, max_attempts=1)
+
+    assert main(["--path", str(spool.path), "stats"]) == 0
+    assert "dead           1" in capsys.readouterr().out
+    assert main(["--path", str(spool.path), "requeue"]) == 0
+    assert (len(spool), spool.dead_count()) == (1, 0)